@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK DE CARGA DE ARTEFACTOS: JOBLIB vs NPY/JSON (MEMORY-MAPPED)
+# ==============================================================================
+
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.artifacts import convierte_artefactos_joblib, directorio_artefactos
+
+# ==============================================================================
+# CONFIGURACIÓN DE PATHS
+# ==============================================================================
+MODELS_DIR = PROJECT_ROOT / "outputs" / "models" / "LightGBM"
+OUTPUT_DIR = PROJECT_ROOT / "outputs" / "benchmarks" / "artefactos"
+
+# Cada medición se ejecuta en un proceso nuevo para incluir el coste de
+# importación y partir de un RSS limpio. Se lee un único array (y_test_proba)
+# y los preprocessors, que es el patrón de uso de un scorer.
+_PRELUDIO = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+
+def _rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 1024 ** 2 if sys.platform == "darwin" else maxrss / 1024
+
+rss_0 = _rss_mb()
+t0 = time.perf_counter()
+"""
+
+_CARGA_JOBLIB = """
+import joblib
+datos = joblib.load({datos!r})
+prep  = joblib.load({prep!r})
+proba = datos["y_test_proba"]
+"""
+
+_CARGA_LIGERA = """
+from src.models.artifacts import ArtefactosEvaluacion, PreprocesadorLigero
+datos = ArtefactosEvaluacion({directorio!r})
+prep  = PreprocesadorLigero({directorio!r})
+proba = datos["y_test_proba"]
+"""
+
+_EPILOGO = """
+t1 = time.perf_counter()
+print(json.dumps({{
+    "tiempo_carga_s": t1 - t0,
+    "rss_mb": _rss_mb(),
+    "rss_delta_mb": _rss_mb() - rss_0,
+    "modulos_cargados": len(sys.modules),
+}}))
+"""
+
+
+def _mide(codigo: str) -> dict:
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def benchmark_artefactos(
+    models_dir: str | None = None,
+    output_dir: str | None = None,
+    repeticiones: int = 5,
+) -> pd.DataFrame:
+    """
+    Compara tiempo de carga y RSS entre los .joblib y el formato ligero.
+
+    Si el formato ligero no existe aún para una fase, se genera a partir de
+    los .joblib antes de medir.
+    """
+    models_dir = Path(models_dir) if models_dir else MODELS_DIR
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    resultados = []
+    for fase in ["T0", "T1", "T2"]:
+        directorio = directorio_artefactos(models_dir, fase)
+        if not directorio.exists():
+            convierte_artefactos_joblib(models_dir, fase)
+
+        preludio = _PRELUDIO.format(root=str(PROJECT_ROOT))
+        variantes = {
+            "joblib": _CARGA_JOBLIB.format(
+                datos=str(models_dir / f"datos_evaluacion_{fase}.joblib"),
+                prep=str(models_dir / f"preprocessors_{fase}.joblib"),
+            ),
+            "npy_mmap": _CARGA_LIGERA.format(directorio=str(directorio)),
+        }
+        for formato, carga in variantes.items():
+            for rep in range(repeticiones):
+                medicion = _mide(preludio + carga + _EPILOGO)
+                resultados.append({"fase": fase, "formato": formato, "repeticion": rep, **medicion})
+
+    df_resultados = pd.DataFrame(resultados)
+    df_resumen = (
+        df_resultados.groupby(["fase", "formato"])
+        [["tiempo_carga_s", "rss_mb", "rss_delta_mb", "modulos_cargados"]]
+        .median()
+        .reset_index()
+    )
+
+    csv_path = output_dir / "carga_artefactos.csv"
+    df_resumen.to_csv(csv_path, index=False)
+
+    print(df_resumen.to_string(index=False))
+    print(f"\nResultados guardados en: {csv_path}")
+    return df_resumen
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de carga de artefactos: joblib vs npy/json memory-mapped"
+    )
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Directorio con datos_evaluacion_T*.joblib y preprocessors_T*.joblib")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/artefactos)")
+    parser.add_argument("--repeticiones", "-n", type=int, default=5,
+                        help="Procesos medidos por formato y fase (default: 5)")
+    parser.add_argument("--convierte", action="store_true",
+                        help="Regenera el formato ligero desde los .joblib antes de medir")
+
+    args = parser.parse_args()
+
+    if args.convierte:
+        models_dir = Path(args.models) if args.models else MODELS_DIR
+        for fase in ["T0", "T1", "T2"]:
+            print(f"Convertido: {convierte_artefactos_joblib(models_dir, fase)}")
+
+    benchmark_artefactos(
+        models_dir=args.models,
+        output_dir=args.output,
+        repeticiones=args.repeticiones,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK: CARGA DEL CSV PREPROCESADO (DTYPES POR DEFECTO vs ESQUEMA COMPACTO)
+# ==============================================================================
+#
+# Escala el CSV preprocesado a cada número de filas y lo carga en un proceso
+# nuevo con pd.read_csv (int64/float64/object) y con lee_csv (esquema de
+# src/data/esquema.py). Informa del tiempo de carga, el pico de RSS del
+# proceso y la memoria del DataFrame (memory_usage(deep=True)).
+#
+# Uso:
+#   python src/benchmarks/bench_esquema.py --filas 100000 1000000 5000000
+#
+# ==============================================================================
+
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.benchmarks.suite import DATA_PROCESSED_PATH, escala_filas
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OUTPUT_DIR = PROJECT_ROOT / "outputs" / "benchmarks" / "esquema"
+
+# Cada carga en un proceso nuevo: ru_maxrss es el pico del proceso completo
+_CARGA = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from src.data.esquema import lee_csv
+
+t0 = time.perf_counter()
+df = {lectura}({ruta!r})
+wall_s = time.perf_counter() - t0
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "wall_s":         wall_s,
+    "rss_pico_mb":    maxrss / 1024 ** 2 if sys.platform == "darwin" else maxrss / 1024,
+    "dataframe_mb":   df.memory_usage(deep=True).sum() / 1024 ** 2,
+}}))
+"""
+
+LECTURAS = {"read_csv": "pd.read_csv", "esquema": "lee_csv"}
+
+
+def _mide(codigo: str) -> dict:
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def benchmark_esquema(
+    filas: list = [100_000, 1_000_000],
+    repeticiones: int = 3,
+    input_path: str | None = None,
+    output_dir: str | None = None,
+) -> pd.DataFrame:
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix="bench_esquema_"))
+
+    df_proc = pd.read_csv(input_path or DATA_PROCESSED_PATH)
+    resultados = []
+    for n in filas:
+        ruta = tmp / f"proc_{n}.csv"
+        escala_filas(df_proc, n).to_csv(ruta, index=False)
+        for lectura, funcion in LECTURAS.items():
+            codigo = _CARGA.format(root=str(PROJECT_ROOT), lectura=funcion, ruta=str(ruta))
+            for rep in range(repeticiones):
+                resultados.append({"n_filas": n, "lectura": lectura, "repeticion": rep, **_mide(codigo)})
+        ruta.unlink()
+
+    df_res = (
+        pd.DataFrame(resultados)
+        .groupby(["n_filas", "lectura"], sort=False)[["wall_s", "rss_pico_mb", "dataframe_mb"]]
+        .median()
+        .round(2)
+        .reset_index()
+    )
+    base = df_res[df_res["lectura"] == "read_csv"].set_index("n_filas")
+    df_res["reduccion_dataframe"] = (
+        df_res["n_filas"].map(base["dataframe_mb"]) / df_res["dataframe_mb"]
+    ).round(2)
+    df_res["reduccion_rss"] = (
+        df_res["n_filas"].map(base["rss_pico_mb"]) / df_res["rss_pico_mb"]
+    ).round(2)
+
+    csv_path = output_dir / "carga_esquema.csv"
+    df_res.to_csv(csv_path, index=False)
+
+    print("================================================================================")
+    print("  CARGA DEL CSV PREPROCESADO — DTYPES POR DEFECTO vs ESQUEMA COMPACTO")
+    print("================================================================================")
+    print(df_res.to_string(index=False))
+    print(f"\n  Resultados guardados en: {csv_path}")
+    return df_res
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tiempo y memoria de carga del CSV preprocesado con y sin esquema compacto"
+    )
+    parser.add_argument("--filas", nargs="+", type=int, default=[100_000, 1_000_000],
+                        help="Números de filas a medir (default: 100000 1000000)")
+    parser.add_argument("--repeticiones", "-n", type=int, default=3,
+                        help="Procesos medidos por lectura y tamaño (default: 3)")
+    parser.add_argument("--input", "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/esquema)")
+
+    args = parser.parse_args()
+
+    benchmark_esquema(
+        filas=args.filas,
+        repeticiones=args.repeticiones,
+        input_path=args.input,
+        output_dir=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
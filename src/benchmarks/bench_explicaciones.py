@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK DE LATENCIA DE EXPLICACIONES INDIVIDUALES (LIGHTGBM T0/T1/T2)
+# ==============================================================================
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.explicaciones import ExplicadorEstudiantes
+from src.models.registry import RegistroModelos
+
+# ==============================================================================
+# CONFIGURACIÓN DE PATHS
+# ==============================================================================
+DATA_PROCESSED_PATH = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
+MODELS_ROOT         = PROJECT_ROOT / "outputs" / "models"
+OUTPUT_DIR          = PROJECT_ROOT / "outputs" / "benchmarks" / "explicaciones"
+
+TARGET       = "target_binario"
+RANDOM_STATE = 42
+
+
+def benchmark_explicaciones(
+    input_path: str | None = None,
+    models_root: str | None = None,
+    output_dir: str | None = None,
+    n_estudiantes: int = 200,
+    top_k: int = 5,
+) -> pd.DataFrame:
+    """
+    Mide la latencia por explicación (un estudiante por llamada) y en lote.
+
+    La primera llamada por fase (construcción del contexto) se excluye de
+    las percentiles y se reporta aparte como arranque en frío.
+    """
+    data_path   = Path(input_path)  if input_path  else DATA_PROCESSED_PATH
+    models_root = Path(models_root) if models_root else MODELS_ROOT
+    output_dir  = Path(output_dir)  if output_dir  else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    df = pd.read_csv(data_path)
+    _, X_test, _, _ = train_test_split(
+        df, df[TARGET], test_size=0.2, stratify=df[TARGET], random_state=RANDOM_STATE
+    )
+    X_test = X_test.head(n_estudiantes)
+    filas  = X_test.to_dict(orient="records")
+
+    explicador = ExplicadorEstudiantes(RegistroModelos(models_root))
+
+    resultados = []
+    for fase in ["T0", "T1", "T2"]:
+        t0 = time.perf_counter()
+        explicador.explica_estudiante(filas[0], fase, top_k)
+        frio_ms = (time.perf_counter() - t0) * 1000
+
+        tiempos = []
+        for fila in filas:
+            t0 = time.perf_counter()
+            explicador.explica_estudiante(fila, fase, top_k)
+            tiempos.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        explicador.explica(X_test, fase, top_k)
+        lote_ms = (time.perf_counter() - t0) * 1000
+
+        resultados.append({
+            "fase":                   fase,
+            "n_estudiantes":          len(filas),
+            "arranque_frio_ms":       frio_ms,
+            "latencia_ms_p50":        float(np.percentile(tiempos, 50)),
+            "latencia_ms_p95":        float(np.percentile(tiempos, 95)),
+            "lote_ms_por_estudiante": lote_ms / len(filas),
+        })
+
+    df_resultados = pd.DataFrame(resultados)
+    csv_path = output_dir / "latencia_explicaciones.csv"
+    df_resultados.to_csv(csv_path, index=False)
+
+    print(df_resultados.to_string(index=False))
+    print(f"\nResultados guardados en: {csv_path}")
+    return df_resultados
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de latencia de explicaciones individuales (top-k SHAP)"
+    )
+    parser.add_argument("--input",  "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Raíz de modelos del registro (default: outputs/models)")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/explicaciones)")
+    parser.add_argument("--n", type=int, default=200,
+                        help="Número de estudiantes a explicar (default: 200)")
+    parser.add_argument("--top-k", type=int, default=5,
+                        help="Contribuciones por explicación (default: 5)")
+
+    args = parser.parse_args()
+
+    benchmark_explicaciones(
+        input_path=args.input,
+        models_root=args.models,
+        output_dir=args.output,
+        n_estudiantes=args.n,
+        top_k=args.top_k,
+    )
+
+
+if __name__ == "__main__":
+    main()
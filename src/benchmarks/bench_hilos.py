@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK: PRESUPUESTO DE HILOS Y SOBRESUSCRIPCIÓN
+# ==============================================================================
+#
+# Simula k trials concurrentes (como study.optimize(n_jobs=k)): k hilos que
+# ajustan modelos de una familia sobre datos sintéticos. Compara el
+# throughput (ajustes por segundo) en dos modos:
+#   sin_presupuesto  n_jobs / thread_count = -1 y sin límite de BLAS/OpenMP
+#   con_presupuesto  cada tarea recibe total // k núcleos (PresupuestoHilos)
+#
+# Uso:
+#   python src/benchmarks/bench_hilos.py --familias RF LightGBM --concurrencia 1 2 4 8
+#
+# ==============================================================================
+
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from sklearn.datasets import make_classification
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.hilos import PARAMETRO_HILOS, PresupuestoHilos
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OUTPUT_DIR   = PROJECT_ROOT / "outputs" / "benchmarks" / "hilos"
+RANDOM_STATE = 42
+MODOS        = ["sin_presupuesto", "con_presupuesto"]
+
+
+def crea_modelo(familia: str, hilos: int):
+    """Modelo de tamaño comparable al de un trial de Optuna con hilos explícitos."""
+    if familia == "RL":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=500, random_state=RANDOM_STATE)
+    if familia == "RF":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE, n_jobs=hilos)
+    if familia == "XGBoost":
+        from xgboost import XGBClassifier
+        return XGBClassifier(n_estimators=200, tree_method="hist",
+                             random_state=RANDOM_STATE, n_jobs=hilos)
+    if familia == "LightGBM":
+        from lightgbm import LGBMClassifier
+        return LGBMClassifier(n_estimators=200, random_state=RANDOM_STATE, n_jobs=hilos, verbose=-1)
+    if familia == "CatBoost":
+        from catboost import CatBoostClassifier
+        return CatBoostClassifier(iterations=200, random_seed=RANDOM_STATE,
+                                  thread_count=hilos, verbose=False)
+    raise ValueError(f"Familia desconocida: {familia}")
+
+
+def mide_throughput(familia: str, X, y, concurrencia: int, tareas_por_hilo: int,
+                    presupuesto: PresupuestoHilos | None) -> dict:
+    """Ajusta concurrencia × tareas_por_hilo modelos con `concurrencia` hilos."""
+    hilos  = presupuesto.por_tarea(concurrencia) if presupuesto else -1
+    n      = concurrencia * tareas_por_hilo
+
+    def tarea(_):
+        crea_modelo(familia, hilos).fit(X, y)
+
+    def ejecuta():
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            list(pool.map(tarea, range(n)))
+
+    t0 = time.perf_counter()
+    if presupuesto:
+        with presupuesto.limita(concurrencia):
+            ejecuta()
+    else:
+        ejecuta()
+    wall = time.perf_counter() - t0
+
+    return {
+        "familia":          familia,
+        "modo":             "con_presupuesto" if presupuesto else "sin_presupuesto",
+        "concurrencia":     concurrencia,
+        "hilos_por_tarea":  hilos,
+        "hilos_totales":    None if hilos == -1 else hilos * concurrencia,
+        "tareas":           n,
+        "wall_s":           round(wall, 4),
+        "ajustes_por_s":    round(n / wall, 4),
+    }
+
+
+def benchmark_hilos(
+    familias: list,
+    concurrencias: list,
+    filas: int = 5000,
+    columnas: int = 40,
+    tareas_por_hilo: int = 2,
+    total: int | None = None,
+    output_dir: str | None = None,
+) -> pd.DataFrame:
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    X, y = make_classification(
+        n_samples=filas, n_features=columnas, n_informative=columnas // 2,
+        weights=[0.68, 0.32], random_state=RANDOM_STATE,
+    )
+    presupuesto = PresupuestoHilos(total)
+
+    print("================================================================================")
+    print("  BENCHMARK PRESUPUESTO DE HILOS")
+    print("================================================================================")
+    print(f"  Núcleos del presupuesto : {presupuesto.total}")
+    print(f"  Datos sintéticos        : {filas} × {columnas}")
+
+    filas_resultado = []
+    for familia in familias:
+        for k in concurrencias:
+            for modo in MODOS:
+                r = mide_throughput(familia, X, y, k, tareas_por_hilo,
+                                    presupuesto if modo == "con_presupuesto" else None)
+                filas_resultado.append(r)
+                print(f"  {familia:<9} k={k:<3} {modo:<16} {r['ajustes_por_s']:>8.3f} ajustes/s "
+                      f"({r['wall_s']:.2f}s)")
+
+    df = pd.DataFrame(filas_resultado)
+    tabla = df.pivot_table(index=["familia", "concurrencia"], columns="modo",
+                           values="ajustes_por_s", aggfunc="first")
+    tabla["speedup"] = tabla["con_presupuesto"] / tabla["sin_presupuesto"]
+
+    csv_path = output_dir / "throughput_hilos.csv"
+    df.to_csv(csv_path, index=False)
+
+    print("\n" + tabla.to_string(float_format="{:.3f}".format))
+    print(f"\n  Resultados guardados en: {csv_path}")
+    return df
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Throughput con y sin presupuesto de hilos a varios niveles de concurrencia"
+    )
+    parser.add_argument("--familias", nargs="+", choices=list(PARAMETRO_HILOS), default=["RF", "LightGBM"],
+                        help="Familias a medir (default: RF LightGBM)")
+    parser.add_argument("--concurrencia", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="Trials concurrentes a probar (default: 1 2 4 8)")
+    parser.add_argument("--filas", type=int, default=5000,
+                        help="Filas de los datos sintéticos (default: 5000)")
+    parser.add_argument("--columnas", type=int, default=40,
+                        help="Columnas de los datos sintéticos (default: 40)")
+    parser.add_argument("--tareas-por-hilo", type=int, default=2,
+                        help="Ajustes por hilo concurrente (default: 2)")
+    parser.add_argument("--hilos", type=int, default=None,
+                        help="Núcleos del presupuesto (default: todos)")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/hilos)")
+
+    args = parser.parse_args()
+
+    benchmark_hilos(
+        familias=args.familias,
+        concurrencias=args.concurrencia,
+        filas=args.filas,
+        columnas=args.columnas,
+        tareas_por_hilo=args.tareas_por_hilo,
+        total=args.hilos,
+        output_dir=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK: TIEMPO DE ARRANQUE E IMPORTACIÓN (python -X importtime)
+# ==============================================================================
+#
+# Lanza cada punto de entrada en un proceso nuevo con python -X importtime
+# (scripts con --help, módulos con un import) y mide el tiempo de pared del
+# proceso y el tiempo acumulado de importación que informa el intérprete.
+# Guarda el resumen por punto de entrada y el detalle de los paquetes de
+# primer nivel, de modo que dos ejecuciones (antes/después de un cambio)
+# se comparan directamente.
+#
+# Uso:
+#   python src/benchmarks/bench_importacion.py --repeticiones 5
+#
+# ==============================================================================
+
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OUTPUT_DIR    = PROJECT_ROOT / "outputs" / "benchmarks" / "importacion"
+PIPELINES_DIR = PROJECT_ROOT / "src" / "pipelines"
+TOP_PAQUETES  = 5
+
+# Argumentos del intérprete (tras -X importtime) de cada punto de entrada
+OBJETIVOS = {
+    "config":        ["-c", "import src.utils.config"],
+    "scoring":       ["-c", "import src.models.explicaciones"],
+    "calidad_datos": [str(PIPELINES_DIR / "2_analisis_calidad_datos.py"), "--help"],
+    "orquestador":   [str(PIPELINES_DIR / "4_orquestador_modelado.py"), "--help"],
+    "RL":            [str(PIPELINES_DIR / "4.1_modelo_baseline_RL_train.py"), "--help"],
+    "RF":            [str(PIPELINES_DIR / "4.2_modelo_RF_train.py"), "--help"],
+    "XGBoost":       [str(PIPELINES_DIR / "4.3_modelado_XGBoost_train.py"), "--help"],
+    "LightGBM":      [str(PIPELINES_DIR / "4.4_modelado_LightGBM_train.py"), "--help"],
+    "CatBoost":      [str(PIPELINES_DIR / "4.5_modelado_CatBoost_train.py"), "--help"],
+}
+
+
+def parsea_importtime(stderr: str) -> pd.DataFrame:
+    """
+    Tabla (modulo, nivel, self_s, acumulado_s) de la salida de -X importtime.
+
+    El nivel sale de la sangría del nombre (dos espacios por nivel); los
+    módulos de nivel 0 son los importados directamente por el punto de entrada.
+    """
+    filas = []
+    for linea in stderr.splitlines():
+        if not linea.startswith("import time:") or "imported package" in linea:
+            continue
+        self_us, acumulado_us, nombre = linea.split(":", 1)[1].split("|")
+        filas.append({
+            "modulo":      nombre.strip(),
+            "nivel":       (len(nombre) - len(nombre.lstrip()) - 1) // 2,
+            "self_s":      int(self_us) / 1e6,
+            "acumulado_s": int(acumulado_us) / 1e6,
+        })
+    return pd.DataFrame(filas, columns=["modulo", "nivel", "self_s", "acumulado_s"])
+
+
+def _mide(argumentos: list) -> tuple:
+    t0 = time.perf_counter()
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", *argumentos],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+    )
+    return time.perf_counter() - t0, parsea_importtime(salida.stderr)
+
+
+def benchmark_importacion(
+    objetivos: list | None = None,
+    repeticiones: int = 3,
+    output_dir: str | None = None,
+) -> pd.DataFrame:
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    resumen, detalle = [], []
+    for objetivo in objetivos or list(OBJETIVOS):
+        medidas = []
+        for rep in range(repeticiones):
+            wall_s, df_imp = _mide(OBJETIVOS[objetivo])
+            primer_nivel = df_imp[df_imp["nivel"] == 0]
+            medidas.append({
+                "wall_s":        wall_s,
+                "importacion_s": primer_nivel["acumulado_s"].sum(),
+                "n_modulos":     len(df_imp),
+            })
+        # Detalle de la última repetición (el orden relativo es estable)
+        principales = primer_nivel.nlargest(TOP_PAQUETES, "acumulado_s")
+        detalle.append(primer_nivel.assign(objetivo=objetivo))
+
+        fila = pd.DataFrame(medidas).median()
+        resumen.append({
+            "objetivo":      objetivo,
+            "wall_s":        round(fila["wall_s"], 3),
+            "importacion_s": round(fila["importacion_s"], 3),
+            "n_modulos":     int(fila["n_modulos"]),
+            "principales":   "; ".join(
+                f"{m} ({s:.2f}s)" for m, s in zip(principales["modulo"], principales["acumulado_s"])
+            ),
+        })
+
+    df_res = pd.DataFrame(resumen)
+    csv_path = output_dir / "arranque.csv"
+    df_res.to_csv(csv_path, index=False)
+    pd.concat(detalle, ignore_index=True)[["objetivo", "modulo", "self_s", "acumulado_s"]].to_csv(
+        output_dir / "importaciones_primer_nivel.csv", index=False
+    )
+
+    print("================================================================================")
+    print("  TIEMPO DE ARRANQUE E IMPORTACIÓN (python -X importtime)")
+    print("================================================================================")
+    print(df_res.to_string(index=False))
+    print(f"\n  Resultados guardados en: {csv_path}")
+    return df_res
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tiempo de arranque e importación de cada punto de entrada (-X importtime)"
+    )
+    parser.add_argument("--objetivos", nargs="+", choices=list(OBJETIVOS), default=None,
+                        help="Puntos de entrada a medir (default: todos)")
+    parser.add_argument("--repeticiones", "-n", type=int, default=3,
+                        help="Procesos medidos por punto de entrada (default: 3)")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/importacion)")
+
+    args = parser.parse_args()
+
+    benchmark_importacion(
+        objetivos=args.objetivos,
+        repeticiones=args.repeticiones,
+        output_dir=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
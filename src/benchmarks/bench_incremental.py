@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK: ENTRENAMIENTO INCREMENTAL ENTRE FASES (T0 → T1 → T2)
+# ==============================================================================
+#
+# Ejecuta modelado_<familia> dos veces (independiente e incremental) sobre
+# directorios temporales y compara el tiempo por fase (etapas instrumentadas)
+# y el F1 de validación del modelo optimizado.
+#
+# ==============================================================================
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.benchmarks.suite import FAMILIAS, carga_pipeline
+from src.utils.instrumentacion import INSTRUMENTACION_DIR
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OUTPUT_DIR          = PROJECT_ROOT / "outputs" / "benchmarks" / "incremental"
+FAMILIAS_BOOSTING   = ["XGBoost", "LightGBM", "CatBoost"]
+FASES               = ["T0", "T1", "T2"]
+
+
+def _tiempos_por_fase(nombre_pipeline: str, desde: float) -> dict:
+    """Suma de las etapas de primer nivel por fase del último registro instrumentado."""
+    candidatos = [
+        p for p in INSTRUMENTACION_DIR.glob(f"{nombre_pipeline}_*.json")
+        if p.stat().st_mtime >= desde
+    ]
+    if not candidatos:
+        return {}
+    registros = json.loads(max(candidatos, key=lambda p: p.stat().st_mtime).read_text())["etapas"]
+    tiempos = {}
+    for r in registros:
+        if r.get("padre") is None and r.get("fase") in FASES:
+            tiempos[r["fase"]] = tiempos.get(r["fase"], 0.0) + r["wall_s"]
+    return tiempos
+
+
+def benchmark_incremental(
+    familias: list = FAMILIAS_BOOSTING,
+    input_path: str | None = None,
+    n_trials: int = 10,
+    cv_folds: int = 5,
+    output_dir: str | None = None,
+) -> pd.DataFrame:
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    filas = []
+    for familia in familias:
+        mod      = carga_pipeline(FAMILIAS[familia][0])
+        modelado = getattr(mod, f"modelado_{familia}")
+
+        for incremental in [False, True]:
+            modo = "incremental" if incremental else "independiente"
+            tmp  = Path(tempfile.mkdtemp(prefix=f"bench_incremental_{familia}_"))
+
+            t0 = time.time()
+            modelado(
+                input_path=input_path,
+                output_dir_figures=tmp / "figuras",
+                output_dir_models=tmp / "modelos",
+                mlruns_dir=tmp / "mlruns",
+                n_trials=n_trials,
+                cv_folds=cv_folds,
+                verbose=False,
+                incremental=incremental,
+            )
+            total_s = time.time() - t0
+
+            tiempos = _tiempos_por_fase(f"modelado_{familia}", t0)
+            df_cv   = pd.read_csv(tmp / "modelos" / f"cv_summary_{familia}.csv")
+            df_opt  = df_cv[df_cv["modelo"] == f"{familia}_opt"].set_index("fase")
+
+            for fase in FASES:
+                filas.append({
+                    "familia":     familia,
+                    "modo":        modo,
+                    "fase":        fase,
+                    "wall_s":      tiempos.get(fase),
+                    "f1_val_mean": df_opt.loc[fase, "f1_val_mean"] if fase in df_opt.index else None,
+                })
+            filas.append({"familia": familia, "modo": modo, "fase": "total",
+                          "wall_s": total_s, "f1_val_mean": None})
+
+    df = pd.DataFrame(filas)
+    tabla = df.pivot_table(index=["familia", "fase"], columns="modo",
+                           values=["wall_s", "f1_val_mean"], aggfunc="first")
+    csv_path = output_dir / "incremental_vs_independiente.csv"
+    df.to_csv(csv_path, index=False)
+
+    print("\n" + "================================================================================")
+    print("  INCREMENTAL vs INDEPENDIENTE")
+    print("================================================================================")
+    print(tabla.to_string(float_format="{:.4f}".format))
+    for familia in familias:
+        tot = df[(df["familia"] == familia) & (df["fase"] == "total")].set_index("modo")["wall_s"]
+        ahorro = 1 - tot["incremental"] / tot["independiente"]
+        print(f"\n  {familia}: ahorro end-to-end {ahorro:.1%} "
+              f"({tot['independiente']:.1f}s → {tot['incremental']:.1f}s)")
+    print(f"\n  Resultados guardados en: {csv_path}")
+    return df
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de entrenamiento incremental entre fases"
+    )
+    parser.add_argument("--familias", nargs="+", choices=FAMILIAS_BOOSTING, default=FAMILIAS_BOOSTING,
+                        help="Familias a comparar (default: XGBoost LightGBM CatBoost)")
+    parser.add_argument("--input", "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--n-trials", "-t", type=int, default=10,
+                        help="Trials de Optuna por fase (default: 10)")
+    parser.add_argument("--cv-folds", "-k", type=int, default=5,
+                        help="Número de folds (default: 5)")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/incremental)")
+
+    args = parser.parse_args()
+
+    benchmark_incremental(
+        familias=args.familias,
+        input_path=args.input,
+        n_trials=args.n_trials,
+        cv_folds=args.cv_folds,
+        output_dir=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK ONNX RUNTIME vs LIGHTGBM NATIVO (MODELOS FINALES T0/T1/T2)
+# ==============================================================================
+
+import sys
+import argparse
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import lightgbm as lgb
+from sklearn.model_selection import train_test_split
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.onnx_export import (
+    ScorerONNX,
+    compara_latencia,
+    exporta_modelo_onnx,
+    verifica_paridad,
+)
+
+# ==============================================================================
+# CONFIGURACIÓN DE PATHS
+# ==============================================================================
+DATA_PROCESSED_PATH = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
+MODELS_DIR          = PROJECT_ROOT / "outputs" / "models" / "LightGBM"
+OUTPUT_DIR          = PROJECT_ROOT / "outputs" / "benchmarks" / "onnx"
+
+TARGET       = "target_binario"
+RANDOM_STATE = 42
+
+
+def benchmark_onnx_lightgbm(
+    input_path: str | None = None,
+    models_dir: str | None = None,
+    output_dir: str | None = None,
+    repeticiones: int = 20,
+) -> pd.DataFrame:
+    """
+    Exporta los boosters finales a ONNX, verifica paridad y compara latencia.
+
+    Las columnas crudas de cada fase se toman de las entradas del grafo ONNX,
+    y el split train/test se reproduce con la misma semilla que el modelado.
+    """
+    data_path  = Path(input_path) if input_path else DATA_PROCESSED_PATH
+    models_dir = Path(models_dir) if models_dir else MODELS_DIR
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    df = pd.read_csv(data_path)
+    _, X_test, _, _ = train_test_split(
+        df, df[TARGET], test_size=0.2, stratify=df[TARGET], random_state=RANDOM_STATE
+    )
+
+    resultados = []
+    for fase in ["T0", "T1", "T2"]:
+        booster = lgb.Booster(model_file=str(models_dir / f"lightgbm_final_{fase}.txt"))
+        prep    = joblib.load(models_dir / f"preprocessors_{fase}.joblib")
+        datos   = joblib.load(models_dir / f"datos_evaluacion_{fase}.joblib")
+        X_nativo = datos["X_test_prep"]
+
+        ruta   = exporta_modelo_onnx(booster, prep, "LightGBM", output_dir / f"LightGBM_{fase}.onnx")
+        scorer = ScorerONNX(ruta)
+        X_crudo = X_test[scorer.columnas]
+
+        paridad = verifica_paridad(booster.predict(X_nativo), scorer.predict_proba(X_crudo)[:, 1])
+
+        df_fase = compara_latencia(
+            lambda X: booster.predict(X), scorer, X_nativo, X_crudo,
+            repeticiones=repeticiones,
+        )
+        df_fase.insert(0, "fase", fase)
+        df_fase["paridad_max_abs_diff"]     = paridad["max_abs_diff"]
+        df_fase["paridad_frac_filas_fuera"] = paridad["frac_filas_fuera"]
+        resultados.append(df_fase)
+
+        estado = "OK" if paridad["ok"] else "fuera de tolerancia"
+        print(f"Fase {fase}: paridad {estado} (max |Δp| = {paridad['max_abs_diff']:.2e})")
+
+    df_resultados = pd.concat(resultados, ignore_index=True)
+    csv_path = output_dir / "latencia_onnx_vs_nativo.csv"
+    df_resultados.to_csv(csv_path, index=False)
+
+    print(df_resultados.to_string(index=False))
+    print(f"\nResultados guardados en: {csv_path}")
+    return df_resultados
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de scoring ONNX Runtime vs LightGBM nativo"
+    )
+    parser.add_argument("--input",  "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Directorio con lightgbm_final_T*.txt y preprocessors_T*.joblib")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/onnx)")
+    parser.add_argument("--repeticiones", "-n", type=int, default=20,
+                        help="Repeticiones por tamaño de lote (default: 20)")
+
+    args = parser.parse_args()
+
+    benchmark_onnx_lightgbm(
+        input_path=args.input,
+        models_dir=args.models,
+        output_dir=args.output,
+        repeticiones=args.repeticiones,
+    )
+
+
+if __name__ == "__main__":
+    main()
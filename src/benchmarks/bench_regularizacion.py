@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# BENCHMARK: CURVA DE REGULARIZACIÓN RL (AJUSTES EN FRÍO vs CAMINO WARM-START)
+# ==============================================================================
+#
+# Para cada fase calcula la curva F1(C) de _grafica_curva_regularizacion de
+# dos formas: un LogisticRegression(saga) nuevo por C y fold, y el camino de
+# regularización (C creciente con warm start, folds en paralelo). Informa del
+# tiempo de cada una y de la máxima diferencia en el F1 medio representado.
+#
+# Uso:
+#   python src/benchmarks/bench_regularizacion.py --fases T0 T1 T2
+#
+# ==============================================================================
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.benchmarks.suite import DATA_PROCESSED_PATH, RANDOM_STATE, TARGET, carga_pipeline
+from src.data.fases import VARS_T2
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OUTPUT_DIR = PROJECT_ROOT / "outputs" / "benchmarks" / "regularizacion"
+C_RANGE    = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
+TOLERANCIA = 0.01
+
+
+def benchmark_regularizacion(
+    fases: list = ["T0", "T1", "T2"],
+    cv_folds: int = 5,
+    max_iter: int = 1000,
+    input_path: str | None = None,
+    output_dir: str | None = None,
+) -> pd.DataFrame:
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    mod = carga_pipeline("4.1_modelo_baseline_RL_train.py")
+    df  = pd.read_csv(input_path or DATA_PROCESSED_PATH)
+    X_train, X_test, y_train, _ = train_test_split(
+        df[VARS_T2], df[TARGET], test_size=0.2, stratify=df[TARGET], random_state=RANDOM_STATE
+    )
+
+    filas = []
+    for fase in fases:
+        X_tr, _, _, _ = mod.preprocesamiento_RL(X_train, X_test, y_train, fase)
+
+        curvas = {}
+        for camino in [False, True]:
+            t0 = time.perf_counter()
+            train_f1, val_f1 = mod._f1_curva_regularizacion(
+                X_tr, y_train, cv_folds, C_RANGE, {"max_iter": max_iter}, camino=camino
+            )
+            curvas[camino] = (time.perf_counter() - t0, train_f1.mean(axis=0), val_f1.mean(axis=0))
+
+        t_frio, train_frio, val_frio = curvas[False]
+        t_camino, train_camino, val_camino = curvas[True]
+        dif_val   = float(np.max(np.abs(val_frio - val_camino)))
+        dif_train = float(np.max(np.abs(train_frio - train_camino)))
+        filas.append({
+            "fase":               fase,
+            "ajustes":            cv_folds * len(C_RANGE),
+            "frio_s":             round(t_frio, 4),
+            "camino_s":           round(t_camino, 4),
+            "speedup":            round(t_frio / t_camino, 2),
+            "max_dif_f1_val":     round(dif_val, 6),
+            "max_dif_f1_train":   round(dif_train, 6),
+            "dentro_tolerancia":  max(dif_val, dif_train) <= TOLERANCIA,
+        })
+
+    df_res   = pd.DataFrame(filas)
+    csv_path = output_dir / "curva_regularizacion_rl.csv"
+    df_res.to_csv(csv_path, index=False)
+
+    print("================================================================================")
+    print("  CURVA DE REGULARIZACIÓN RL — FRÍO vs CAMINO WARM-START")
+    print("================================================================================")
+    print(df_res.to_string(index=False))
+    print(f"\n  Resultados guardados en: {csv_path}")
+    return df_res
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tiempo y equivalencia de la curva de regularización RL con warm start"
+    )
+    parser.add_argument("--fases", nargs="+", choices=["T0", "T1", "T2"], default=["T0", "T1", "T2"],
+                        help="Fases a medir (default: T0 T1 T2)")
+    parser.add_argument("--cv-folds", "-k", type=int, default=5,
+                        help="Número de folds (default: 5)")
+    parser.add_argument("--max-iter", type=int, default=1000,
+                        help="max_iter de saga (default: 1000, como la curva baseline)")
+    parser.add_argument("--input", "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de salida (default: outputs/benchmarks/regularizacion)")
+
+    args = parser.parse_args()
+
+    benchmark_regularizacion(
+        fases=args.fases,
+        cv_folds=args.cv_folds,
+        max_iter=args.max_iter,
+        input_path=args.input,
+        output_dir=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
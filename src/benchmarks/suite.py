@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ==============================================================================
+# SUITE DE BENCHMARKS: ENTRENAMIENTO Y SCORING
+# ==============================================================================
+#
+# Casos (parametrizados por número de filas):
+#   carga_csv          lee_csv del CSV crudo (delimitador ';', esquema compacto)
+#   preprocesar_datos  stage 3 completa (feature engineering + guardado)
+#   preprocesamiento   preprocesamiento_<familia> sobre el split train/test
+#   cv                 CV por defecto de cada familia (etapa "cv" de entrena_*)
+#   optuna_trial       un trial de Optuna (etapa "optuna_trial")
+#   scoring_lote       Booster.predict de los LightGBM finales T0/T1/T2
+#
+# Uso:
+#   python src/benchmarks/suite.py ejecuta --filas 1000 4424 20000
+#   python src/benchmarks/suite.py compara <commit_base> <commit_nuevo>
+#
+# ==============================================================================
+
+import sys
+import json
+import platform
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.esquema import lee_csv
+from src.data.fases import VARS_T2
+from src.utils.instrumentacion import etapa, instrumentacion_temporal
+from src.utils.mlflow_asincrono import finaliza_registro_mlflow
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+DATA_RAW_PATH       = PROJECT_ROOT / "data" / "raw" / "data.csv"
+DATA_PROCESSED_PATH = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
+PIPELINES_DIR       = PROJECT_ROOT / "src" / "pipelines"
+LIGHTGBM_DIR        = PROJECT_ROOT / "outputs" / "models" / "LightGBM"
+OUTPUT_DIR          = PROJECT_ROOT / "outputs" / "benchmarks" / "suite"
+
+TARGET       = "target_binario"
+RANDOM_STATE = 42
+FASES        = ["T0", "T1", "T2"]
+
+CASOS = ["carga_csv", "preprocesar_datos", "preprocesamiento", "cv", "optuna_trial", "scoring_lote"]
+
+# familia → (script, preprocesamiento, entrena, entrena_con_optuna)
+FAMILIAS = {
+    "RL":       ("4.1_modelo_baseline_RL_train.py", "preprocesamiento_RL",
+                 "entrena_RL", "entrena_RL_con_optuna"),
+    "RF":       ("4.2_modelo_RF_train.py", "preprocesamiento_RF",
+                 "entrena_RF", "entrena_RF_con_optuna"),
+    "XGBoost":  ("4.3_modelado_XGBoost_train.py", "preprocesamiento_XGBoost",
+                 "entrena_XGBoost", "entrena_XGBoost_con_optuna"),
+    "LightGBM": ("4.4_modelado_LightGBM_train.py", "preprocesamiento_LightGBM",
+                 "entrena_LightGBM", "entrena_LightGBM_con_optuna"),
+    "CatBoost": ("4.5_modelado_CatBoost_train.py", "preprocesamiento_catboost",
+                 "entrena_catboost", "entrena_catBoost_con_optuna"),
+}
+
+UMBRAL_REGRESION = 0.10
+
+
+# ==============================================================================
+# FUNCIONES AUXILIARES
+# ==============================================================================
+
+def carga_pipeline(nombre_script: str):
+    """Importa un script de src/pipelines (sus nombres no son importables)."""
+    ruta = PIPELINES_DIR / nombre_script
+    nombre_modulo = "pipeline_" + ruta.stem.split("_")[0].replace(".", "_")
+    if nombre_modulo in sys.modules:
+        return sys.modules[nombre_modulo]
+    spec = importlib.util.spec_from_file_location(nombre_modulo, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre_modulo] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def escala_filas(df: pd.DataFrame, n_filas: int) -> pd.DataFrame:
+    """Submuestra o remuestrea con reemplazo hasta n_filas (semilla fija)."""
+    return df.sample(
+        n=n_filas, replace=n_filas > len(df), random_state=RANDOM_STATE
+    ).reset_index(drop=True)
+
+
+def _git(*args) -> str:
+    """Salida de un comando git en PROJECT_ROOT ("" si falla)."""
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def info_commit() -> dict:
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "desconocido",
+        "sucio":  bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def _mide(func, repeticiones: int, etapa_objetivo: str = "caso") -> dict:
+    """
+    Ejecuta func `repeticiones` veces bajo un instrumentador temporal.
+
+    Se mide la etapa `etapa_objetivo` (por defecto, la llamada completa); así
+    los casos cv y optuna_trial reutilizan las etapas ya instrumentadas en los
+    pipelines en lugar de duplicar su lógica.
+    """
+    wall, cpu, rss = [], [], []
+    for _ in range(repeticiones):
+        with instrumentacion_temporal("benchmark") as inst:
+            with etapa("caso"):
+                func()
+        registros = [r for r in inst.registros if r["etapa"] == etapa_objetivo]
+        wall.append(sum(r["wall_s"] for r in registros) / max(len(registros), 1))
+        cpu.append(sum(r["cpu_s"] for r in registros) / max(len(registros), 1))
+        rss.append(max(r["rss_pico_mb"] for r in registros))
+    return {
+        "repeticiones": repeticiones,
+        "wall_s":       wall,
+        "mediana_s":    float(np.median(wall)),
+        "min_s":        float(np.min(wall)),
+        "media_s":      float(np.mean(wall)),
+        "std_s":        float(np.std(wall)),
+        "cpu_mediana_s": float(np.median(cpu)),
+        "rss_pico_mb":  float(np.max(rss)),
+    }
+
+
+# ==============================================================================
+# EJECUCIÓN DE LA SUITE
+# ==============================================================================
+
+def ejecuta_suite(
+    filas: list,
+    casos: list = CASOS,
+    familias: list = list(FAMILIAS),
+    fase: str = "T2",
+    cv_folds: int = 5,
+    repeticiones: int = 3,
+    output_dir: str | None = None,
+) -> Path:
+    """Ejecuta los casos seleccionados para cada número de filas y guarda JSON."""
+    import mlflow
+
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    resultados = []
+
+    # Datos reescalados, figuras, modelos, trials y MLflow de los casos van a
+    # un directorio temporal que se elimina al terminar (también si falla)
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp_dir:
+        tmp = Path(tmp_dir)
+        mlflow.set_tracking_uri((tmp / "mlruns").resolve().as_uri())
+        mlflow.set_experiment("TFM_Dropout_Prediction")
+
+        df_raw  = pd.read_csv(DATA_RAW_PATH, delimiter=";")
+        df_proc = lee_csv(DATA_PROCESSED_PATH)
+
+        def _registra(caso, n, medicion, **etiquetas):
+            fila = {"caso": caso, "n_filas": n, **etiquetas, **medicion}
+            resultados.append(fila)
+            desc = " ".join(f"{k}={v}" for k, v in etiquetas.items())
+            print(f"  {caso:<18} n={n:<8} {desc:<22} mediana={medicion['mediana_s']:.4f}s")
+
+        for n in filas:
+            print("\n" + "================================================================================")
+            print(f"  FILAS: {n}")
+            print("================================================================================")
+
+            ruta_raw = tmp / f"raw_{n}.csv"
+            escala_filas(df_raw, n).to_csv(ruta_raw, sep=";", index=False)
+
+            if "carga_csv" in casos:
+                _registra("carga_csv", n, _mide(
+                    lambda: lee_csv(ruta_raw, delimiter=";"), repeticiones))
+
+            if "preprocesar_datos" in casos:
+                prep3 = carga_pipeline("3_preprocesamiento.py")
+                _registra("preprocesar_datos", n, _mide(
+                    lambda: prep3.preprocesar_datos(
+                        ruta_raw, tmp / f"proc_{n}.csv", tmp / "figuras", verbose=False),
+                    repeticiones))
+
+            df = escala_filas(df_proc, n)
+            y  = df[TARGET]
+
+            for familia in familias:
+                if not {"preprocesamiento", "cv", "optuna_trial"} & set(casos):
+                    break
+                script, f_prep, f_entrena, f_optuna = FAMILIAS[familia]
+                mod = carga_pipeline(script)
+                X = df[VARS_T2]
+                X_train, X_test, y_train, _ = train_test_split(
+                    X, y, test_size=0.2, stratify=y, random_state=RANDOM_STATE
+                )
+
+                preprocesa = getattr(mod, f_prep)
+                if "preprocesamiento" in casos:
+                    _registra("preprocesamiento", n, _mide(
+                        lambda: preprocesa(X_train, X_test, y_train, fase), repeticiones),
+                        familia=familia, fase=fase)
+
+                X_tr, _, _, prep = preprocesa(X_train, X_test, y_train, fase)
+                extra = [prep["cat_features_idx"]] if familia == "CatBoost" else []
+                fig_dir = tmp / "figuras" / familia
+                fig_dir.mkdir(parents=True, exist_ok=True)
+
+                if "cv" in casos:
+                    entrena = getattr(mod, f_entrena)
+                    _registra("cv", n, _mide(
+                        lambda: entrena(X_tr, y_train, fase, *extra, cv_folds, fig_dir),
+                        repeticiones, etapa_objetivo="cv"),
+                        familia=familia, fase=fase)
+
+                if "optuna_trial" in casos:
+                    optimiza = getattr(mod, f_optuna)
+                    _registra("optuna_trial", n, _mide(
+                        lambda: optimiza(
+                            X_tr, y_train, fase, *extra, 1, cv_folds, fig_dir,
+                            output_dir_models=tmp / "models" / familia,
+                            output_dir_optuna=tmp / "optuna",
+                        ),
+                        repeticiones, etapa_objetivo="optuna_trial"),
+                        familia=familia, fase=fase)
+
+            if "scoring_lote" in casos:
+                import lightgbm as lgb
+                from src.models.shap_engine import carga_datos_evaluacion
+
+                for f in FASES:
+                    booster = lgb.Booster(model_file=str(LIGHTGBM_DIR / f"lightgbm_final_{f}.txt"))
+                    X_eval, _ = carga_datos_evaluacion(LIGHTGBM_DIR, f)
+                    X_lote = np.resize(X_eval, (n, X_eval.shape[1]))
+                    _registra("scoring_lote", n, _mide(
+                        lambda: booster.predict(X_lote), repeticiones),
+                        familia="LightGBM", fase=f)
+
+        # Las operaciones MLflow encoladas deben escribirse antes de borrar tmp
+        finaliza_registro_mlflow(verbose=False)
+
+    meta = info_commit()
+    salida = {
+        **meta,
+        "fecha":        datetime.now().isoformat(timespec="seconds"),
+        "python":       platform.python_version(),
+        "plataforma":   platform.platform(),
+        "procesador":   platform.processor(),
+        "parametros":   {"filas": filas, "casos": casos, "familias": familias,
+                         "fase": fase, "cv_folds": cv_folds, "repeticiones": repeticiones},
+        "resultados":   resultados,
+    }
+    ruta = output_dir / f"{meta['commit']}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    ruta.write_text(json.dumps(salida, indent=2), encoding="utf-8")
+    print(f"\n  Resultados guardados en: {ruta}")
+    return ruta
+
+
+# ==============================================================================
+# COMPARACIÓN ENTRE COMMITS
+# ==============================================================================
+
+def resuelve_resultados(referencia: str, output_dir: Path = OUTPUT_DIR) -> Path:
+    """
+    Acepta una ruta a JSON o un commit (se toma su ejecución más reciente).
+
+    Los resultados se guardan como <sha corto>_<fecha>.json, así que la
+    referencia (rama, tag, HEAD~1, sha completo) se resuelve antes con
+    git rev-parse --short; si git no la conoce se usa tal cual como prefijo.
+    """
+    ruta = Path(referencia)
+    if ruta.is_file():
+        return ruta
+    commit = _git("rev-parse", "--short", f"{referencia}^{{commit}}") or referencia
+    candidatos = sorted(Path(output_dir).glob(f"{commit}*.json"))
+    if not candidatos:
+        raise FileNotFoundError(f"Sin resultados para '{referencia}' en {output_dir}")
+    return candidatos[-1]
+
+
+def compara_resultados(base: str, nuevo: str, umbral: float = UMBRAL_REGRESION,
+                       output_dir: str | None = None) -> pd.DataFrame:
+    """
+    Compara medianas caso a caso. ratio = nuevo / base; se marca REGRESION
+    si ratio > 1 + umbral y MEJORA si ratio < 1 - umbral.
+    """
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
+    claves = ["caso", "familia", "fase", "n_filas"]
+
+    tablas = {}
+    for nombre, ref in [("base", base), ("nuevo", nuevo)]:
+        datos = json.loads(resuelve_resultados(ref, output_dir).read_text(encoding="utf-8"))
+        df = pd.DataFrame(datos["resultados"]).reindex(columns=claves + ["mediana_s"])
+        tablas[nombre] = df.fillna({"familia": "-", "fase": "-"})
+        print(f"  {nombre:<6}: {datos['commit']}{' (sucio)' if datos['sucio'] else ''}  {datos['fecha']}")
+
+    df_cmp = tablas["base"].merge(tablas["nuevo"], on=claves, suffixes=("_base", "_nuevo"))
+    df_cmp["ratio"] = df_cmp["mediana_s_nuevo"] / df_cmp["mediana_s_base"]
+    df_cmp["estado"] = np.select(
+        [df_cmp["ratio"] > 1 + umbral, df_cmp["ratio"] < 1 - umbral],
+        ["REGRESION", "MEJORA"], default="=",
+    )
+
+    print("\n" + df_cmp.to_string(index=False, float_format="{:.4f}".format))
+    n_reg = int((df_cmp["estado"] == "REGRESION").sum())
+    print(f"\n  Regresiones (> {umbral:.0%}): {n_reg}")
+    return df_cmp
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Suite de benchmarks de entrenamiento y scoring"
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_ej = sub.add_parser("ejecuta", help="Ejecuta la suite y guarda resultados JSON")
+    p_ej.add_argument("--filas", type=int, nargs="+", default=[1000, 4424],
+                      help="Números de filas a evaluar (default: 1000 4424)")
+    p_ej.add_argument("--casos", nargs="+", choices=CASOS, default=CASOS,
+                      help="Casos a ejecutar (default: todos)")
+    p_ej.add_argument("--familias", nargs="+", choices=list(FAMILIAS), default=list(FAMILIAS),
+                      help="Familias de modelos (default: todas)")
+    p_ej.add_argument("--fase", choices=FASES, default="T2",
+                      help="Fase para los casos por familia (default: T2)")
+    p_ej.add_argument("--cv-folds", "-k", type=int, default=5,
+                      help="Folds de CV (default: 5)")
+    p_ej.add_argument("--repeticiones", "-n", type=int, default=3,
+                      help="Repeticiones por caso (default: 3)")
+    p_ej.add_argument("--output", "-o", type=str, default=None,
+                      help="Directorio de resultados (default: outputs/benchmarks/suite)")
+
+    p_cmp = sub.add_parser("compara", help="Compara dos ejecuciones y marca regresiones")
+    p_cmp.add_argument("base",  help="JSON o commit de referencia")
+    p_cmp.add_argument("nuevo", help="JSON o commit a evaluar")
+    p_cmp.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                       help=f"Tolerancia relativa (default: {UMBRAL_REGRESION})")
+    p_cmp.add_argument("--output", "-o", type=str, default=None,
+                       help="Directorio de resultados (default: outputs/benchmarks/suite)")
+
+    args = parser.parse_args()
+
+    if args.comando == "ejecuta":
+        ejecuta_suite(
+            filas=args.filas,
+            casos=args.casos,
+            familias=args.familias,
+            fase=args.fase,
+            cv_folds=args.cv_folds,
+            repeticiones=args.repeticiones,
+            output_dir=args.output,
+        )
+    else:
+        df_cmp = compara_resultados(args.base, args.nuevo, args.umbral, args.output)
+        sys.exit(1 if (df_cmp["estado"] == "REGRESION").any() else 0)
+
+
+if __name__ == "__main__":
+    main()
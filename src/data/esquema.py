@@ -0,0 +1,186 @@
+# src/data/esquema.py
+"""
+Esquema de tipos compacto de la tabla de estudiantes
+====================================================
+Este módulo contiene:
+- DOMINIOS: valores admitidos de cada columna codificada (LABELS,
+  TARGET_VALUES, binarias derivadas y niveles de las agrupaciones)
+- ESQUEMA: dtype más estrecho seguro de cada columna del CSV crudo y del
+  preprocesado, derivado de las listas de constants.py
+- aplica_esquema: valida dominios y convierte un DataFrame al esquema
+- lee_csv: pd.read_csv con dtypes compactos desde la lectura + aplica_esquema
+
+Tipos:
+    binarias (0/1)                : int8
+    códigos nominales / ordinales : entero más estrecho que contiene el dominio
+    agrupaciones de texto, target : category (categorías = dominio ordenado)
+    numéricas discretas           : int16 (no int8: np.log1p sobre int8
+                                    devuelve float16 en el baseline RL)
+    numéricas continuas           : float32
+
+Las categorías se ordenan alfabéticamente, el mismo orden que dan LabelEncoder
+y pd.get_dummies sobre columnas de texto, así que las codificaciones de los
+pipelines no cambian. Una columna fuera de dominio, con faltantes o con
+valores no enteros en una columna entera lanza ValueError con el detalle de
+todas las columnas afectadas; las columnas que no están en el esquema se
+dejan como están.
+
+Example:
+    >>> df = lee_csv(DATA_PROCESSED_PATH)
+    >>> df["course"].dtype, df["mothers_occupation_level"].dtype
+    (dtype('int16'), CategoricalDtype(categories=['Estudiante', ...], ordered=False))
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data.clean_columns import clean_dataframe_columns, normalize_column_name
+from src.utils.constants import (
+    LABELS,
+    NIVELES_AGRUPADOS,
+    TARGET,
+    TARGET_BINARIO,
+    TARGET_VALUES,
+    VARS_BINARIAS,
+    VARS_BINARIAS_DERIVADAS,
+    VARS_CATEGORICAS_NOMINALES,
+    VARS_CATEGORICAS_ORDINALES,
+    VARS_NUMERICAS_CONTINUAS,
+    VARS_NUMERICAS_DISCRETAS,
+)
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+ENTEROS           = (np.int8, np.int16, np.int32, np.int64)
+ENTERO_DISCRETAS  = np.int16
+FLOTANTE          = np.float32
+MAX_VALORES_ERROR = 10
+
+
+def entero_minimo(valores) -> np.dtype:
+    """Entero con signo más estrecho que contiene todos los valores."""
+    bajo, alto = min(valores), max(valores)
+    for dtype in ENTEROS:
+        info = np.iinfo(dtype)
+        if info.min <= bajo and alto <= info.max:
+            return np.dtype(dtype)
+    raise ValueError(f"Valores fuera del rango de int64: [{bajo}, {alto}]")
+
+
+def _construye_dominios() -> dict:
+    dominios = {
+        col: sorted(LABELS[col])
+        for col in VARS_BINARIAS + VARS_CATEGORICAS_NOMINALES + VARS_CATEGORICAS_ORDINALES
+    }
+    dominios.update({col: [0, 1] for col in VARS_BINARIAS_DERIVADAS + [TARGET_BINARIO]})
+    dominios.update({col: sorted(niveles) for col, niveles in NIVELES_AGRUPADOS.items()})
+    dominios[TARGET[0]] = sorted(TARGET_VALUES)
+    return dominios
+
+
+def _construye_esquema(dominios: dict) -> dict:
+    esquema = {}
+    for col, dominio in dominios.items():
+        if all(isinstance(v, str) for v in dominio):
+            esquema[col] = pd.CategoricalDtype(dominio)
+        else:
+            esquema[col] = entero_minimo(dominio)
+    esquema.update({col: np.dtype(ENTERO_DISCRETAS) for col in VARS_NUMERICAS_DISCRETAS})
+    esquema.update({col: np.dtype(FLOTANTE) for col in VARS_NUMERICAS_CONTINUAS})
+    return esquema
+
+
+DOMINIOS = _construye_dominios()
+ESQUEMA  = _construye_esquema(DOMINIOS)
+
+
+# ==============================================================================
+# VALIDACIÓN Y CONVERSIÓN
+# ==============================================================================
+
+def _fuera_de_esquema(serie: pd.Series, dtype) -> pd.Index:
+    """Valores distintos de la serie que no caben en el dtype o su dominio."""
+    col = serie.name
+    if isinstance(dtype, pd.CategoricalDtype):
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            valores = serie.cat.remove_unused_categories().cat.categories
+        else:
+            valores = pd.Index(serie.unique())
+        return valores.difference(dtype.categories)
+
+    if col in DOMINIOS:
+        return pd.Index(serie.unique()).difference(DOMINIOS[col])
+
+    if dtype.kind == "i":
+        valores = serie.to_numpy()
+        info = np.iinfo(dtype)
+        malos = (valores != np.round(valores)) | (valores < info.min) | (valores > info.max)
+        return pd.Index(np.unique(valores[malos]))
+
+    return pd.Index([])
+
+
+def aplica_esquema(df: pd.DataFrame, esquema: dict | None = None) -> pd.DataFrame:
+    """
+    Valida y convierte (en el sitio) las columnas de df presentes en el esquema.
+
+    Primero se validan todas las columnas y, solo si ninguna falla, se
+    convierten una a una, de modo que el pico de memoria es el de una columna.
+
+    Parámetros
+    ----------
+    df      : DataFrame con nombres de columna normalizados
+    esquema : columna → dtype (default: ESQUEMA)
+
+    Retorna
+    -------
+    El mismo DataFrame con los dtypes del esquema.
+    """
+    esquema = ESQUEMA if esquema is None else esquema
+    columnas = [col for col in df.columns if col in esquema]
+
+    errores = []
+    for col in columnas:
+        faltantes = int(df[col].isna().sum())
+        if faltantes:
+            errores.append(f"{col}: {faltantes} valores faltantes")
+            continue
+        fuera = _fuera_de_esquema(df[col], esquema[col])
+        if len(fuera):
+            muestra = ", ".join(map(str, fuera[:MAX_VALORES_ERROR]))
+            errores.append(f"{col}: {len(fuera)} valores fuera de dominio ({muestra})")
+    if errores:
+        raise ValueError("Datos fuera del esquema:\n  " + "\n  ".join(errores))
+
+    for col in columnas:
+        if df[col].dtype != esquema[col]:
+            df[col] = df[col].astype(esquema[col])
+    return df
+
+
+def _dtype_lectura(dtype):
+    # Enteros leídos como float32 (exacto hasta 2**24): los faltantes y los
+    # valores no enteros llegan a aplica_esquema y se informan por columna
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category"
+    return np.dtype(FLOTANTE)
+
+
+def lee_csv(ruta, **kwargs) -> pd.DataFrame:
+    """
+    pd.read_csv con el esquema compacto aplicado desde la lectura.
+
+    Los dtypes de lectura se asignan por nombre normalizado, así que sirve
+    tanto para el CSV crudo (delimiter=';') como para el preprocesado. El
+    resultado tiene las columnas normalizadas y validadas con aplica_esquema.
+    """
+    cabecera = pd.read_csv(ruta, nrows=0, **kwargs).columns
+    dtypes = {
+        col: _dtype_lectura(ESQUEMA[normalize_column_name(col)])
+        for col in cabecera if normalize_column_name(col) in ESQUEMA
+    }
+    df = pd.read_csv(ruta, dtype=dtypes, **kwargs)
+    if any(normalize_column_name(col) != col for col in df.columns):
+        df = clean_dataframe_columns(df)
+    return aplica_esquema(df)
@@ -0,0 +1,175 @@
+# src/data/fases.py
+"""
+Especificación de variables por fase temporal
+=============================================
+Este módulo contiene:
+- VARIABLES_NUEVAS: declaración única de las variables que se incorporan en
+  cada fase (T0 matrícula, T1 fin del 1er semestre, T2 fin del 2º semestre),
+  agrupadas por rol
+- VARS_T0 / VARS_T1 / VARS_T2: variables de cada fase, derivadas de la
+  declaración (VARS_T2 es el orden de columnas de la matriz X de los pipelines)
+- EspecificacionFase: columnas de cada rol en una fase y sus índices enteros
+  en VARS_T2, precalculados al importar el módulo
+- especificacion(fase): especificación de una fase (ValueError si no existe)
+
+Roles (mismas claves en todos los pipelines):
+    binarias        : variables 0/1, sin codificar
+    numericas       : numéricas y ordinales
+    categoricas     : agrupaciones de texto; cada familia elige su codificación
+                      (one-hot en RL, LabelEncoder en RF/XGBoost/LightGBM,
+                      nativas en CatBoost)
+    categoricas_te  : target encoding (course)
+    todas           : todas las variables de la fase, en el orden de VARS_T2
+
+Cada fase amplía la anterior, así que VARS_T0 ⊂ VARS_T1 ⊂ VARS_T2 y las
+columnas de una fase son un prefijo de VARS_T2. Los pipelines cargan X una
+vez con el orden de VARS_T2 y seleccionan la fase por posición
+(DataFrame.take / np.take) en lugar de reconstruir listas de nombres y hacer
+X[cols].copy() en cada llamada.
+
+Example:
+    >>> X = df[VARS_T2]
+    >>> variables_fase = especificacion("T1")
+    >>> X_fase = variables_fase.selecciona(X)
+    >>> variables_fase["categoricas"], variables_fase.indices["binarias"]
+"""
+
+import numpy as np
+
+# ==============================================================================
+# DECLARACIÓN DE VARIABLES POR FASE
+# ==============================================================================
+FASES = ["T0", "T1", "T2"]
+
+# Orden de los roles dentro del bloque que añade cada fase
+ORDEN_ROLES = ("binarias", "numericas", "categoricas", "categoricas_te", "ordinales")
+
+VARIABLES_NUEVAS = {
+    "T0": {
+        "binarias": [
+            "daytimeevening_attendance",
+            "displaced",
+            "educational_special_needs",
+            "gender",
+            "scholarship_holder",
+            "international",
+            "is_single",
+        ],
+        "numericas": [
+            "age_at_enrollment",
+            "admission_grade",
+            "previous_qualification_grade",
+        ],
+        "categoricas": [
+            "application_mode_risk",
+            "previous_qualification_risk",
+            "mothers_qualification_level",
+            "fathers_qualification_level",
+            "mothers_occupation_level",
+            "fathers_occupation_level",
+        ],
+        "categoricas_te": ["course"],
+        "ordinales":      ["application_order"],
+    },
+    "T1": {
+        "binarias": [
+            "debtor",
+            "tuition_fees_up_to_date",
+        ],
+        "numericas": [
+            "curricular_units_1st_sem_credited",
+            "curricular_units_1st_sem_enrolled",
+            "curricular_units_1st_sem_evaluations",
+            "curricular_units_1st_sem_approved",
+            "curricular_units_1st_sem_grade",
+            "curricular_units_1st_sem_without_evaluations",
+            "unemployment_rate",
+            "inflation_rate",
+            "gdp",
+        ],
+    },
+    "T2": {
+        "numericas": [
+            "curricular_units_2nd_sem_credited",
+            "curricular_units_2nd_sem_enrolled",
+            "curricular_units_2nd_sem_evaluations",
+            "curricular_units_2nd_sem_approved",
+            "curricular_units_2nd_sem_grade",
+            "curricular_units_2nd_sem_without_evaluations",
+        ],
+    },
+}
+
+
+def _acumula_roles() -> dict:
+    """fase → rol → columnas acumuladas hasta esa fase (ordinales como numéricas)."""
+    acumulado = {"binarias": [], "numericas": [], "categoricas": [], "categoricas_te": [], "todas": []}
+    roles_por_fase = {}
+    for fase in FASES:
+        nuevas = VARIABLES_NUEVAS[fase]
+        acumulado = {
+            "binarias":       acumulado["binarias"] + nuevas.get("binarias", []),
+            "numericas":      acumulado["numericas"] + nuevas.get("numericas", []) + nuevas.get("ordinales", []),
+            "categoricas":    acumulado["categoricas"] + nuevas.get("categoricas", []),
+            "categoricas_te": acumulado["categoricas_te"] + nuevas.get("categoricas_te", []),
+            "todas":          acumulado["todas"] + [c for rol in ORDEN_ROLES for c in nuevas.get(rol, [])],
+        }
+        roles_por_fase[fase] = acumulado
+    return roles_por_fase
+
+
+_ROLES_POR_FASE = _acumula_roles()
+
+VARS_T0 = _ROLES_POR_FASE["T0"]["todas"]
+VARS_T1 = _ROLES_POR_FASE["T1"]["todas"]
+VARS_T2 = _ROLES_POR_FASE["T2"]["todas"]
+
+POSICIONES = {col: i for i, col in enumerate(VARS_T2)}
+
+
+# ==============================================================================
+# ESPECIFICACIÓN POR FASE
+# ==============================================================================
+
+class EspecificacionFase:
+    """
+    Columnas por rol de una fase y sus índices en VARS_T2.
+
+    variables_fase["rol"] devuelve la lista de nombres (como el antiguo dict
+    de obtiene_variables_por_fase); variables_fase.indices["rol"] el array de
+    posiciones correspondiente.
+    """
+
+    def __init__(self, fase: str, columnas: dict):
+        self.fase     = fase
+        self.columnas = columnas
+        self.indices  = {
+            rol: np.array([POSICIONES[c] for c in cols], dtype=np.intp)
+            for rol, cols in columnas.items()
+        }
+
+    def __getitem__(self, rol: str) -> list:
+        return self.columnas[rol]
+
+    def selecciona(self, X, rol: str = "todas"):
+        """
+        Columnas del rol por posición, sobre una X con el orden de VARS_T2.
+
+        Con DataFrame devuelve un DataFrame nuevo (una sola copia, modificable
+        sin avisos de SettingWithCopy); con array, np.take.
+        """
+        idx = self.indices[rol]
+        if hasattr(X, "columns") and list(X.columns[idx]) != self.columnas[rol]:
+            raise ValueError(
+                f"X no sigue el orden de columnas de VARS_T2 (fase {self.fase}, rol {rol})"
+            )
+        return X.take(idx, axis=1)
+
+
+ESPECIFICACIONES = {fase: EspecificacionFase(fase, _ROLES_POR_FASE[fase]) for fase in FASES}
+
+
+def especificacion(fase: str) -> EspecificacionFase:
+    if fase not in ESPECIFICACIONES:
+        raise ValueError(f"Fase no válida: {fase}. Usar 'T0', 'T1' o 'T2'.")
+    return ESPECIFICACIONES[fase]
@@ -0,0 +1,329 @@
+# src/data/sintetico.py
+"""
+Generador de datos sintéticos de estudiantes
+============================================
+Este módulo contiene:
+- GeneradorSintetico: aprende del CSV crudo las distribuciones condicionadas
+  al target y los bloques de variables dependientes
+- Generación vectorizada por chunks en el mismo esquema crudo (';')
+- Persistencia del modelo ajustado en JSON (para generar sin los datos reales)
+
+Cada fila se genera condicionando al target: primero se muestrea la clase y,
+dentro de ella, cada grupo de columnas por separado. Los grupos conjuntos
+(unidades curriculares, indicadores macroeconómicos, curso y horario) se
+muestrean como tuplas observadas, lo que preserva sus restricciones internas
+(aprobadas <= matriculadas, nota 0 sin aprobadas...). Las numéricas continuas
+se muestrean invirtiendo sus cuantiles. Las columnas con dominio en LABELS
+solo toman valores de ese dominio.
+
+Example:
+    >>> gen = GeneradorSintetico().ajusta(pd.read_csv(DATA_RAW_PATH, delimiter=";"))
+    >>> gen.genera_csv("data/synthetic/data_50000000.csv", n_filas=50_000_000)
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.clean_columns import clean_dataframe_columns
+from src.utils.constants import LABELS, VARS_NUMERICAS
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+DATA_RAW_PATH = PROJECT_ROOT / "data" / "raw" / "data.csv"
+SYNTHETIC_DIR = PROJECT_ROOT / "data" / "synthetic"
+
+COLUMNA_TARGET = "target"
+
+COLUMNAS_CURRICULARES = [c for c in VARS_NUMERICAS if c.startswith("curricular_units_")]
+COLUMNAS_NOTA         = [c for c in COLUMNAS_CURRICULARES if c.endswith("_grade")]
+
+GRUPOS_CONJUNTOS = [
+    COLUMNAS_CURRICULARES,
+    ["unemployment_rate", "inflation_rate", "gdp"],
+    ["course", "daytimeevening_attendance"],
+]
+
+# Numéricas continuas → decimales de redondeo
+COLUMNAS_CONTINUAS = {
+    "previous_qualification_grade": 1,
+    "admission_grade":              1,
+    "age_at_enrollment":            0,
+}
+
+N_CUANTILES  = 201
+RUIDO_NOTAS  = 0.25
+TAMANO_CHUNK = 1_000_000
+SEMILLA      = 42
+
+
+def _mascara_dominios(df: pd.DataFrame) -> np.ndarray:
+    """Filas cuyas columnas con dominio en LABELS tienen valores válidos."""
+    mascara = np.ones(len(df), dtype=bool)
+    for col in df.columns:
+        if col in LABELS:
+            mascara &= df[col].isin(list(LABELS[col])).to_numpy()
+    return mascara
+
+
+# ==============================================================================
+# GENERADOR
+# ==============================================================================
+
+class GeneradorSintetico:
+    """
+    Modelo generativo ajustado sobre el CSV crudo.
+
+    Atributos tras ajusta():
+        columnas:   nombre limpio → nombre crudo (en el orden del CSV)
+        tipos:      nombre limpio → "int" | "float"
+        clases:     valores del target y sus probabilidades
+        discretas:  por grupo de columnas, tabla de tuplas y probabilidades por clase
+        continuas:  por columna continua, cuantiles por clase
+    """
+
+    def __init__(self):
+        self.columnas      = {}
+        self.tipos         = {}
+        self.clases        = []
+        self.prob_clases   = None
+        self.discretas     = []
+        self.continuas     = {}
+        self.limites_notas = {}
+
+    # ------------------------------------------------------------------
+    # Ajuste
+    # ------------------------------------------------------------------
+    def ajusta(self, df_raw: pd.DataFrame) -> "GeneradorSintetico":
+        df = clean_dataframe_columns(df_raw)
+        self.columnas = dict(zip(df.columns, df_raw.columns))
+        self.tipos    = {
+            c: "int" if pd.api.types.is_integer_dtype(df[c]) else "float"
+            for c in df.columns if c != COLUMNA_TARGET
+        }
+
+        target = df[COLUMNA_TARGET].astype(str)
+        clases, conteos  = np.unique(target, return_counts=True)
+        self.clases      = clases.tolist()
+        self.prob_clases = conteos / conteos.sum()
+
+        en_grupo = {c for g in GRUPOS_CONJUNTOS for c in g}
+        grupos   = [g for g in GRUPOS_CONJUNTOS if set(g) <= set(df.columns)] + [
+            [c] for c in df.columns
+            if c not in en_grupo and c not in COLUMNAS_CONTINUAS and c != COLUMNA_TARGET
+        ]
+
+        self.discretas = []
+        for grupo in grupos:
+            por_clase = {}
+            for clase in self.clases:
+                sub     = df.loc[target == clase, grupo]
+                tuplas  = sub[_mascara_dominios(sub)].value_counts()
+                valores = tuplas.index.to_frame(index=False)
+                por_clase[clase] = {
+                    "prob":    (tuplas / tuplas.sum()).to_numpy(),
+                    "valores": {c: valores[c].to_numpy() for c in grupo},
+                }
+            self.discretas.append({"columnas": grupo, "por_clase": por_clase})
+
+        rejilla = np.linspace(0, 1, N_CUANTILES)
+        self.continuas = {
+            col: {clase: np.quantile(df.loc[target == clase, col], rejilla) for clase in self.clases}
+            for col in COLUMNAS_CONTINUAS if col in df.columns
+        }
+
+        self.limites_notas = {
+            col: (float(df.loc[df[col] > 0, col].min()), float(df[col].max()))
+            for col in COLUMNAS_NOTA if col in df.columns
+        }
+        return self
+
+    # ------------------------------------------------------------------
+    # Generación
+    # ------------------------------------------------------------------
+    def genera(self, n_filas: int, rng: np.random.Generator | None = None) -> pd.DataFrame:
+        """Genera n_filas en memoria con el esquema crudo (nombres originales)."""
+        rng = rng if rng is not None else np.random.default_rng(SEMILLA)
+
+        idx_clase = rng.choice(len(self.clases), size=n_filas, p=self.prob_clases)
+        datos = {
+            c: np.empty(n_filas, dtype=np.int64 if t == "int" else np.float64)
+            for c, t in self.tipos.items()
+        }
+
+        rejilla = np.linspace(0, 1, N_CUANTILES)
+        for k, clase in enumerate(self.clases):
+            filas = np.flatnonzero(idx_clase == k)
+            if filas.size == 0:
+                continue
+
+            for grupo in self.discretas:
+                tabla = grupo["por_clase"][clase]
+                idx   = rng.choice(tabla["prob"].size, size=filas.size, p=tabla["prob"])
+                for col, valores in tabla["valores"].items():
+                    datos[col][filas] = valores[idx]
+
+            for col, cuantiles in self.continuas.items():
+                valores = np.interp(rng.random(filas.size), rejilla, cuantiles[clase])
+                datos[col][filas] = np.round(valores, COLUMNAS_CONTINUAS[col])
+
+        # Ruido en las notas no nulas para no repetir solo las tuplas observadas
+        for col, (minimo, maximo) in self.limites_notas.items():
+            notas    = datos[col]
+            positivo = notas > 0
+            notas[positivo] = np.clip(
+                notas[positivo] + rng.normal(0, RUIDO_NOTAS, int(positivo.sum())), minimo, maximo
+            )
+
+        datos[COLUMNA_TARGET] = np.asarray(self.clases, dtype=object)[idx_clase]
+        df = pd.DataFrame({c: datos[c] for c in self.columnas})
+        return df.rename(columns=self.columnas)
+
+    def genera_csv(
+        self,
+        ruta: str | Path,
+        n_filas: int,
+        tamano_chunk: int = TAMANO_CHUNK,
+        semilla: int = SEMILLA,
+        verbose: bool = True,
+    ) -> Path:
+        """
+        Escribe n_filas en un CSV ';' por chunks de tamano_chunk filas.
+
+        Cada chunk usa un generador derivado de la semilla (SeedSequence), de
+        modo que el resultado es reproducible y la memoria es O(tamano_chunk).
+        """
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+
+        n_chunks = -(-n_filas // tamano_chunk)
+        semillas = np.random.SeedSequence(semilla).spawn(n_chunks)
+
+        t0 = time.perf_counter()
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            for i, inicio in enumerate(range(0, n_filas, tamano_chunk)):
+                m  = min(tamano_chunk, n_filas - inicio)
+                df = self.genera(m, np.random.default_rng(semillas[i]))
+                df.to_csv(f, sep=";", index=False, header=(i == 0))
+                if verbose:
+                    print(f"  Chunk {i + 1}/{n_chunks}: {inicio + m:,} filas "
+                          f"({time.perf_counter() - t0:.1f}s)")
+        return ruta
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def guarda(self, ruta: str | Path) -> Path:
+        """Guarda el modelo ajustado en JSON."""
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        modelo = {
+            "columnas":      self.columnas,
+            "tipos":         self.tipos,
+            "clases":        self.clases,
+            "prob_clases":   self.prob_clases.tolist(),
+            "discretas": [
+                {
+                    "columnas":  g["columnas"],
+                    "por_clase": {
+                        clase: {
+                            "prob":    t["prob"].tolist(),
+                            "valores": {c: v.tolist() for c, v in t["valores"].items()},
+                        }
+                        for clase, t in g["por_clase"].items()
+                    },
+                }
+                for g in self.discretas
+            ],
+            "continuas": {
+                col: {clase: q.tolist() for clase, q in por_clase.items()}
+                for col, por_clase in self.continuas.items()
+            },
+            "limites_notas": self.limites_notas,
+        }
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(modelo, f, indent=2, ensure_ascii=False)
+        return ruta
+
+    @classmethod
+    def carga(cls, ruta: str | Path) -> "GeneradorSintetico":
+        """Carga un modelo guardado con guarda()."""
+        with open(ruta, encoding="utf-8") as f:
+            modelo = json.load(f)
+
+        gen = cls()
+        gen.columnas    = modelo["columnas"]
+        gen.tipos       = modelo["tipos"]
+        gen.clases      = modelo["clases"]
+        gen.prob_clases = np.asarray(modelo["prob_clases"])
+        gen.discretas   = [
+            {
+                "columnas":  g["columnas"],
+                "por_clase": {
+                    clase: {
+                        "prob":    np.asarray(t["prob"]),
+                        "valores": {
+                            c: np.asarray(v, dtype=np.int64 if gen.tipos[c] == "int" else np.float64)
+                            for c, v in t["valores"].items()
+                        },
+                    }
+                    for clase, t in g["por_clase"].items()
+                },
+            }
+            for g in modelo["discretas"]
+        ]
+        gen.continuas = {
+            col: {clase: np.asarray(q) for clase, q in por_clase.items()}
+            for col, por_clase in modelo["continuas"].items()
+        }
+        gen.limites_notas = {c: tuple(l) for c, l in modelo["limites_notas"].items()}
+        return gen
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Genera datos sintéticos de estudiantes en el esquema crudo (';')"
+    )
+    parser.add_argument("--input", "-i", type=str, default=None,
+                        help="CSV crudo de referencia (default: data/raw/data.csv)")
+    parser.add_argument("--modelo", "-m", type=str, default=None,
+                        help="Modelo JSON ya ajustado (si se indica, no se lee --input)")
+    parser.add_argument("--guarda-modelo", type=str, default=None,
+                        help="Ruta donde guardar el modelo ajustado en JSON")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="CSV de salida (default: data/synthetic/data_<filas>.csv)")
+    parser.add_argument("--filas", "-n", type=int, default=100_000,
+                        help="Número de filas a generar (default: 100000)")
+    parser.add_argument("--chunk", type=int, default=TAMANO_CHUNK,
+                        help=f"Filas por chunk (default: {TAMANO_CHUNK})")
+    parser.add_argument("--semilla", type=int, default=SEMILLA,
+                        help=f"Semilla (default: {SEMILLA})")
+
+    args = parser.parse_args()
+
+    if args.modelo:
+        gen = GeneradorSintetico.carga(args.modelo)
+    else:
+        input_path = Path(args.input) if args.input else DATA_RAW_PATH
+        gen = GeneradorSintetico().ajusta(pd.read_csv(input_path, delimiter=";"))
+    if args.guarda_modelo:
+        print(f"Modelo guardado en: {gen.guarda(args.guarda_modelo)}")
+
+    output = Path(args.output) if args.output else SYNTHETIC_DIR / f"data_{args.filas}.csv"
+    gen.genera_csv(output, args.filas, args.chunk, args.semilla)
+    print(f"\nDatos sintéticos guardados en: {output}")
+
+
+if __name__ == "__main__":
+    main()
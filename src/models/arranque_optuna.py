@@ -0,0 +1,171 @@
+# src/models/arranque_optuna.py
+"""
+Arranque en caliente de la búsqueda de hiperparámetros
+======================================================
+Este módulo contiene:
+- Lectura y escritura de best_params_cv.json por familia ({fase: params}),
+  los mejores parámetros de la última búsqueda Optuna de cada fase
+- Persistencia de estudios Optuna en SQLite (<models_dir>/optuna_estudios.db)
+- crea_estudio: crea el estudio de una fase y, en modo arranque en caliente,
+  encola como primeros trials los mejores parámetros previos y los top-k
+  trials históricos de estudios anteriores de la misma fase
+
+Tras un refresco rutinario de datos el óptimo apenas se desplaza, de modo
+que TPE parte de configuraciones ya buenas y alcanza el mismo F1 con una
+fracción de n_trials. Sin arranque en caliente el estudio es el mismo que
+antes (en memoria, sin trials encolados).
+
+best_params_cv.json es un fichero propio de la búsqueda: best_params.json
+acompaña a los modelos finales (lightgbm_final_T*.txt) y lo lee el registro
+de modelos, así que los pipelines nunca lo sobrescriben. Solo se lee como
+respaldo: si best_params_cv.json no tiene la fase (primera ejecución con
+arranque en caliente), se encola la configuración de best_params.json.
+
+Example:
+    >>> study = crea_estudio(f"F1-score_LightGBM_{fase}", sampler, models_dir, fase,
+    ...                      arranque_caliente=True, top_k=5)
+    >>> study.optimize(objective, n_trials=10)
+"""
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# optuna se importa en las funciones de estudios: el orquestador y los
+# procesos que solo leen best_params_cv.json no lo cargan
+if TYPE_CHECKING:
+    import optuna
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+ARCHIVO_BEST_PARAMS = "best_params_cv.json"
+ARCHIVO_BEST_PARAMS_FINAL = "best_params.json"   # modelos finales; solo lectura
+ARCHIVO_ESTUDIOS    = "optuna_estudios.db"
+SEPARADOR_ESTUDIO   = "__"
+
+
+# ==============================================================================
+# BEST PARAMS
+# ==============================================================================
+
+def carga_best_params(models_dir: Path, fase: str) -> dict:
+    """
+    Mejores parámetros previos de la fase ({} si no hay).
+
+    Lee best_params_cv.json y, si no tiene la fase, best_params.json de los
+    modelos finales (que nunca se escribe desde aquí).
+    """
+    for nombre in (ARCHIVO_BEST_PARAMS, ARCHIVO_BEST_PARAMS_FINAL):
+        ruta = Path(models_dir) / nombre
+        if ruta.exists():
+            params = json.loads(ruta.read_text(encoding="utf-8")).get(fase, {})
+            if params:
+                return params
+    return {}
+
+
+def guarda_best_params(models_dir: Path, fase: str, params: dict) -> Path:
+    """Actualiza la entrada de la fase en best_params_cv.json (escritura atómica)."""
+    ruta  = Path(models_dir) / ARCHIVO_BEST_PARAMS
+    todos = json.loads(ruta.read_text(encoding="utf-8")) if ruta.exists() else {}
+    todos[fase] = params
+    escribe_json_atomico(ruta, todos)
+    return ruta
+
+
+def escribe_json_atomico(ruta: Path, contenido: dict) -> None:
+    """Escribe en un temporal del mismo directorio y lo renombra con os.replace."""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(contenido, indent=2), encoding="utf-8")
+    os.replace(tmp, ruta)
+
+
+# ==============================================================================
+# ESTUDIOS PERSISTIDOS
+# ==============================================================================
+
+def storage_estudios(models_dir: Path) -> str:
+    return f"sqlite:///{(Path(models_dir) / ARCHIVO_ESTUDIOS).resolve()}"
+
+
+def top_k_historico(storage: str, study_name: str, k: int) -> list:
+    """Parámetros de los k mejores trials completados de estudios previos."""
+    import optuna
+    from optuna.trial import TrialState
+
+    try:
+        resumenes = optuna.get_all_study_summaries(storage, include_best_trial=False)
+    except Exception:
+        return []
+
+    trials = []
+    for resumen in resumenes:
+        if resumen.study_name.split(SEPARADOR_ESTUDIO)[0] != study_name:
+            continue
+        estudio = optuna.load_study(study_name=resumen.study_name, storage=storage)
+        trials.extend(
+            t for t in estudio.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+            if t.value is not None
+        )
+    trials.sort(key=lambda t: t.value, reverse=True)
+    return [t.params for t in trials[:k]]
+
+
+def crea_estudio(
+    study_name: str,
+    sampler: "optuna.samplers.BaseSampler",
+    models_dir: Path,
+    fase: str,
+    arranque_caliente: bool = False,
+    top_k: int = 0,
+    pruner: "optuna.pruners.BasePruner | None" = None,
+    params_iniciales: list | None = None,
+    verbose: bool = True,
+) -> "optuna.Study":
+    """
+    Crea el estudio (maximize) de una fase.
+
+    params_iniciales (p. ej. los mejores parámetros de la fase anterior) se
+    encolan siempre en primer lugar. Con arranque_caliente=True el estudio
+    se persiste además en SQLite con nombre <study_name>__<timestamp> y se
+    encolan los mejores parámetros previos de la fase (best_params_cv.json o,
+    en su defecto, best_params.json) y los top_k trials históricos (sin
+    duplicados).
+    """
+    import optuna
+    from optuna.trial import TrialState
+
+    semillas = list(params_iniciales or [])
+
+    if arranque_caliente:
+        Path(models_dir).mkdir(parents=True, exist_ok=True)
+        storage   = storage_estudios(models_dir)
+        historico = top_k_historico(storage, study_name, top_k) if top_k > 0 else []
+        semillas += [carga_best_params(models_dir, fase)] + historico
+
+        study = optuna.create_study(
+            direction="maximize",
+            study_name=f"{study_name}{SEPARADOR_ESTUDIO}{datetime.now():%Y%m%d_%H%M%S}",
+            sampler=sampler,
+            pruner=pruner,
+            storage=storage,
+        )
+    else:
+        study = optuna.create_study(
+            direction="maximize", study_name=study_name, sampler=sampler, pruner=pruner
+        )
+
+    for params in semillas:
+        if params:
+            study.enqueue_trial(params, skip_if_exists=True)
+
+    n_encolados = len(study.get_trials(deepcopy=False, states=(TrialState.WAITING,)))
+    if verbose and n_encolados:
+        print(f"  Trials encolados       : {n_encolados} (fase previa / best_params / "
+              f"top-{top_k} histórico)")
+    return study
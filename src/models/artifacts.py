@@ -0,0 +1,318 @@
+# src/models/artifacts.py
+"""
+Formato ligero de artefactos de evaluación y preprocesamiento
+=============================================================
+Este módulo contiene:
+- Escritura de datos_evaluacion como arrays .npy (memory-mappable) y
+  metadatos JSON
+- Escritura de preprocessors como mapeos JSON + NPZ, sin objetos pickle
+  de pandas/sklearn/category_encoders
+- Cargador perezoso que mapea cada array bajo demanda
+- Transformación de datos crudos a partir de los mapeos ligeros (solo NumPy)
+
+Estructura en disco por fase (p. ej. outputs/models/LightGBM/artefactos_T1):
+
+    metadatos.json          feature_names, métricas
+    X_test_prep.npy         ...
+    y_test_proba.npy        (un .npy por array)
+    preprocessors.json      columnas, clases LabelEncoder, categorías TE, OHE
+    preprocessors.npz       valores TE, media/escala del StandardScaler
+
+Solo se importa NumPy a nivel de módulo: cargar y aplicar los artefactos no
+requiere pandas, sklearn ni category_encoders.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+VALOR_DESCONOCIDO = -1      # Categoría no vista en el ajuste del TargetEncoder
+
+ARRAYS_EVALUACION = [
+    "X_train_prep", "X_test_prep",
+    "y_train", "y_test", "y_test_pred", "y_test_proba",
+]
+METADATOS_EVALUACION = [
+    "feature_names", "metricas_train", "metricas_test", "metricas_por_clase",
+]
+ARCHIVO_METADATOS     = "metadatos.json"
+ARCHIVO_PREP_JSON     = "preprocessors.json"
+ARCHIVO_PREP_NPZ      = "preprocessors.npz"
+
+
+def directorio_artefactos(models_dir: Path, fase: str) -> Path:
+    return Path(models_dir) / f"artefactos_{fase}"
+
+
+def _a_json(obj):
+    """Conversión de escalares y arrays NumPy para json.dump."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+
+def _a_array(valor) -> np.ndarray:
+    return valor.to_numpy() if hasattr(valor, "to_numpy") else np.asarray(valor)
+
+
+# ==============================================================================
+# EXTRACCIÓN DE MAPEOS
+# ==============================================================================
+
+def mapeo_target_encoder(te, col: str) -> tuple:
+    """
+    Extrae el mapeo categoría → valor codificado de un TargetEncoder ajustado.
+
+    Se usa el propio transform del encoder para no depender de su estructura
+    interna; el valor por defecto corresponde a una categoría desconocida.
+    """
+    import pandas as pd
+
+    mapping = next(m["mapping"] for m in te.ordinal_encoder.mapping if m["col"] == col)
+    categorias = [int(k) for k in mapping.index if not pd.isna(k)]
+
+    valores = te.transform(
+        pd.DataFrame({col: np.array(categorias, dtype=np.int64)})
+    )[col].to_numpy(dtype=float)
+    por_defecto = float(
+        te.transform(pd.DataFrame({col: [VALOR_DESCONOCIDO]}))[col].iloc[0]
+    )
+    return categorias, valores.tolist(), por_defecto
+
+
+# ==============================================================================
+# ESCRITURA
+# ==============================================================================
+
+def guarda_datos_evaluacion(datos: dict, directorio: Path) -> Path:
+    """Guarda el dict de datos_evaluacion como .npy por array + metadatos.json."""
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    for nombre in ARRAYS_EVALUACION:
+        if nombre in datos and datos[nombre] is not None:
+            np.save(directorio / f"{nombre}.npy", np.ascontiguousarray(_a_array(datos[nombre])))
+
+    metadatos = {k: datos[k] for k in METADATOS_EVALUACION if k in datos}
+    metadatos["feature_names"] = list(metadatos.get("feature_names", []))
+    with open(directorio / ARCHIVO_METADATOS, "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2, default=_a_json)
+    return directorio
+
+
+def guarda_preprocessors(preprocessors: dict, directorio: Path,
+                         checksum_origen: str | None = None) -> Path:
+    """
+    Guarda los preprocessors de una familia como mapeos JSON + NPZ.
+
+    Claves reconocidas: feature_names, target_encoder, label_encoders,
+    categoricas_ohe, log1p_cols, scaler (las mismas que usa onnx_export).
+    checksum_origen es el SHA-256 del preprocessors_<fase>.joblib convertido;
+    se guarda en el JSON para detectar conversiones obsoletas.
+    """
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    estructura = {
+        "feature_names":   list(preprocessors["feature_names"]),
+        "target_encoder":  {},
+        "label_encoders":  {},
+        "categoricas_ohe": list(preprocessors.get("categoricas_ohe", [])),
+        "log1p_cols":      list(preprocessors.get("log1p_cols", [])),
+        "scaler_cols":     [],
+        "checksum_origen": checksum_origen,
+    }
+    arrays = {}
+
+    te = preprocessors.get("target_encoder")
+    if te is not None:
+        for col in te.cols:
+            categorias, valores, por_defecto = mapeo_target_encoder(te, col)
+            estructura["target_encoder"][col] = {
+                "categorias":  categorias,
+                "por_defecto": por_defecto,
+            }
+            arrays[f"te__{col}"] = np.asarray(valores, dtype=np.float64)
+
+    for col, le in preprocessors.get("label_encoders", {}).items():
+        estructura["label_encoders"][col] = [str(c) for c in le.classes_]
+
+    scaler = preprocessors.get("scaler")
+    if scaler is not None:
+        estructura["scaler_cols"] = [str(c) for c in scaler.feature_names_in_]
+        arrays["scaler__mean"]  = np.asarray(scaler.mean_,  dtype=np.float64)
+        arrays["scaler__scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+
+    with open(directorio / ARCHIVO_PREP_JSON, "w", encoding="utf-8") as f:
+        json.dump(estructura, f, indent=2, default=_a_json)
+    np.savez(directorio / ARCHIVO_PREP_NPZ, **arrays)
+    return directorio
+
+
+def checksum_origen_preprocessors(directorio: Path) -> str | None:
+    """Checksum del joblib del que salió preprocessors.json (None si no existe)."""
+    ruta = Path(directorio) / ARCHIVO_PREP_JSON
+    if not ruta.exists():
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f).get("checksum_origen")
+
+
+def convierte_artefactos_joblib(models_dir: Path, fase: str) -> Path:
+    """Convierte datos_evaluacion_<fase>.joblib y preprocessors_<fase>.joblib."""
+    import joblib
+
+    from src.models.registry import calcula_checksum
+
+    models_dir = Path(models_dir)
+    destino = directorio_artefactos(models_dir, fase)
+    ruta_prep = models_dir / f"preprocessors_{fase}.joblib"
+    guarda_datos_evaluacion(joblib.load(models_dir / f"datos_evaluacion_{fase}.joblib"), destino)
+    guarda_preprocessors(joblib.load(ruta_prep), destino, calcula_checksum(ruta_prep))
+    return destino
+
+
+# ==============================================================================
+# CARGA PEREZOSA
+# ==============================================================================
+
+class ArtefactosEvaluacion:
+    """
+    Acceso tipo dict a los datos de evaluación de una fase.
+
+    Los arrays se abren con mmap_mode="r" la primera vez que se piden; los
+    metadatos JSON se leen también bajo demanda.
+
+    Example:
+        >>> datos = ArtefactosEvaluacion("outputs/models/LightGBM/artefactos_T1")
+        >>> proba = datos["y_test_proba"]          # solo mapea este array
+        >>> datos["feature_names"]
+    """
+
+    def __init__(self, directorio: Path, mmap_mode: str | None = "r"):
+        self.directorio = Path(directorio)
+        self.mmap_mode  = mmap_mode
+        self._arrays    = {}
+        self._metadatos = None
+
+    @property
+    def metadatos(self) -> dict:
+        if self._metadatos is None:
+            with open(self.directorio / ARCHIVO_METADATOS, encoding="utf-8") as f:
+                self._metadatos = json.load(f)
+        return self._metadatos
+
+    def keys(self) -> list:
+        arrays = [p.stem for p in self.directorio.glob("*.npy")]
+        return arrays + list(self.metadatos)
+
+    def __contains__(self, nombre: str) -> bool:
+        return (self.directorio / f"{nombre}.npy").exists() or nombre in self.metadatos
+
+    def __getitem__(self, nombre: str):
+        if nombre in self._arrays:
+            return self._arrays[nombre]
+        ruta = self.directorio / f"{nombre}.npy"
+        if ruta.exists():
+            self._arrays[nombre] = np.load(ruta, mmap_mode=self.mmap_mode)
+            return self._arrays[nombre]
+        if nombre in self.metadatos:
+            return self.metadatos[nombre]
+        raise KeyError(nombre)
+
+    def como_dataframe(self, nombre: str = "X_test_prep"):
+        """Envuelve una matriz en un DataFrame con feature_names (importa pandas)."""
+        import pandas as pd
+        return pd.DataFrame(self[nombre], columns=self["feature_names"])
+
+
+# ==============================================================================
+# PREPROCESAMIENTO LIGERO
+# ==============================================================================
+
+class PreprocesadorLigero:
+    """
+    Aplica los mapeos guardados por guarda_preprocessors sobre datos crudos.
+
+    Reproduce el orden de feature_names: TargetEncoder para las columnas
+    <col>_encoded, LabelEncoder (clases no vistas → -1), OHE con drop_first
+    implícito en feature_names, log1p y StandardScaler. Acepta un DataFrame
+    o un dict de arrays indexable por nombre de columna.
+    """
+
+    def __init__(self, directorio: Path):
+        directorio = Path(directorio)
+        with open(directorio / ARCHIVO_PREP_JSON, encoding="utf-8") as f:
+            self.estructura = json.load(f)
+        with np.load(directorio / ARCHIVO_PREP_NPZ) as npz:
+            arrays = {k: npz[k] for k in npz.files}
+
+        self.feature_names = self.estructura["feature_names"]
+        self._te = {
+            col: (dict(zip(m["categorias"], arrays[f"te__{col}"].tolist())), m["por_defecto"])
+            for col, m in self.estructura["target_encoder"].items()
+        }
+        self._le = {
+            col: {c: i for i, c in enumerate(clases)}
+            for col, clases in self.estructura["label_encoders"].items()
+        }
+        self._log1p = set(self.estructura["log1p_cols"])
+        self._escala = {
+            col: (arrays["scaler__mean"][i], arrays["scaler__scale"][i])
+            for i, col in enumerate(self.estructura["scaler_cols"])
+        }
+        self._ohe = sorted(self.estructura["categoricas_ohe"], key=len, reverse=True)
+
+    @property
+    def columnas(self) -> list:
+        """Columnas crudas necesarias, en orden de aparición."""
+        columnas = []
+        for feature in self.feature_names:
+            col = self.columna_cruda(feature)
+            if col not in columnas:
+                columnas.append(col)
+        return columnas
+
+    def columna_cruda(self, feature: str) -> str:
+        if feature.endswith("_encoded") and feature[:-len("_encoded")] in self._te:
+            return feature[:-len("_encoded")]
+        if feature in self._le:
+            return feature
+        for col in self._ohe:
+            if feature.startswith(col + "_"):
+                return col
+        return feature
+
+    def transforma(self, X) -> np.ndarray:
+        n = len(X[self.columna_cruda(self.feature_names[0])])
+        salida = np.empty((n, len(self.feature_names)), dtype=np.float64)
+
+        for j, feature in enumerate(self.feature_names):
+            col = self.columna_cruda(feature)
+            valores = _a_array(X[col])
+
+            if col in self._te and feature != col:
+                mapeo, por_defecto = self._te[col]
+                salida[:, j] = [mapeo.get(int(v), por_defecto) for v in valores]
+            elif col in self._le:
+                mapeo = self._le[col]
+                salida[:, j] = [mapeo.get(str(v), -1) for v in valores]
+            elif col != feature:
+                categoria = feature[len(col) + 1:]
+                salida[:, j] = valores.astype(str) == categoria
+            else:
+                salida[:, j] = valores.astype(np.float64)
+
+            if feature in self._log1p:
+                salida[:, j] = np.log1p(salida[:, j])
+            if feature in self._escala:
+                media, desv = self._escala[feature]
+                salida[:, j] = (salida[:, j] - media) / desv
+
+        return salida
@@ -0,0 +1,211 @@
+# src/models/curvas_staged.py
+"""
+Curvas por tamaño de ensemble a partir de un único modelo ajustado
+==================================================================
+Este módulo contiene:
+- contribuciones_por_arbol: iterador de la contribución de cada árbol (o
+  ronda de boosting) a la predicción, sin reajustar el modelo
+    RandomForest : predict_proba de cada árbol (el bosque promedia)
+    LightGBM     : predict(raw_score=True, start_iteration=i, num_iteration=1)
+    XGBoost      : predict(output_margin=True, iteration_range=(i, i + 1))
+    CatBoost     : staged_predict(prediction_type="RawFormulaVal") (ya acumulado)
+- curva_staged: F1 y logloss para cada tamaño de ensemble en una sola pasada
+  de sumas acumuladas
+- resuelve_modo_curvas / curva_train: modo de curvas de cada etapa y curva de train
+  reconstruida a posteriori (fold completo o submuestra)
+
+Sustituye a reajustar el bosque con warm_start en cada tamaño y al eval_set
+extra sobre el fold de entrenamiento de los boosters: se ajusta una vez con
+el número máximo de árboles y se evalúan todos los tamaños sobre la suma
+acumulada. Con margen inicial (entrenamiento incremental) la curva parte de
+ese margen, igual que el eval_init_score / base_margin del eval_set.
+
+Modos de curvas (--curvas en los pipelines, CURVE_MODE en el entorno):
+    completa  : validación registrada durante el ajuste; train reconstruida
+                sobre el fold de entrenamiento completo (default)
+    perezosa  : igual, pero train sobre una submuestra del fold
+    ninguna   : sin curvas ni figuras
+
+CI y las re-ejecuciones de tuning eligen perezosa o ninguna explícitamente
+(--curvas o CURVE_MODE); sin indicarlo se obtienen las curvas completas.
+
+Example:
+    >>> modelo.fit(X_ftr, y_ftr)
+    >>> curva = curva_staged(modelo, X_fv, y_fv)
+    >>> curva["logloss"][-1], curva["f1"].max()
+"""
+
+import os
+
+import numpy as np
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+EPS_LOGLOSS          = 1e-15
+MODOS_CURVAS         = ("completa", "perezosa", "ninguna")
+MODO_CURVAS_DEFECTO  = "completa"
+FRACCION_CURVA_TRAIN = 0.2        # fracción del fold de train en modo perezoso
+MIN_FILAS_CURVA      = 1000
+RANDOM_STATE         = 42
+
+
+def n_arboles(modelo) -> int:
+    nombre = type(modelo).__name__
+    if nombre == "RandomForestClassifier":
+        return len(modelo.estimators_)
+    if nombre == "LGBMClassifier":
+        return modelo.booster_.current_iteration()
+    if nombre == "XGBClassifier":
+        return modelo.get_booster().num_boosted_rounds()
+    if nombre == "CatBoostClassifier":
+        return modelo.tree_count_
+    raise TypeError(f"Modelo sin soporte de curvas staged: {nombre}")
+
+
+def contribuciones_por_arbol(modelo, X, margen=None):
+    """
+    Genera (i, contribución, acumulada) para i = 1..n_arboles.
+
+    Para RandomForest la escala es probabilidad (suma de probas de árbol,
+    sin dividir); para los boosters, log-odds. `acumulada` es la suma de
+    las i primeras contribuciones (más el margen inicial si lo hay).
+    """
+    nombre = type(modelo).__name__
+    n = n_arboles(modelo)
+
+    if nombre == "RandomForestClassifier":
+        X_arr = np.asarray(X, dtype=np.float32)
+        acumulada = np.zeros(X_arr.shape[0])
+        for i, arbol in enumerate(modelo.estimators_, start=1):
+            contribucion = arbol.predict_proba(X_arr)[:, 1]
+            acumulada += contribucion
+            yield i, contribucion, acumulada
+        return
+
+    if nombre == "CatBoostClassifier":
+        base = 0.0 if margen is None else np.asarray(margen)
+        previa = base
+        for i, bruto in enumerate(
+            modelo.staged_predict(X, prediction_type="RawFormulaVal", eval_period=1), start=1
+        ):
+            acumulada = bruto + base
+            yield i, acumulada - previa, acumulada
+            previa = acumulada
+        return
+
+    if nombre == "LGBMClassifier":
+        acumulada = np.zeros(len(X)) if margen is None else np.array(margen, dtype=float)
+        for i in range(n):
+            contribucion = modelo.predict(X, raw_score=True, start_iteration=i, num_iteration=1)
+            acumulada = acumulada + contribucion
+            yield i + 1, contribucion, acumulada
+        return
+
+    if nombre == "XGBClassifier":
+        # Cada predicción de una ronda incluye la base (base_score o base_margin):
+        # con la predicción completa se despeja base = (Σ pred_i − total) / (n − 1)
+        import xgboost as xgb
+
+        booster = modelo.get_booster()
+        dmatrix = xgb.DMatrix(X, base_margin=margen)
+        por_ronda = [
+            booster.predict(dmatrix, output_margin=True, iteration_range=(i, i + 1))
+            for i in range(n)
+        ]
+        total = booster.predict(dmatrix, output_margin=True)
+        base  = (np.sum(por_ronda, axis=0) - total) / (n - 1) if n > 1 else total - por_ronda[0]
+        acumulada = base.copy()
+        for i, pred in enumerate(por_ronda, start=1):
+            contribucion = pred - base
+            acumulada = acumulada + contribucion
+            yield i, contribucion, acumulada
+        return
+
+    raise TypeError(f"Modelo sin soporte de curvas staged: {nombre}")
+
+
+def _f1(y: np.ndarray, pred: np.ndarray) -> float:
+    tp = np.sum(pred & y)
+    fp = np.sum(pred & ~y)
+    fn = np.sum(~pred & y)
+    return 0.0 if tp == 0 else float(2 * tp / (2 * tp + fp + fn))
+
+
+def _logloss(y: np.ndarray, proba: np.ndarray) -> float:
+    p = np.clip(proba, EPS_LOGLOSS, 1 - EPS_LOGLOSS)
+    return float(-np.mean(np.where(y, np.log(p), np.log(1 - p))))
+
+
+def curva_staged(modelo, X, y, margen=None, tamanos: list | None = None) -> dict:
+    """
+    F1 (clase 1) y logloss del ensemble truncado a cada tamaño.
+
+    Parámetros
+    ----------
+    modelo  : RandomForestClassifier, LGBMClassifier, XGBClassifier o CatBoostClassifier ajustado
+    X, y    : datos a evaluar
+    margen  : margen inicial (log-odds) de las filas de X, solo boosters
+    tamanos : tamaños de ensemble a evaluar (default: todos, 1..n_arboles)
+
+    Retorna
+    -------
+    dict con arrays "tamanos", "f1" y "logloss"
+    """
+    y = np.asarray(y).astype(bool)
+    es_bosque = type(modelo).__name__ == "RandomForestClassifier"
+    objetivo  = set(tamanos) if tamanos is not None else None
+
+    resultado = {"tamanos": [], "f1": [], "logloss": []}
+    for i, _, acumulada in contribuciones_por_arbol(modelo, X, margen):
+        if objetivo is not None and i not in objetivo:
+            continue
+        if es_bosque:
+            proba = acumulada / i
+            pred  = proba > 0.5        # predict del bosque: argmax de la proba media
+        else:
+            proba = 1.0 / (1.0 + np.exp(-acumulada))
+            pred  = acumulada > 0
+        resultado["tamanos"].append(i)
+        resultado["f1"].append(_f1(y, pred))
+        resultado["logloss"].append(_logloss(y, proba))
+
+    return {k: np.array(v) for k, v in resultado.items()}
+
+
+# ==============================================================================
+# MODOS DE CURVAS
+# ==============================================================================
+
+def resuelve_modo_curvas(modo: str | None = None) -> str:
+    """Modo explícito o, si es None, CURVE_MODE del entorno (default: completa)."""
+    modo = modo or os.getenv("CURVE_MODE") or MODO_CURVAS_DEFECTO
+    if modo not in MODOS_CURVAS:
+        raise ValueError(f"Modo de curvas desconocido: {modo} (opciones: {', '.join(MODOS_CURVAS)})")
+    return modo
+
+
+def submuestra(X, y, margen=None, fraccion: float = FRACCION_CURVA_TRAIN,
+               random_state: int = RANDOM_STATE) -> tuple:
+    """Filas aleatorias (sin reemplazo, en su orden original) de X, y y margen."""
+    n = len(y)
+    k = min(n, max(MIN_FILAS_CURVA, int(n * fraccion)))
+    if k >= n:
+        return X, y, margen
+
+    idx = np.sort(np.random.default_rng(random_state).choice(n, size=k, replace=False))
+    X_s = X.iloc[idx] if hasattr(X, "iloc") else np.asarray(X)[idx]
+    y_s = y.iloc[idx] if hasattr(y, "iloc") else np.asarray(y)[idx]
+    m_s = None if margen is None else np.asarray(margen)[idx]
+    return X_s, y_s, m_s
+
+
+def curva_train(modelo, X, y, margen=None, modo: str = MODO_CURVAS_DEFECTO,
+                metrica: str = "logloss", tamanos: list | None = None) -> np.ndarray:
+    """
+    Curva de train reconstruida tras el ajuste: sobre todo el fold en modo
+    completa y sobre una submuestra en modo perezosa.
+    """
+    if modo == "perezosa":
+        X, y, margen = submuestra(X, y, margen)
+    return curva_staged(modelo, X, y, margen, tamanos)[metrica]
@@ -0,0 +1,188 @@
+# src/models/explicaciones.py
+"""
+Explicaciones individuales por estudiante
+=========================================
+Este módulo contiene:
+- API que devuelve las top-k contribuciones SHAP de filas arbitrarias de
+  estudiantes frente al booster de una fase
+- Cálculo por micro-lotes con Booster.predict(pred_contrib=True)
+- Caché del valor esperado y del contexto (booster, preprocesador) por modelo
+- Traducción de valores codificados a etiquetas legibles con get_label
+
+Las filas se reciben en formato crudo (columnas de data/processed) y se
+transforman con el PreprocesadorLigero del formato de artefactos; el booster
+y los preprocessors se obtienen del registro de modelos, de modo que tras la
+primera llamada no hay accesos a disco.
+
+Example:
+    >>> explicador = ExplicadorEstudiantes()
+    >>> explicador.explica_estudiante(fila, fase="T1", top_k=5)
+    {'probabilidad': 0.87, 'valor_base': -1.12, 'contribuciones': [...]}
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.models.artifacts import (
+    ARCHIVO_PREP_JSON,
+    PreprocesadorLigero,
+    checksum_origen_preprocessors,
+    directorio_artefactos,
+    guarda_preprocessors,
+)
+from src.models.registry import VERSION_ACTUAL, obtiene_registro
+from src.utils.constants import LABELS, get_label
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+FAMILIA_DEFECTO = "LightGBM"
+TAMANO_LOTE     = 64
+TOP_K           = 5
+
+
+def _sigmoide(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _etiqueta(columna: str, valor) -> str:
+    """Etiqueta legible del valor crudo de una columna."""
+    if columna in LABELS:
+        try:
+            return get_label(columna, int(valor))
+        except (TypeError, ValueError):
+            pass
+    if isinstance(valor, (float, np.floating)):
+        return f"{valor:.4g}"
+    return str(valor)
+
+
+# ==============================================================================
+# EXPLICADOR
+# ==============================================================================
+
+class ExplicadorEstudiantes:
+    """
+    Top-k contribuciones por estudiante para los boosters LightGBM finales.
+
+    El contexto de cada (fase, versión) —booster, preprocesador ligero,
+    columnas crudas y valor esperado— se construye una vez y se reutiliza.
+    """
+
+    def __init__(self, registro=None, familia: str = FAMILIA_DEFECTO,
+                 tamano_lote: int = TAMANO_LOTE):
+        self.registro    = registro if registro is not None else obtiene_registro()
+        self.familia     = familia
+        self.tamano_lote = tamano_lote
+        self._contextos  = {}
+        self._lock       = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Contexto por modelo
+    # ------------------------------------------------------------------
+    def _contexto(self, fase: str, version: str | None) -> dict:
+        version       = version or VERSION_ACTUAL
+        metadatos     = self.registro.metadatos(self.familia, fase, version)
+        checksum      = metadatos["checksum_modelo"]
+        checksum_prep = metadatos["checksum_preprocessors"]
+        clave         = (fase, version, checksum, checksum_prep)
+
+        with self._lock:
+            if clave in self._contextos:
+                return self._contextos[clave]
+
+        booster    = self.registro.obtiene_modelo(self.familia, fase, version)
+        directorio = directorio_artefactos(self.registro.directorio(self.familia, fase, version), fase)
+        # Se regenera si falta o si procede de otro preprocessors_<fase>.joblib
+        if (not (directorio / ARCHIVO_PREP_JSON).exists()
+                or checksum_origen_preprocessors(directorio) != checksum_prep):
+            guarda_preprocessors(
+                self.registro.obtiene_preprocessors(self.familia, fase, version),
+                directorio, checksum_prep,
+            )
+        prep = PreprocesadorLigero(directorio)
+
+        # El valor esperado es constante por modelo: última columna de pred_contrib
+        fila_ref = np.zeros((1, len(prep.feature_names)))
+        expected_value = float(booster.predict(fila_ref, pred_contrib=True)[0, -1])
+
+        contexto = {
+            "booster":        booster,
+            "prep":           prep,
+            "columnas":       prep.columnas,
+            "origen":         [prep.columna_cruda(f) for f in prep.feature_names],
+            "expected_value": expected_value,
+        }
+        with self._lock:
+            self._contextos[clave] = contexto
+        return contexto
+
+    def valor_esperado(self, fase: str, version: str | None = None) -> float:
+        """Valor base (log-odds) del modelo de la fase."""
+        return self._contexto(fase, version)["expected_value"]
+
+    # ------------------------------------------------------------------
+    # Explicaciones
+    # ------------------------------------------------------------------
+    def explica(self, X, fase: str, top_k: int = TOP_K, version: str | None = None) -> list:
+        """
+        Explica un conjunto de filas crudas (DataFrame o dict de columnas).
+
+        Returns:
+            list: un dict por fila con probabilidad, valor_base y la lista
+                  de contribuciones ordenadas por |contribución| descendente
+        """
+        ctx      = self._contexto(fase, version)
+        columnas = {c: np.asarray(X[c]) for c in ctx["columnas"]}
+        n        = len(next(iter(columnas.values())))
+        k        = min(top_k, len(ctx["origen"]))
+
+        respuestas = []
+        for inicio in range(0, n, self.tamano_lote):
+            lote = {c: v[inicio:inicio + self.tamano_lote] for c, v in columnas.items()}
+            X_prep  = ctx["prep"].transforma(lote)
+            contrib = ctx["booster"].predict(X_prep, pred_contrib=True)
+
+            valores = contrib[:, :-1]
+            proba   = _sigmoide(contrib.sum(axis=1))
+            top_idx = np.argpartition(-np.abs(valores), k - 1, axis=1)[:, :k]
+
+            for i in range(valores.shape[0]):
+                orden = top_idx[i][np.argsort(-np.abs(valores[i, top_idx[i]]))]
+                respuestas.append({
+                    "indice":         inicio + i,
+                    "probabilidad":   float(proba[i]),
+                    "valor_base":     ctx["expected_value"],
+                    "contribuciones": [
+                        {
+                            "variable":     ctx["origen"][j],
+                            "feature":      ctx["prep"].feature_names[j],
+                            "valor":        _etiqueta(ctx["origen"][j], lote[ctx["origen"][j]][i]),
+                            "contribucion": float(valores[i, j]),
+                        }
+                        for j in orden
+                    ],
+                })
+        return respuestas
+
+    def explica_estudiante(self, fila: dict, fase: str, top_k: int = TOP_K,
+                           version: str | None = None) -> dict:
+        """Explica un único estudiante dado como dict columna → valor."""
+        return self.explica({c: [v] for c, v in fila.items()}, fase, top_k, version)[0]
+
+
+# ==============================================================================
+# EXPLICADOR COMPARTIDO POR PROCESO
+# ==============================================================================
+_EXPLICADOR = None
+
+
+def obtiene_explicador(models_root: Path | None = None) -> ExplicadorEstudiantes:
+    """Devuelve el explicador del proceso, creándolo la primera vez."""
+    global _EXPLICADOR
+    if _EXPLICADOR is None:
+        registro = obtiene_registro(models_root) if models_root else obtiene_registro()
+        _EXPLICADOR = ExplicadorEstudiantes(registro)
+    return _EXPLICADOR
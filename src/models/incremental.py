@@ -0,0 +1,100 @@
+# src/models/incremental.py
+"""
+Entrenamiento incremental entre fases (T0 → T1 → T2)
+====================================================
+Este módulo contiene:
+- ajusta_con_margen: fit de LightGBM / XGBoost / CatBoost partiendo de un
+  margen inicial (init_score / base_margin / baseline)
+- margen_bruto: log-odds del modelo incluyendo el margen inicial
+- sigmoide y selecciona (margen de un subconjunto de filas)
+
+Como VARS_T0 ⊂ VARS_T1 ⊂ VARS_T2 y X_train es el mismo en las tres fases,
+el margen out-of-fold de la fase anterior está alineado fila a fila con el
+X_train de la siguiente. El booster de T1 parte de ese margen y solo aprende
+la corrección que aportan las variables nuevas; T2 parte del margen
+acumulado de T1. Los folds son los mismos en todas las fases (mismo y y
+misma semilla de StratifiedKFold).
+
+Un modelo entrenado en modo incremental solo predice correctamente con el
+margen de la fase anterior (margen_bruto(modelo, X, margen_previo)); su
+predict_proba aislado, y por tanto la exportación ONNX, no lo incluye.
+"""
+
+import numpy as np
+
+
+def sigmoide(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def selecciona(margen: np.ndarray | None, idx) -> np.ndarray | None:
+    """Margen de las filas idx (None si no hay margen inicial)."""
+    return None if margen is None else margen[idx]
+
+
+def _con_baseline(pool, margen: np.ndarray):
+    """Copia de un catboost.Pool con el margen como baseline."""
+    copia = pool.slice(np.arange(pool.num_row()))
+    copia.set_baseline(margen)
+    return copia
+
+
+def ajusta_con_margen(modelo, X, y, margen=None, margenes_eval: list | None = None, **fit_kwargs):
+    """
+    Ajusta el modelo con margen inicial en train y, opcionalmente, en eval_set.
+
+    Sin margen equivale a modelo.fit(X, y, **fit_kwargs). En CatBoost, X (y
+    el eval_set) puede ser un catboost.Pool ya construido, con y=None.
+    """
+    if margen is None:
+        return modelo.fit(X, y, **fit_kwargs)
+
+    nombre = type(modelo).__name__
+    if nombre == "LGBMClassifier":
+        if margenes_eval is not None:
+            fit_kwargs["eval_init_score"] = margenes_eval
+        return modelo.fit(X, y, init_score=margen, **fit_kwargs)
+
+    if nombre == "XGBClassifier":
+        if margenes_eval is not None:
+            fit_kwargs["base_margin_eval_set"] = margenes_eval
+        return modelo.fit(X, y, base_margin=margen, **fit_kwargs)
+
+    if nombre == "CatBoostClassifier":
+        from catboost import Pool
+
+        if isinstance(X, Pool):
+            # Slices del Pool de la fase: el baseline va en una copia para que
+            # el Pool del llamador siga sirviendo para predecir sin margen
+            eval_set = fit_kwargs.pop("eval_set", None)
+            if eval_set is not None:
+                fit_kwargs["eval_set"] = (
+                    eval_set if margenes_eval is None else _con_baseline(eval_set, margenes_eval[-1])
+                )
+            return modelo.fit(_con_baseline(X, margen), **fit_kwargs)
+
+        cat_features = modelo.get_params().get("cat_features")
+        eval_set     = fit_kwargs.pop("eval_set", None)
+        if eval_set is not None:
+            X_eval, y_eval = eval_set
+            fit_kwargs["eval_set"] = Pool(
+                X_eval, y_eval, cat_features=cat_features,
+                baseline=None if margenes_eval is None else margenes_eval[-1],
+            )
+        return modelo.fit(Pool(X, y, cat_features=cat_features, baseline=margen), **fit_kwargs)
+
+    raise TypeError(f"Modelo sin soporte de margen inicial: {nombre}")
+
+
+def margen_bruto(modelo, X, margen=None) -> np.ndarray:
+    """Log-odds de la clase positiva, sumando el margen inicial si lo hay."""
+    nombre = type(modelo).__name__
+    if nombre == "XGBClassifier":
+        return modelo.predict(X, output_margin=True, base_margin=margen)
+    if nombre == "LGBMClassifier":
+        bruto = modelo.predict(X, raw_score=True)
+    elif nombre == "CatBoostClassifier":
+        bruto = modelo.predict(X, prediction_type="RawFormulaVal")
+    else:
+        raise TypeError(f"Modelo sin soporte de margen inicial: {nombre}")
+    return bruto if margen is None else bruto + margen
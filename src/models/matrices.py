@@ -0,0 +1,93 @@
+# src/models/matrices.py
+"""
+Matrices de features contiguas para la CV y los objetivos de Optuna
+===================================================================
+Este módulo contiene:
+- MatrizFase: X de una fase convertida una sola vez a un array float32
+  C-contiguo, y como array y los nombres de feature
+- MatrizFase.fold: filas de un fold (np.take) listas para el fit, sin pasar
+  por DataFrame.iloc ni por la conversión interna de cada librería
+- como_matriz: acepta DataFrame o MatrizFase (las funciones de CV reciben la
+  matriz ya convertida desde el objetivo de Optuna)
+- pool_fase: catboost.Pool de una fase; los folds se toman con Pool.slice
+- asigna_nombres: nombres de feature en el modelo devuelto por la CV
+
+Antes, cada fold de cada trial hacía X_train.iloc[idx] (copia de un DataFrame
+de bloques int8/int16/float32/float64) y la librería volvía a convertirlo a
+float32. Ahora la conversión se hace una vez por fase y cada fold es un único
+bloque float32 contiguo por filas, el formato que XGBoost (DMatrix), LightGBM
+y los árboles de sklearn consumen sin copiar. CatBoost conserva sus
+categóricas de texto y trabaja sobre un Pool cuantizado una sola vez.
+
+Los modelos ajustados sobre arrays no guardan nombres de columna; el modelo
+que devuelve la CV los recibe con asigna_nombres para que predict con
+DataFrame (validación ONNX, SHAP) siga comprobando columnas como antes.
+
+Example:
+    >>> matriz = MatrizFase(X_train, y_train)
+    >>> for train_idx, val_idx in cv.split(matriz.X, matriz.y):
+    ...     X_ftr, y_ftr = matriz.fold(train_idx)
+"""
+
+import numpy as np
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+DTYPE_MATRIZ = np.float32
+
+
+class MatrizFase:
+    """
+    X (float32, C-contiguo), y y nombres de feature de una fase.
+
+    Parámetros
+    ----------
+    X : DataFrame o array con las features ya codificadas
+    y : Series o array con el target
+    nombres : nombres de feature (default: X.columns)
+    """
+
+    def __init__(self, X, y, nombres: list | None = None):
+        valores = X.to_numpy(dtype=DTYPE_MATRIZ) if hasattr(X, "to_numpy") else X
+        self.X = np.ascontiguousarray(valores, dtype=DTYPE_MATRIZ)
+        self.y = np.asarray(y)
+        self.nombres = list(nombres) if nombres is not None else [str(c) for c in X.columns]
+
+    def __len__(self) -> int:
+        return self.X.shape[0]
+
+    @property
+    def shape(self) -> tuple:
+        return self.X.shape
+
+    def fold(self, idx) -> tuple:
+        """(X, y) de las filas idx como bloques contiguos."""
+        return np.take(self.X, idx, axis=0), np.take(self.y, idx)
+
+
+def como_matriz(X, y) -> MatrizFase:
+    """X si ya es una MatrizFase; si no, su conversión (una vez por llamada)."""
+    return X if isinstance(X, MatrizFase) else MatrizFase(X, y)
+
+
+def pool_fase(X, y, cat_features: list):
+    """Pool de CatBoost de toda la fase (folds con pool.slice(idx))."""
+    from catboost import Pool
+
+    return Pool(X, np.asarray(y), cat_features=cat_features)
+
+
+def asigna_nombres(modelo, nombres: list):
+    """
+    Asigna los nombres de feature a un modelo ajustado sobre un array.
+
+    LightGBM los recibe en el fit (feature_name) y CatBoost los toma del Pool,
+    así que solo hace falta en XGBoost y en los estimadores de sklearn.
+    """
+    nombre = type(modelo).__name__
+    if nombre == "XGBClassifier":
+        modelo.get_booster().feature_names = list(nombres)
+    elif nombre in ("RandomForestClassifier", "LogisticRegression"):
+        modelo.feature_names_in_ = np.asarray(nombres, dtype=object)
+    return modelo
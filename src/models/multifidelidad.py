@@ -0,0 +1,127 @@
+# src/models/multifidelidad.py
+"""
+Optimización multi-fidelidad (Hyperband / ASHA sobre Optuna)
+============================================================
+Este módulo contiene:
+- Submuestras estratificadas y anidadas de X_train por rung
+- evalua_multifidelidad: evalúa un trial rung a rung (pocas filas y pocos
+  folds primero, datos completos y cv_folds al final), informando a Optuna
+  tras cada rung para que el pruner descarte configuraciones poco prometedoras
+- crea_pruner: HyperbandPruner o SuccessiveHalvingPruner (ASHA) con el
+  número de rungs como recurso
+
+Solo los trials que sobreviven a todos los rungs llegan a la CV completa,
+de modo que el coste medio por trial deja de crecer linealmente con el
+tamaño de X_train. El valor de los trials completados es siempre el de la
+fidelidad máxima, comparable con el modo estándar.
+
+Example:
+    >>> study = crea_estudio(..., pruner=crea_pruner())
+    >>> def objective(trial):
+    ...     params = {...}
+    ...     return evalua_multifidelidad(trial, f1_fold, y_train, cv_folds)
+"""
+
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+# optuna solo se importa al crear el pruner o al podar un trial
+if TYPE_CHECKING:
+    import optuna
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+FRACCIONES       = (1 / 9, 1 / 3, 1.0)
+FOLDS_PARCIALES  = 3
+FACTOR_REDUCCION = 3
+RANDOM_STATE     = 42
+
+
+def indices_anidados(y, fracciones: tuple = FRACCIONES, min_por_clase: int = FOLDS_PARCIALES,
+                     semilla: int = RANDOM_STATE) -> list:
+    """
+    Índices posicionales de una submuestra estratificada por fracción.
+
+    Se usa una única permutación por clase, de modo que cada submuestra
+    contiene a las anteriores.
+    """
+    y   = np.asarray(y)
+    rng = np.random.default_rng(semilla)
+    por_clase = [rng.permutation(np.flatnonzero(y == c)) for c in np.unique(y)]
+    return [
+        np.sort(np.concatenate([
+            idx[:min(len(idx), max(int(round(f * len(idx))), min_por_clase))] for idx in por_clase
+        ]))
+        for f in fracciones
+    ]
+
+
+def crea_pruner(tipo: str = "hyperband", n_rungs: int = len(FRACCIONES),
+                factor_reduccion: int = FACTOR_REDUCCION) -> "optuna.pruners.BasePruner":
+    """Pruner cuyo recurso es el número de rung (1..n_rungs)."""
+    import optuna
+
+    if tipo == "asha":
+        return optuna.pruners.SuccessiveHalvingPruner(
+            min_resource=1, reduction_factor=factor_reduccion
+        )
+    return optuna.pruners.HyperbandPruner(
+        min_resource=1, max_resource=n_rungs, reduction_factor=factor_reduccion
+    )
+
+
+def evalua_multifidelidad(
+    trial: "optuna.Trial",
+    f1_fold,
+    y_train,
+    cv_folds: int,
+    fracciones: tuple = FRACCIONES,
+    folds_parciales: int = FOLDS_PARCIALES,
+) -> float:
+    """
+    Evalúa un trial por rungs de fidelidad creciente.
+
+    Parámetros
+    ----------
+    trial           : trial de Optuna
+    f1_fold         : callable(tr_idx, val_idx) -> F1 del fold (índices posicionales)
+    y_train         : target de entrenamiento
+    cv_folds        : folds de la fidelidad máxima
+    fracciones      : fracción de X_train por rung (la última debe ser 1.0)
+    folds_parciales : folds en los rungs intermedios
+
+    Retorna
+    -------
+    F1 medio de la fidelidad máxima (lanza TrialPruned si el pruner lo decide)
+    """
+    y_train = np.asarray(y_train)
+    subconjuntos = indices_anidados(y_train, fracciones, max(cv_folds, folds_parciales))
+
+    for rung, (fraccion, sub) in enumerate(zip(fracciones, subconjuntos), start=1):
+        k  = cv_folds if fraccion >= 1.0 else min(folds_parciales, cv_folds)
+        cv = StratifiedKFold(n_splits=k, shuffle=True, random_state=RANDOM_STATE)
+
+        scores, tiempos = [], []
+        for tr, va in cv.split(np.zeros(len(sub)), y_train[sub]):
+            t_fold = time.perf_counter()
+            try:
+                scores.append(float(f1_fold(sub[tr], sub[va])))
+            except Exception:
+                return 0.0
+            tiempos.append(time.perf_counter() - t_fold)
+
+        score = float(np.mean(scores))
+        trial.set_user_attr("rung", rung)
+        if rung < len(fracciones):
+            trial.report(score, step=rung)
+            if trial.should_prune():
+                from optuna import TrialPruned
+                raise TrialPruned()
+
+    trial.set_user_attr("f1_folds", scores)
+    trial.set_user_attr("tiempos_folds_s", tiempos)
+    return score
@@ -0,0 +1,424 @@
+# src/models/onnx_export.py
+"""
+Exportación ONNX y scoring con ONNX Runtime
+===========================================
+Este módulo contiene:
+- Construcción de un grafo ONNX de preprocesamiento a partir de los
+  preprocessors de cada familia (TargetEncoder, LabelEncoder, OHE, log1p,
+  StandardScaler)
+- Conversión del modelo (RL, RF, XGBoost, LightGBM, CatBoost) y fusión de
+  ambos grafos en un único archivo .onnx
+- Backend de scoring CPU con ONNX Runtime
+- Verificación de paridad y comparación de latencia contra predict_proba
+"""
+
+import copy
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import onnx
+from onnx import TensorProto, compose, helper
+import onnxruntime as ort
+import onnxmltools
+from onnxmltools.convert.common.data_types import FloatTensorType as FloatTensorTypeML
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+from src.models.artifacts import mapeo_target_encoder
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+OPSET_ONNX = 15
+OPSET_ONNX_ML = 2           # LabelEncoder con values_floats requiere ai.onnx.ml >= 2
+SALIDA_PREPROCESAMIENTO = "features_prep"
+
+FAMILIAS = ["RL", "RF", "XGBoost", "LightGBM", "CatBoost"]
+
+
+# ==============================================================================
+# GRAFO DE PREPROCESAMIENTO
+# ==============================================================================
+
+def _columna_ohe(feature: str, columnas_ohe: list) -> str | None:
+    """Devuelve la columna original de una dummy generada por get_dummies."""
+    for col in columnas_ohe:
+        if feature.startswith(col + "_"):
+            return col
+    return None
+
+
+def _nodo_label_encoder(nombre, entrada, salida, claves, valores, por_defecto, claves_string):
+    atributos = {
+        "values_floats": [float(v) for v in valores],
+        "default_float": float(por_defecto),
+    }
+    if claves_string:
+        atributos["keys_strings"] = [str(k) for k in claves]
+    else:
+        atributos["keys_int64s"] = [int(k) for k in claves]
+    return helper.make_node(
+        "LabelEncoder", [entrada], [salida], name=nombre, domain="ai.onnx.ml", **atributos
+    )
+
+
+def construye_grafo_preprocesamiento(preprocessors: dict, familia: str) -> onnx.ModelProto:
+    """
+    Traduce los preprocessors de una fase a un grafo ONNX.
+
+    El grafo recibe una entrada [N, 1] por cada columna cruda de la fase
+    (string para las categóricas agrupadas, int64 para las columnas con
+    Target Encoding y float para el resto) y produce la matriz de features
+    en el mismo orden que `preprocessors["feature_names"]`.
+
+    Parámetros
+    ----------
+    preprocessors : dict
+        Diccionario devuelto por `preprocesamiento_*`.
+    familia : str
+        Una de FAMILIAS.
+
+    Retorna
+    -------
+    onnx.ModelProto
+        Grafo con salida SALIDA_PREPROCESAMIENTO.
+    """
+    if familia == "CatBoost" and preprocessors.get("cat_features_names"):
+        raise ValueError(
+            "El exportador ONNX de CatBoost no admite categóricas nativas; "
+            "exportar un modelo CatBoost entrenado sin cat_features."
+        )
+
+    feature_names  = preprocessors["feature_names"]
+    te             = preprocessors.get("target_encoder")
+    cols_te        = list(te.cols) if te is not None else []
+    label_encoders = preprocessors.get("label_encoders", {})
+    columnas_ohe   = preprocessors.get("categoricas_ohe", [])
+    cols_log1p     = set(preprocessors.get("log1p_cols", []))
+    scaler         = preprocessors.get("scaler")
+    escala = (
+        dict(zip(scaler.feature_names_in_, zip(scaler.mean_, scaler.scale_)))
+        if scaler is not None else {}
+    )
+
+    entradas, nodos, iniciales, salidas = {}, [], [], []
+
+    def _entrada(col: str, tipo: int) -> str:
+        entradas.setdefault(col, tipo)
+        return col
+
+    def _constante(nombre: str, valor: float) -> str:
+        iniciales.append(helper.make_tensor(nombre, TensorProto.FLOAT, [1], [float(valor)]))
+        return nombre
+
+    for i, feature in enumerate(feature_names):
+        actual = f"prep_f{i}"
+        base   = feature[: -len("_encoded")] if feature.endswith("_encoded") else None
+        col_ohe = _columna_ohe(feature, columnas_ohe)
+
+        if base in cols_te:
+            claves, valores, por_defecto = mapeo_target_encoder(te, base)
+            nodos.append(_nodo_label_encoder(
+                f"prep_te_{i}", _entrada(base, TensorProto.INT64), actual,
+                claves, valores, por_defecto, claves_string=False,
+            ))
+        elif feature in label_encoders:
+            clases = label_encoders[feature].classes_
+            nodos.append(_nodo_label_encoder(
+                f"prep_le_{i}", _entrada(feature, TensorProto.STRING), actual,
+                clases, range(len(clases)), -1.0, claves_string=True,
+            ))
+        elif col_ohe is not None:
+            nodos.append(_nodo_label_encoder(
+                f"prep_ohe_{i}", _entrada(col_ohe, TensorProto.STRING), actual,
+                [feature[len(col_ohe) + 1:]], [1.0], 0.0, claves_string=True,
+            ))
+        else:
+            actual = _entrada(feature, TensorProto.FLOAT)
+
+        if feature in cols_log1p:
+            nodos.append(helper.make_node(
+                "Add", [actual, _constante(f"prep_uno_{i}", 1.0)], [f"prep_f{i}_mas1"]))
+            nodos.append(helper.make_node("Log", [f"prep_f{i}_mas1"], [f"prep_f{i}_log"]))
+            actual = f"prep_f{i}_log"
+
+        if feature in escala:
+            media, desv = escala[feature]
+            nodos.append(helper.make_node(
+                "Sub", [actual, _constante(f"prep_media_{i}", media)], [f"prep_f{i}_centrada"]))
+            nodos.append(helper.make_node(
+                "Div", [f"prep_f{i}_centrada", _constante(f"prep_escala_{i}", desv)],
+                [f"prep_f{i}_escalada"]))
+            actual = f"prep_f{i}_escalada"
+
+        salidas.append(actual)
+
+    nodos.append(helper.make_node("Concat", salidas, [SALIDA_PREPROCESAMIENTO], axis=1))
+
+    grafo = helper.make_graph(
+        nodos,
+        f"preprocesamiento_{familia}",
+        [helper.make_tensor_value_info(c, t, [None, 1]) for c, t in entradas.items()],
+        [helper.make_tensor_value_info(
+            SALIDA_PREPROCESAMIENTO, TensorProto.FLOAT, [None, len(feature_names)])],
+        initializer=iniciales,
+    )
+    opsets = [
+        helper.make_opsetid("", OPSET_ONNX),
+        helper.make_opsetid("ai.onnx.ml", OPSET_ONNX_ML),
+    ]
+    return helper.make_model(
+        grafo, opset_imports=opsets, ir_version=helper.find_min_ir_version_for(opsets),
+    )
+
+
+# ==============================================================================
+# CONVERSIÓN DEL MODELO
+# ==============================================================================
+
+def convierte_modelo(modelo, familia: str, n_features: int) -> onnx.ModelProto:
+    """Convierte un clasificador entrenado a ONNX con salida de probabilidades."""
+    if familia in ("RL", "RF"):
+        return convert_sklearn(
+            modelo,
+            initial_types=[("features", FloatTensorType([None, n_features]))],
+            options={id(modelo): {"zipmap": False}},
+            target_opset=OPSET_ONNX,
+        )
+    if familia == "XGBoost":
+        # El conversor exige nombres de feature f0..fn; se trabaja sobre una copia
+        modelo = copy.deepcopy(modelo)
+        modelo.get_booster().feature_names = None
+        return onnxmltools.convert_xgboost(
+            modelo,
+            initial_types=[("features", FloatTensorTypeML([None, n_features]))],
+            target_opset=OPSET_ONNX,
+        )
+    if familia == "LightGBM":
+        # Acepta tanto LGBMClassifier como lgb.Booster cargado desde .txt
+        return onnxmltools.convert_lightgbm(
+            modelo,
+            initial_types=[("features", FloatTensorTypeML([None, n_features]))],
+            zipmap=False,
+            target_opset=OPSET_ONNX,
+        )
+    if familia == "CatBoost":
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = Path(tmp) / "catboost.onnx"
+            modelo.save_model(str(ruta), format="onnx")
+            return onnx.load(str(ruta))
+    raise ValueError(f"Familia no válida: {familia}. Usar una de {FAMILIAS}.")
+
+
+def _alinea_opsets(modelo_onnx: onnx.ModelProto, prep_onnx: onnx.ModelProto) -> None:
+    """Iguala versiones de opset e IR para poder fusionar ambos grafos."""
+    versiones = {o.domain: o.version for o in modelo_onnx.opset_import}
+    versiones[""] = max(versiones.get("", OPSET_ONNX), OPSET_ONNX)
+    versiones["ai.onnx.ml"] = max(versiones.get("ai.onnx.ml", OPSET_ONNX_ML), OPSET_ONNX_ML)
+
+    for proto in (modelo_onnx, prep_onnx):
+        del proto.opset_import[:]
+        proto.opset_import.extend(helper.make_opsetid(d, v) for d, v in versiones.items())
+
+    # IR mínima para los opsets usados: helper.make_model pone la última IR
+    # del onnx instalado, que un onnxruntime algo más antiguo rechaza
+    ir_version = helper.find_min_ir_version_for(list(modelo_onnx.opset_import), ignore_unknown=True)
+    modelo_onnx.ir_version = ir_version
+    prep_onnx.ir_version   = ir_version
+
+
+def exporta_modelo_onnx(modelo, preprocessors: dict, familia: str, ruta_salida: Path) -> Path:
+    """
+    Exporta preprocesamiento + modelo como un único grafo ONNX.
+
+    Parámetros
+    ----------
+    modelo : estimador entrenado de la familia indicada (o lgb.Booster).
+    preprocessors : dict
+        Diccionario devuelto por `preprocesamiento_*` para la misma fase.
+    familia : str
+        Una de FAMILIAS.
+    ruta_salida : Path
+        Archivo .onnx de destino.
+
+    Retorna
+    -------
+    Path
+        Ruta del archivo generado.
+    """
+    prep_onnx   = construye_grafo_preprocesamiento(preprocessors, familia)
+    modelo_onnx = convierte_modelo(modelo, familia, len(preprocessors["feature_names"]))
+    _alinea_opsets(modelo_onnx, prep_onnx)
+
+    completo = compose.merge_models(
+        prep_onnx,
+        modelo_onnx,
+        io_map=[(SALIDA_PREPROCESAMIENTO, modelo_onnx.graph.input[0].name)],
+    )
+    onnx.checker.check_model(completo)
+
+    ruta_salida = Path(ruta_salida)
+    ruta_salida.parent.mkdir(parents=True, exist_ok=True)
+    onnx.save(completo, str(ruta_salida))
+    return ruta_salida
+
+
+# ==============================================================================
+# BACKEND DE SCORING
+# ==============================================================================
+
+_TIPOS_NUMPY = {
+    "tensor(string)": object,
+    "tensor(int64)":  np.int64,
+    "tensor(float)":  np.float32,
+}
+
+
+class ScorerONNX:
+    """
+    Scoring CPU con ONNX Runtime sobre columnas crudas de una fase.
+
+    Example:
+        >>> scorer = ScorerONNX("outputs/models/LightGBM/onnx/LightGBM_T1.onnx")
+        >>> scorer.predict_proba(X_test[scorer.columnas])[:, 1]
+    """
+
+    def __init__(self, ruta_modelo: Path, n_threads: int | None = None):
+        opciones = ort.SessionOptions()
+        if n_threads is not None:
+            opciones.intra_op_num_threads = n_threads
+        self.session = ort.InferenceSession(
+            str(ruta_modelo), sess_options=opciones, providers=["CPUExecutionProvider"]
+        )
+        self.entradas = {e.name: _TIPOS_NUMPY[e.type] for e in self.session.get_inputs()}
+        self.columnas = list(self.entradas)
+
+        nombres_salida = [s.name for s in self.session.get_outputs()]
+        self.salida_proba = next(
+            (n for n in nombres_salida if "prob" in n.lower()), nombres_salida[-1]
+        )
+
+    def _feed(self, X: pd.DataFrame) -> dict:
+        feed = {}
+        for col, tipo in self.entradas.items():
+            valores = X[[col]].to_numpy()
+            if tipo is object:
+                valores = valores.astype(str).astype(object)
+            else:
+                valores = valores.astype(tipo)
+            feed[col] = valores
+        return feed
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        proba = self.session.run([self.salida_proba], self._feed(X))[0]
+        proba = np.asarray(proba, dtype=float)
+        if proba.ndim == 1:
+            proba = np.column_stack([1.0 - proba, proba])
+        return proba
+
+    def predict(self, X: pd.DataFrame, umbral: float = 0.5) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= umbral).astype(int)
+
+
+# ==============================================================================
+# PARIDAD Y LATENCIA
+# ==============================================================================
+
+def verifica_paridad(proba_nativa: np.ndarray, proba_onnx: np.ndarray, atol: float = 1e-4,
+                     verbose: bool = True) -> dict:
+    """
+    Compara probabilidades de la clase positiva entre backend nativo y ONNX.
+
+    Retorna max_abs_diff, frac_filas_fuera (filas con |Δp| > atol) y ok. No
+    interrumpe el entrenamiento: si la paridad falla solo imprime un aviso.
+    Los árboles en ONNX usan umbrales float32, así que una fila cuyo valor
+    cae entre el umbral float64 del modelo y su redondeo float32 toma la
+    otra rama; por eso se informa también de cuántas filas difieren.
+    """
+    diffs = np.abs(np.asarray(proba_nativa, dtype=float) - np.asarray(proba_onnx, dtype=float))
+    paridad = {
+        "max_abs_diff":     float(diffs.max()) if diffs.size else 0.0,
+        "frac_filas_fuera": float((diffs > atol).mean()) if diffs.size else 0.0,
+    }
+    paridad["ok"] = paridad["max_abs_diff"] <= atol
+    if verbose and not paridad["ok"]:
+        print(f"   Aviso: paridad ONNX fuera de tolerancia — max |Δp| {paridad['max_abs_diff']:.2e} "
+              f"> {atol:.0e} en {paridad['frac_filas_fuera']:.2%} de las filas")
+    return paridad
+
+
+def compara_latencia(
+    predict_nativo,
+    scorer: ScorerONNX,
+    X_nativo: pd.DataFrame,
+    X_crudo: pd.DataFrame,
+    tamanos_lote: tuple = (1, 64, None),
+    repeticiones: int = 20,
+) -> pd.DataFrame:
+    """
+    Mide latencia (p50/p95) y throughput de ambos backends por tamaño de lote.
+
+    El backend nativo recibe la matriz ya preprocesada, mientras que ONNX
+    incluye el preprocesamiento dentro del grafo: la comparación es
+    conservadora a favor del nativo. `None` en `tamanos_lote` = lote completo.
+    """
+    filas = []
+    for lote in tamanos_lote:
+        n = len(X_nativo) if lote is None else min(lote, len(X_nativo))
+        for backend, fn, X in [
+            ("nativo",      predict_nativo,       X_nativo.iloc[:n]),
+            ("onnxruntime", scorer.predict_proba, X_crudo.iloc[:n]),
+        ]:
+            fn(X)  # calentamiento
+            tiempos = []
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                fn(X)
+                tiempos.append(time.perf_counter() - t0)
+            p50 = float(np.median(tiempos))
+            filas.append({
+                "backend":         backend,
+                "lote":            n,
+                "latencia_ms_p50": p50 * 1000,
+                "latencia_ms_p95": float(np.percentile(tiempos, 95)) * 1000,
+                "filas_por_s":     n / p50 if p50 > 0 else float("inf"),
+            })
+    return pd.DataFrame(filas)
+
+
+def exporta_y_valida_onnx(
+    modelo,
+    preprocessors: dict,
+    familia: str,
+    fase: str,
+    X_crudo: pd.DataFrame,
+    X_nativo: pd.DataFrame,
+    output_dir: Path,
+) -> pd.DataFrame:
+    """
+    Exporta el modelo de una fase, verifica paridad y compara latencias.
+
+    Retorna un DataFrame con la tabla de latencias más el resultado de la
+    paridad (diferencia máxima, fracción de filas fuera de tolerancia, ok).
+    """
+    ruta = exporta_modelo_onnx(modelo, preprocessors, familia,
+                               Path(output_dir) / f"{familia}_{fase}.onnx")
+    scorer = ScorerONNX(ruta)
+
+    proba_nativa = modelo.predict_proba(X_nativo)[:, 1]
+    proba_onnx   = scorer.predict_proba(X_crudo)[:, 1]
+    paridad = verifica_paridad(proba_nativa, proba_onnx)
+
+    df_latencia = compara_latencia(modelo.predict_proba, scorer, X_nativo, X_crudo)
+    df_latencia.insert(0, "fase", fase)
+    df_latencia.insert(0, "modelo", familia)
+    df_latencia["paridad_max_abs_diff"]     = paridad["max_abs_diff"]
+    df_latencia["paridad_frac_filas_fuera"] = paridad["frac_filas_fuera"]
+    df_latencia["paridad_ok"]               = paridad["ok"]
+
+    print(f"   ONNX exportado: {ruta}  |  Paridad (max |Δp|): {paridad['max_abs_diff']:.2e}")
+    return df_latencia
@@ -0,0 +1,302 @@
+# src/models/registry.py
+"""
+Registro de modelos con caché LRU en proceso
+============================================
+Este módulo contiene:
+- Indexación de artefactos por (familia, fase, versión) con checksum SHA-256
+  y metadatos de best_params.json
+- Caché LRU acotada en bytes para boosters y preprocessors cargados
+- Precarga al arranque y un registro compartido por proceso
+
+Solo los pipelines de LightGBM persisten modelos finales con
+preprocessors (lightgbm_final_T*.txt), así que el registro indexa esa
+familia; para añadir otra basta con que su pipeline guarde los modelos
+finales y registrar su patrón en ARCHIVOS_MODELO.
+
+Estructura esperada en disco (outputs/models):
+
+    LightGBM/
+        best_params.json
+        lightgbm_final_T0.txt          → versión "actual"
+        preprocessors_T0.joblib
+        v2/                            → versión "v2" (mismos nombres)
+            best_params.json
+            lightgbm_final_T0.txt
+            preprocessors_T0.joblib
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MODELS_ROOT  = PROJECT_ROOT / "outputs" / "models"
+
+FASES          = ["T0", "T1", "T2"]
+VERSION_ACTUAL = "actual"
+MAX_BYTES_CACHE = 512 * 1024 ** 2
+
+# Patrón del archivo de modelo por familia ({fase} se sustituye); la clave es
+# el directorio de la familia bajo MODELS_ROOT
+ARCHIVOS_MODELO = {
+    "LightGBM": "lightgbm_final_{fase}.txt",
+}
+ARCHIVO_PREPROCESSORS = "preprocessors_{fase}.joblib"
+
+
+# ==============================================================================
+# FUNCIONES AUXILIARES
+# ==============================================================================
+
+def calcula_checksum(ruta: Path, bloque: int = 1 << 20) -> str:
+    """SHA-256 de un archivo leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for chunk in iter(lambda: f.read(bloque), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _es_booster_lgb(obj) -> bool:
+    # Sin importar lightgbm: un proceso que solo sirve modelos joblib no lo carga
+    tipo = type(obj)
+    return tipo.__name__ == "Booster" and tipo.__module__.startswith("lightgbm")
+
+
+def _estima_bytes(obj) -> int:
+    """Estimación del tamaño en memoria de un artefacto cargado."""
+    if _es_booster_lgb(obj):
+        return len(obj.model_to_string())
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def _carga_artefacto(ruta: Path):
+    if ruta.suffix == ".txt":
+        import lightgbm as lgb
+        return lgb.Booster(model_file=str(ruta))
+    return joblib.load(ruta)
+
+
+# ==============================================================================
+# CACHÉ LRU
+# ==============================================================================
+
+class CacheLRU:
+    """
+    Caché LRU acotada por bytes estimados, segura entre hilos.
+
+    Cada inserción expulsa las entradas menos usadas hasta respetar
+    `max_bytes`; una entrada mayor que la capacidad no se almacena.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES_CACHE):
+        self.max_bytes = max_bytes
+        self._datos    = OrderedDict()
+        self._lock     = threading.Lock()
+        self.bytes_usados = 0
+        self.hits = self.misses = self.expulsiones = 0
+
+    def obtiene(self, clave):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.hits += 1
+                return self._datos[clave][0]
+            self.misses += 1
+            return None
+
+    def guarda(self, clave, valor, n_bytes: int) -> None:
+        with self._lock:
+            if clave in self._datos:
+                self.bytes_usados -= self._datos.pop(clave)[1]
+            if n_bytes > self.max_bytes:
+                return
+            while self._datos and self.bytes_usados + n_bytes > self.max_bytes:
+                _, (_, liberados) = self._datos.popitem(last=False)
+                self.bytes_usados -= liberados
+                self.expulsiones  += 1
+            self._datos[clave] = (valor, n_bytes)
+            self.bytes_usados += n_bytes
+
+    def __contains__(self, clave) -> bool:
+        with self._lock:
+            return clave in self._datos
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "entradas":     len(self._datos),
+                "bytes_usados": self.bytes_usados,
+                "max_bytes":    self.max_bytes,
+                "hits":         self.hits,
+                "misses":       self.misses,
+                "expulsiones":  self.expulsiones,
+            }
+
+
+# ==============================================================================
+# REGISTRO
+# ==============================================================================
+
+class RegistroModelos:
+    """
+    Índice de modelos por (familia, fase, versión) con caché LRU.
+
+    Example:
+        >>> registro = RegistroModelos()
+        >>> registro.precarga(familias=["LightGBM"])
+        >>> booster = registro.obtiene_modelo("LightGBM", "T1")
+        >>> proba = registro.predict_proba(X_test_prep, "LightGBM", "T1")
+    """
+
+    def __init__(self, root: Path = MODELS_ROOT, max_bytes: int = MAX_BYTES_CACHE):
+        self.root   = Path(root)
+        self.cache  = CacheLRU(max_bytes)
+        self.indice = {}
+        self.indexa()
+
+    # ------------------------------------------------------------------
+    # Indexación
+    # ------------------------------------------------------------------
+    def indexa(self) -> None:
+        """Recorre el directorio raíz y construye el índice de artefactos."""
+        self.indice = {}
+        for familia, patron in ARCHIVOS_MODELO.items():
+            dir_familia = self.root / familia
+            if not dir_familia.is_dir():
+                continue
+            versiones = [(VERSION_ACTUAL, dir_familia)] + [
+                (d.name, d) for d in sorted(dir_familia.iterdir()) if d.is_dir()
+            ]
+            for version, directorio in versiones:
+                params_path = directorio / "best_params.json"
+                best_params = json.loads(params_path.read_text()) if params_path.exists() else {}
+                for fase in FASES:
+                    ruta_modelo = directorio / patron.format(fase=fase)
+                    if not ruta_modelo.exists():
+                        continue
+                    ruta_prep = directorio / ARCHIVO_PREPROCESSORS.format(fase=fase)
+                    self.indice[(familia, fase, version)] = {
+                        "familia":              familia,
+                        "fase":                 fase,
+                        "version":              version,
+                        "ruta_modelo":          ruta_modelo,
+                        "checksum_modelo":      calcula_checksum(ruta_modelo),
+                        "ruta_preprocessors":   ruta_prep if ruta_prep.exists() else None,
+                        "checksum_preprocessors": (
+                            calcula_checksum(ruta_prep) if ruta_prep.exists() else None
+                        ),
+                        "best_params":          best_params.get(fase, {}),
+                    }
+
+    def lista(self) -> pd.DataFrame:
+        """Tabla del índice (sin rutas absolutas ni parámetros anidados)."""
+        filas = [
+            {
+                "familia":  e["familia"],
+                "fase":     e["fase"],
+                "version":  e["version"],
+                "checksum_modelo": e["checksum_modelo"][:12],
+                "en_cache": ("modelo",) + k in self.cache,
+            }
+            for k, e in self.indice.items()
+        ]
+        return pd.DataFrame(filas)
+
+    def _resuelve(self, familia: str, fase: str, version: str | None) -> dict:
+        version = version or VERSION_ACTUAL
+        clave = (familia, fase, version)
+        if clave not in self.indice:
+            raise KeyError(f"Modelo no registrado: {familia}/{fase}/{version}")
+        return self.indice[clave]
+
+    def metadatos(self, familia: str, fase: str, version: str | None = None) -> dict:
+        entrada = self._resuelve(familia, fase, version)
+        return {k: v for k, v in entrada.items() if not k.startswith("ruta_")}
+
+    def directorio(self, familia: str, fase: str, version: str | None = None) -> Path:
+        """Directorio de la versión (donde viven los artefactos asociados)."""
+        return self._resuelve(familia, fase, version)["ruta_modelo"].parent
+
+    # ------------------------------------------------------------------
+    # Carga con caché
+    # ------------------------------------------------------------------
+    def _obtiene(self, tipo: str, entrada: dict):
+        clave = (tipo, entrada["familia"], entrada["fase"], entrada["version"])
+        obj = self.cache.obtiene(clave)
+        if obj is not None:
+            return obj
+
+        ruta     = entrada[f"ruta_{tipo}"]
+        checksum = entrada[f"checksum_{tipo}"]
+        if ruta is None:
+            raise FileNotFoundError(
+                f"Sin {tipo} para {entrada['familia']}/{entrada['fase']}/{entrada['version']}"
+            )
+        if calcula_checksum(ruta) != checksum:
+            raise ValueError(f"Checksum distinto al indexado para {ruta}; re-indexar el registro")
+
+        obj = _carga_artefacto(ruta)
+        self.cache.guarda(clave, obj, _estima_bytes(obj))
+        return obj
+
+    def obtiene_modelo(self, familia: str, fase: str, version: str | None = None):
+        return self._obtiene("modelo", self._resuelve(familia, fase, version))
+
+    def obtiene_preprocessors(self, familia: str, fase: str, version: str | None = None) -> dict:
+        return self._obtiene("preprocessors", self._resuelve(familia, fase, version))
+
+    def precarga(self, familias: list | None = None, versiones: list | None = None) -> None:
+        """Carga en caché modelos y preprocessors registrados (uso al arranque)."""
+        for (familia, fase, version), entrada in self.indice.items():
+            if familias is not None and familia not in familias:
+                continue
+            if versiones is not None and version not in versiones:
+                continue
+            self._obtiene("modelo", entrada)
+            if entrada["ruta_preprocessors"] is not None:
+                self._obtiene("preprocessors", entrada)
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def predict_proba(self, X, familia: str, fase: str, version: str | None = None):
+        """Probabilidad de la clase Dropout sobre una matriz ya preprocesada."""
+        modelo = self.obtiene_modelo(familia, fase, version)
+        if _es_booster_lgb(modelo):
+            return modelo.predict(X)
+        return modelo.predict_proba(X)[:, 1]
+
+
+# ==============================================================================
+# REGISTRO COMPARTIDO POR PROCESO
+# ==============================================================================
+_REGISTRO = None
+_REGISTRO_LOCK = threading.Lock()
+
+
+def obtiene_registro(root: Path = MODELS_ROOT, max_bytes: int = MAX_BYTES_CACHE,
+                     precargar: bool = False) -> RegistroModelos:
+    """Devuelve el registro del proceso, creándolo (y precargándolo) la primera vez."""
+    global _REGISTRO
+    with _REGISTRO_LOCK:
+        if _REGISTRO is None or _REGISTRO.root != Path(root):
+            _REGISTRO = RegistroModelos(root, max_bytes)
+            if precargar:
+                _REGISTRO.precarga()
+    return _REGISTRO
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# src/models/shap_engine.py
+"""
+Motor SHAP por lotes para los modelos LightGBM finales
+======================================================
+Este módulo contiene:
+- Cálculo de contribuciones SHAP con Booster.predict(pred_contrib=True)
+  repartido en chunks entre procesos, para T0/T1/T2 a la vez
+- Caché persistente de las matrices (.npy + JSON) invalidada por checksum
+  del modelo o por cambios en los datos de evaluación (hash de X)
+- Gráficos (summary, barras, dependencia, comparación entre fases) y tabla
+  de importancia que leen siempre de la caché
+
+pred_contrib devuelve, por fila, n_features contribuciones en escala
+log-odds más el valor esperado en la última columna; es el mismo resultado
+que shap.TreeExplainer sobre un Booster binario, sin la dependencia de shap
+para el cálculo.
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.artifacts import ArtefactosEvaluacion, directorio_artefactos
+from src.models.registry import calcula_checksum
+from src.utils.graficos import pyplot
+
+# ==============================================================================
+# CONFIGURACIÓN DE PATHS
+# ==============================================================================
+MODELS_DIR  = PROJECT_ROOT / "outputs" / "models" / "LightGBM"
+CACHE_DIR   = MODELS_DIR / "shap"
+FIGURES_DIR = PROJECT_ROOT / "outputs" / "figures" / "modelado" / "LightGBM" / "SHAP"
+
+FASES          = ["T0", "T1", "T2"]
+TAMANO_CHUNK   = 256
+
+
+# ==============================================================================
+# CÁLCULO EN PROCESOS
+# ==============================================================================
+_BOOSTERS_PROCESO = {}
+
+
+def _contribuciones_chunk(ruta_modelo: str, X_chunk: np.ndarray) -> np.ndarray:
+    """Worker: carga el booster una vez por proceso y calcula pred_contrib."""
+    booster = _BOOSTERS_PROCESO.get(ruta_modelo)
+    if booster is None:
+        import lightgbm as lgb
+        booster = lgb.Booster(model_file=ruta_modelo)
+        _BOOSTERS_PROCESO[ruta_modelo] = booster
+    # Un hilo por proceso: el paralelismo viene de los chunks
+    return booster.predict(X_chunk, pred_contrib=True, num_threads=1)
+
+
+def carga_datos_evaluacion(models_dir: Path, fase: str) -> tuple:
+    """
+    Devuelve (X_test_prep, feature_names) de una fase.
+
+    Usa el formato ligero (artefactos_<fase>) si existe; en otro caso, el
+    joblib original.
+    """
+    directorio = directorio_artefactos(models_dir, fase)
+    if directorio.exists():
+        datos = ArtefactosEvaluacion(directorio)
+        return np.asarray(datos["X_test_prep"], dtype=np.float64), list(datos["feature_names"])
+
+    import joblib
+    datos = joblib.load(Path(models_dir) / f"datos_evaluacion_{fase}.joblib")
+    X = datos["X_test_prep"]
+    X = X.to_numpy(dtype=np.float64) if hasattr(X, "to_numpy") else np.asarray(X, dtype=np.float64)
+    return X, list(datos["feature_names"])
+
+
+def _ruta_cache(cache_dir: Path, fase: str) -> tuple:
+    return cache_dir / f"shap_{fase}.npy", cache_dir / f"shap_{fase}.json"
+
+
+def huella_datos(X: np.ndarray, feature_names: list) -> str:
+    """SHA-256 de la matriz evaluada (forma, valores y nombres de columnas)."""
+    h = hashlib.sha256()
+    h.update(json.dumps([list(X.shape), list(feature_names)]).encode("utf-8"))
+    h.update(np.ascontiguousarray(X).tobytes())
+    return h.hexdigest()
+
+
+def _cache_valida(cache_dir: Path, fase: str, checksum: str, huella: str) -> bool:
+    ruta_valores, ruta_meta = _ruta_cache(cache_dir, fase)
+    if not (ruta_valores.exists() and ruta_meta.exists()):
+        return False
+    meta = json.loads(ruta_meta.read_text(encoding="utf-8"))
+    return meta.get("checksum_modelo") == checksum and meta.get("huella_datos") == huella
+
+
+def calcula_shap_fases(
+    models_dir: Path = MODELS_DIR,
+    cache_dir: Path = CACHE_DIR,
+    fases: list = FASES,
+    n_procesos: int | None = None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    forzar: bool = False,
+    verbose: bool = True,
+) -> dict:
+    """
+    Calcula y persiste las matrices SHAP de todas las fases en paralelo.
+
+    Los chunks de todas las fases se encolan en un único pool, de modo que
+    una fase pequeña no deja procesos ociosos. Las fases con caché válida
+    (mismo checksum de modelo y mismo hash de X) no se recalculan.
+
+    Returns:
+        dict: fase → ruta del .npy de valores SHAP
+    """
+    models_dir = Path(models_dir)
+    cache_dir  = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    pendientes = {}
+    for fase in fases:
+        ruta_modelo = models_dir / f"lightgbm_final_{fase}.txt"
+        checksum    = calcula_checksum(ruta_modelo)
+        X, feature_names = carga_datos_evaluacion(models_dir, fase)
+        huella      = huella_datos(X, feature_names)
+        if not forzar and _cache_valida(cache_dir, fase, checksum, huella):
+            if verbose:
+                print(f"  SHAP {fase}: caché válida ({_ruta_cache(cache_dir, fase)[0].name})")
+            continue
+        pendientes[fase] = (str(ruta_modelo), checksum, huella, X, feature_names)
+
+    if pendientes:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            futuros = {
+                fase: [
+                    pool.submit(_contribuciones_chunk, ruta, X[i:i + tamano_chunk])
+                    for i in range(0, X.shape[0], tamano_chunk)
+                ]
+                for fase, (ruta, _, _, X, _) in pendientes.items()
+            }
+            for fase, lista in futuros.items():
+                _, checksum, huella, X, feature_names = pendientes[fase]
+                contrib = np.vstack([f.result() for f in lista])
+
+                ruta_valores, ruta_meta = _ruta_cache(cache_dir, fase)
+                np.save(ruta_valores, np.ascontiguousarray(contrib[:, :-1]))
+                meta = {
+                    "fase":            fase,
+                    "checksum_modelo": checksum,
+                    "n_filas":         int(X.shape[0]),
+                    "huella_datos":    huella,
+                    "expected_value":  float(contrib[0, -1]),
+                    "feature_names":   feature_names,
+                }
+                ruta_meta.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+                if verbose:
+                    print(f"  SHAP {fase}: {contrib.shape[0]} filas × "
+                          f"{contrib.shape[1] - 1} features → {ruta_valores.name}")
+
+    return {fase: _ruta_cache(cache_dir, fase)[0] for fase in fases}
+
+
+def carga_shap(fase: str, cache_dir: Path = CACHE_DIR, mmap_mode: str | None = "r") -> dict:
+    """Lee de la caché: valores SHAP, expected_value y feature_names."""
+    ruta_valores, ruta_meta = _ruta_cache(Path(cache_dir), fase)
+    meta = json.loads(ruta_meta.read_text(encoding="utf-8"))
+    return {
+        "valores":        np.load(ruta_valores, mmap_mode=mmap_mode),
+        "expected_value": meta["expected_value"],
+        "feature_names":  meta["feature_names"],
+    }
+
+
+# ==============================================================================
+# TABLAS Y GRÁFICOS (LEEN DE LA CACHÉ)
+# ==============================================================================
+
+def tabla_importancia_shap(fase: str, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    shap_fase = carga_shap(fase, cache_dir)
+    return pd.DataFrame({
+        "feature":    shap_fase["feature_names"],
+        "importance": np.abs(shap_fase["valores"]).mean(axis=0),
+    }).sort_values("importance", ascending=False).reset_index(drop=True)
+
+
+def grafica_impacto_shap(fase: str, X: np.ndarray, output_dir: Path,
+                         cache_dir: Path = CACHE_DIR) -> Path:
+    import shap
+    plt = pyplot()
+
+    shap_fase = carga_shap(fase, cache_dir)
+    shap.summary_plot(
+        np.asarray(shap_fase["valores"]), X,
+        feature_names=shap_fase["feature_names"], show=False,
+    )
+    plt.title(f"Importancia global de variables (SHAP) -  Fase {fase}", fontsize=16)
+    plt.tight_layout()
+    filepath = Path(output_dir) / f"impactoShap_{fase}.png"
+    plt.savefig(filepath, dpi=150, bbox_inches="tight")
+    plt.close()
+    return filepath
+
+
+def grafica_importancia_shap(fase: str, X: np.ndarray, output_dir: Path,
+                             cache_dir: Path = CACHE_DIR, max_display: int = 20) -> Path:
+    import shap
+    plt = pyplot()
+
+    shap_fase = carga_shap(fase, cache_dir)
+    plt.figure(figsize=(10, 8))
+    shap.summary_plot(
+        np.asarray(shap_fase["valores"]), X,
+        feature_names=shap_fase["feature_names"],
+        plot_type="bar", max_display=max_display, show=False,
+    )
+    plt.title(f"Importancia de variables (SHAP) - Fase {fase}", fontsize=14)
+    plt.tight_layout()
+    filepath = Path(output_dir) / f"shap_importance_bar_{fase}.png"
+    plt.savefig(filepath, dpi=150, bbox_inches="tight")
+    plt.close()
+    return filepath
+
+
+def grafica_dependencia_shap_top(fase: str, X: np.ndarray, output_dir: Path,
+                                 cache_dir: Path = CACHE_DIR, top_n: int = 4) -> Path:
+    import shap
+    plt = pyplot()
+
+    shap_fase     = carga_shap(fase, cache_dir)
+    feature_names = shap_fase["feature_names"]
+    top_features  = tabla_importancia_shap(fase, cache_dir).head(top_n)["feature"].tolist()
+
+    n_rows = (top_n + 1) // 2
+    fig, axes = plt.subplots(n_rows, 2, figsize=(14, 5 * n_rows))
+    axes = axes.flatten()
+
+    for ax, feature in zip(axes, top_features):
+        shap.dependence_plot(
+            feature_names.index(feature), np.asarray(shap_fase["valores"]), X,
+            feature_names=feature_names, ax=ax, show=False,
+        )
+        ax.set_title(feature)
+    for ax in axes[len(top_features):]:
+        ax.remove()
+
+    plt.suptitle(f"Gráficos de Dependencia SHAP - Top {top_n} Variables - Fase {fase}",
+                 fontsize=14, y=1.02)
+    plt.tight_layout()
+    filepath = Path(output_dir) / f"shap_dependence_top{top_n}_{fase}.png"
+    plt.savefig(filepath, dpi=150, bbox_inches="tight")
+    plt.close()
+    return filepath
+
+
+def grafica_comparacion_fases(output_dir: Path, cache_dir: Path = CACHE_DIR,
+                              fases: list = FASES, top_n: int = 10) -> Path:
+    """Barras de importancia media |SHAP| por fase, en paralelo."""
+    plt = pyplot()
+    fig, axes = plt.subplots(1, len(fases), figsize=(8 * len(fases), 8))
+    for ax, fase in zip(np.atleast_1d(axes), fases):
+        df_imp = tabla_importancia_shap(fase, cache_dir).head(top_n).iloc[::-1]
+        ax.barh(df_imp["feature"], df_imp["importance"], color="#1f77b4")
+        ax.set_title(fase, fontsize=12)
+        ax.set_xlabel("mean(|SHAP value|)")
+
+    plt.suptitle("Comparación Importancia SHAP por Fase", fontsize=18, y=1.02)
+    plt.tight_layout()
+    filepath = Path(output_dir) / "shap_comparison_phases.png"
+    plt.savefig(filepath, dpi=200, bbox_inches="tight")
+    plt.close()
+    return filepath
+
+
+def genera_informe_shap(
+    models_dir: str | None = None,
+    cache_dir: str | None = None,
+    output_dir: str | None = None,
+    n_procesos: int | None = None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    forzar: bool = False,
+    top_n: int = 10,
+) -> None:
+    """Calcula (o reutiliza) la caché SHAP y genera figuras y tablas por fase."""
+    models_dir = Path(models_dir) if models_dir else MODELS_DIR
+    cache_dir  = Path(cache_dir)  if cache_dir  else models_dir / "shap"
+    output_dir = Path(output_dir) if output_dir else FIGURES_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print("================================================================================")
+    print("  CÁLCULO SHAP (pred_contrib, por chunks en paralelo)")
+    print("================================================================================")
+    calcula_shap_fases(models_dir, cache_dir, FASES, n_procesos, tamano_chunk, forzar)
+
+    for fase in FASES:
+        X, _ = carga_datos_evaluacion(models_dir, fase)
+
+        df_imp = tabla_importancia_shap(fase, cache_dir)
+        csv_path = output_dir / f"feature_importance_{fase}.csv"
+        df_imp.to_csv(csv_path, index=False)
+
+        print("\n================================================================================")
+        print(f"  TOP {top_n} VARIABLES MÁS IMPORTANTES (SHAP) - Fase {fase}")
+        print("================================================================================")
+        print(f"\n{'Rank':<6} {'Variable':<45} {'Importancia':>12}")
+        print("--------------------------------------------------------------------------------")
+        for i, row in enumerate(df_imp.head(top_n).itertuples(), 1):
+            print(f"{i:<6} {row.feature:<45} {row.importance:>12.4f}")
+
+        grafica_impacto_shap(fase, X, output_dir, cache_dir)
+        grafica_importancia_shap(fase, X, output_dir, cache_dir)
+        grafica_dependencia_shap_top(fase, X, output_dir, cache_dir)
+
+    grafica_comparacion_fases(output_dir, cache_dir)
+    print(f"\nFiguras y tablas guardadas en: {output_dir}")
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cálculo SHAP por lotes en paralelo para los modelos LightGBM finales"
+    )
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Directorio con lightgbm_final_T*.txt y datos de evaluación")
+    parser.add_argument("--cache", "-c", type=str, default=None,
+                        help="Directorio de la caché SHAP (default: <models>/shap)")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help="Directorio de figuras (default: outputs/figures/modelado/LightGBM/SHAP)")
+    parser.add_argument("--procesos", "-p", type=int, default=None,
+                        help="Número de procesos (default: os.cpu_count())")
+    parser.add_argument("--chunk", type=int, default=TAMANO_CHUNK,
+                        help=f"Filas por chunk (default: {TAMANO_CHUNK})")
+    parser.add_argument("--forzar", action="store_true",
+                        help="Recalcula aunque la caché sea válida")
+
+    args = parser.parse_args()
+
+    genera_informe_shap(
+        models_dir=args.models,
+        cache_dir=args.cache,
+        output_dir=args.output,
+        n_procesos=args.procesos,
+        tamano_chunk=args.chunk,
+        forzar=args.forzar,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 
 from src.data.clean_columns import clean_dataframe_columns
+from src.utils.instrumentacion import etapa, finaliza_instrumentacion, inicia_instrumentacion
 from src.utils.constants import (
     VARS_BINARIAS,
     VARS_CATEGORICAS_NOMINALES,
@@ -507,23 +508,33 @@ def main():
     print("================================================================================")
     
     # Crear directorios
+    inicia_instrumentacion("eda_inicial")
     create_output_dirs()
     
     # Cargar datos
     print("\nCargando datos...")
-    df = load_data()
+    with etapa("carga"):
+        df = load_data()
     
     # Ejecutar todas las secciones
-    section_1_carga_dimension(df)
-    section_2_listado_variables(df)
-    section_3_clasificacion_variables()
-    section_3_1_variables_numericas(df)
-    section_3_2_variables_binarias(df)
-    section_3_3_variables_categoricas(df)
-    section_3_4_variable_target(df)
+    with etapa("section_1_carga_dimension"):
+        section_1_carga_dimension(df)
+    with etapa("section_2_listado_variables"):
+        section_2_listado_variables(df)
+    with etapa("section_3_clasificacion_variables"):
+        section_3_clasificacion_variables()
+    with etapa("section_3_1_variables_numericas"):
+        section_3_1_variables_numericas(df)
+    with etapa("section_3_2_variables_binarias"):
+        section_3_2_variables_binarias(df)
+    with etapa("section_3_3_variables_categoricas"):
+        section_3_3_variables_categoricas(df)
+    with etapa("section_3_4_variable_target"):
+        section_3_4_variable_target(df)
     
     # Generar resumen para DVC
-    generate_eda_summary(df)
+    with etapa("guardado"):
+        generate_eda_summary(df)
     
     print("\n" + "================================================================================")
     print(" EDA COMPLETADO")
@@ -531,6 +542,8 @@ def main():
     print(f"\n Figuras guardadas en: {BASE_OUTPUT_DIR}")
     print(f" Tablas guardadas en: {TABLES_OUTPUT_DIR}")
 
+    finaliza_instrumentacion()
+
 
 if __name__ == "__main__":
     main()
@@ -17,6 +17,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.data.clean_columns import clean_dataframe_columns
+from src.utils.instrumentacion import etapa, finaliza_instrumentacion, inicia_instrumentacion
 from src.utils.constants import (
     VARS_BINARIAS,
     VARS_CATEGORICAS_NOMINALES,
@@ -148,7 +149,8 @@ def analizar_calidad_datos(
         print("--------------------------------------------------------------------------------")
         print(f"\nCargando dataset desde: {input_path}")
     
-    df = pd.read_csv(input_path, delimiter=';')
+    with etapa("carga"):
+        df = pd.read_csv(input_path, delimiter=';')
     df = clean_dataframe_columns(df)
     
     if verbose:
@@ -273,7 +275,8 @@ def analizar_calidad_datos(
     # 7. GUARDAR RESULTADOS
     
     output_file = output_dir / "indice_calidad_dataset.csv"
-    metricas_sorted.to_csv(output_file, index=True)
+    with etapa("guardado"):
+        metricas_sorted.to_csv(output_file, index=True)
     
     if verbose:
         print(f"\nResultados guardados en: {output_file}")
@@ -312,17 +315,21 @@ def main():
     
     args = parser.parse_args()
     
-    analizar_calidad_datos(
-        input_path=args.input,
-        output_dir=args.output,
-        verbose=not args.quiet
-    )
+    inicia_instrumentacion("analisis_calidad_datos")
+    with etapa("analisis_calidad"):
+        analizar_calidad_datos(
+            input_path=args.input,
+            output_dir=args.output,
+            verbose=not args.quiet
+        )
     
     print("\n" + "================================================================================")
     print("\n" + "--------------------------------------------------------------------------------")
     print("Análisis completado")
     print("================================================================================")
 
+    finaliza_instrumentacion(verbose=not args.quiet)
+
 
 if __name__ == "__main__":
     main()
@@ -21,6 +21,8 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.data.clean_columns import clean_dataframe_columns
+from src.data.esquema import lee_csv
+from src.utils.instrumentacion import etapa, finaliza_instrumentacion, inicia_instrumentacion
 from src.utils.constants import (
     VARS_BINARIAS,
     VARS_CATEGORICAS_NOMINALES,
@@ -376,7 +378,8 @@ def preprocesar_datos(
         print("===========================================================================================================")
         print(f"\nCargando dataset desde: {input_path}")
     
-    df_raw = pd.read_csv(input_path, delimiter=';')
+    with etapa("carga"):
+        df_raw = lee_csv(input_path, delimiter=';')
     df = df_raw.copy()
     df = clean_dataframe_columns(df)
     
@@ -392,32 +395,38 @@ def preprocesar_datos(
         print("-----------------------------------------------------------------------------------------------------------")
     
     # 2.1 Estado civil → is_single
-    df = crear_is_single(df)
+    with etapa("feature_engineering", paso="crear_is_single"):
+        df = crear_is_single(df)
     if verbose:
         print("Creada: is_single")
     
     # 2.2 Modalidad de aplicación → application_mode_risk
-    df = crear_application_mode_risk(df)
+    with etapa("feature_engineering", paso="crear_application_mode_risk"):
+        df = crear_application_mode_risk(df)
     if verbose:
         print("Creada: application_mode_risk")
     
     # 2.3 Cualificación previa → previous_qualification_risk
-    df = crear_previous_qualification_risk(df)
+    with etapa("feature_engineering", paso="crear_previous_qualification_risk"):
+        df = crear_previous_qualification_risk(df)
     if verbose:
         print("Creada: previous_qualification_risk")
     
     # 2.4 Educación de padres → *_qualification_level
-    df = crear_parent_qualification_levels(df)
+    with etapa("feature_engineering", paso="crear_parent_qualification_levels"):
+        df = crear_parent_qualification_levels(df)
     if verbose:
         print("Creadas: mothers_qualification_level, fathers_qualification_level")
     
     # 2.5 Ocupación de padres → *_occupation_level
-    df = crear_parent_occupation_levels(df)
+    with etapa("feature_engineering", paso="crear_parent_occupation_levels"):
+        df = crear_parent_occupation_levels(df)
     if verbose:
         print("Creadas: mothers_occupation_level, fathers_occupation_level")
     
     # 2.7 Target binario
-    df = crear_target_binario(df)
+    with etapa("feature_engineering", paso="crear_target_binario"):
+        df = crear_target_binario(df)
     if verbose:
         print("Creada: target_binario")
     
@@ -430,7 +439,8 @@ def preprocesar_datos(
         print("-----------------------------------------------------------------------------------------------------------")
     
     n_cols_antes = df.shape[1]
-    df = eliminar_variables_redundantes(df)
+    with etapa("eliminacion_variables"):
+        df = eliminar_variables_redundantes(df)
     n_cols_despues = df.shape[1]
     
     if verbose:
@@ -444,13 +454,15 @@ def preprocesar_datos(
         print("Generando visualizaciones...")
         print("-----------------------------------------------------------------------------------------------------------")
     
-    graficar_distribucion_target(df, figures_dir, verbose)
+    with etapa("graficos"):
+        graficar_distribucion_target(df, figures_dir, verbose)
     
     # ==========================================================================
     # 5. GUARDAR DATASET PROCESADO
     # ==========================================================================
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    with etapa("guardado"):
+        df.to_csv(output_path, index=False)
     
     if verbose:
         print(f"\nDataset procesado guardado en: {output_path}")
@@ -490,17 +502,21 @@ def main():
     
     args = parser.parse_args()
     
-    preprocesar_datos(
-        input_path=args.input,
-        output_path=args.output,
-        figures_dir=args.figures,
-        verbose=not args.quiet
-    )
+    inicia_instrumentacion("preprocesamiento")
+    with etapa("preprocesar_datos"):
+        preprocesar_datos(
+            input_path=args.input,
+            output_path=args.output,
+            figures_dir=args.figures,
+            verbose=not args.quiet
+        )
     
     print("\n" + "===========================================================================================================")
     print("PREPROCESAMIENTO COMPLETADO")
     print("===========================================================================================================")
 
+    finaliza_instrumentacion(verbose=not args.quiet)
+
 
 if __name__ == "__main__":
     main()
@@ -8,15 +8,14 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import sys
+import time
 import os
 import argparse
 import warnings
 warnings.filterwarnings("ignore")
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Preprocesamiento
@@ -33,15 +32,8 @@ from sklearn.metrics import (
     roc_auc_score
 )
 
-# Encoders
-from category_encoders import TargetEncoder
-
-# Optimización
-import optuna
-
-# MLflow
-import mlflow
-import mlflow.sklearn
+# matplotlib, optuna, mlflow y category_encoders se importan en las
+# funciones que los usan: --help y el orquestador no pagan su carga
 
 # ==============================================================================
 # CONFIGURACIÓN DE RUTAS
@@ -50,6 +42,30 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.data.esquema import lee_csv
+from src.data.fases import VARS_T0, VARS_T1, VARS_T2, especificacion
+from src.models.arranque_optuna import crea_estudio, guarda_best_params
+from src.models.curvas_staged import MODO_CURVAS_DEFECTO, MODOS_CURVAS, resuelve_modo_curvas
+from src.models.matrices import MatrizFase, asigna_nombres, como_matriz
+from src.models.multifidelidad import crea_pruner, evalua_multifidelidad
+from src.utils.checkpoints import (
+    DIRECTORIO_CHECKPOINTS,
+    Checkpoints,
+    RegistroResultados,
+    sin_hilos,
+)
+from src.utils.graficos import ESTILO_GRAFICOS, pyplot
+from src.utils.hilos import configura_presupuesto_hilos, presupuesto_hilos
+from src.utils.instrumentacion import (
+    etapa,
+    finaliza_instrumentacion,
+    inicia_instrumentacion,
+    instrumenta_objetivo,
+)
+from src.utils.mlflow_asincrono import finaliza_registro_mlflow, registro_mlflow
+from src.utils.reporte_cv import imprime_resumen_cv, resume, tabla_folds
+from src.utils.telemetria_optuna import OPTUNA_DIR, TelemetriaOptuna
+
 DATA_PROCESSED_PATH  = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
 OUTPUT_DIR_FIGURES   = PROJECT_ROOT / "outputs" / "figures"  / "modelado" / "baseline_RL"
 OUTPUT_DIR_MODELS    = PROJECT_ROOT / "outputs" / "models"   / "baseline_RL"
@@ -60,7 +76,6 @@ RANDOM_STATE = 42
 np.random.seed(RANDOM_STATE)
 
 # Estilo de visualización
-plt.style.use("seaborn-v0_8-whitegrid")
 pd.set_option("display.max_columns", None)
 pd.set_option("display.float_format", "{:.4f}".format)
 
@@ -70,107 +85,13 @@ pd.set_option("display.float_format", "{:.4f}".format)
 
 TARGET = "target_binario"
 
-VARS_BINARIAS_T0 = [
-    "daytimeevening_attendance",
-    "displaced",
-    "educational_special_needs",
-    "gender",
-    "scholarship_holder",
-    "international",
-    "is_single",
-]
-
-VARS_BINARIAS_T1 = [
-    "debtor",
-    "tuition_fees_up_to_date",
-]
-
-VARS_NUMERICAS_T0 = [
-    "age_at_enrollment",
-    "admission_grade",
-    "previous_qualification_grade",
-]
-
-VARS_NUMERICAS_T1 = [
-    "curricular_units_1st_sem_credited",
-    "curricular_units_1st_sem_enrolled",
-    "curricular_units_1st_sem_evaluations",
-    "curricular_units_1st_sem_approved",
-    "curricular_units_1st_sem_grade",
-    "curricular_units_1st_sem_without_evaluations",
-    "unemployment_rate",
-    "inflation_rate",
-    "gdp",
-]
-
-VARS_NUMERICAS_T2 = [
-    "curricular_units_2nd_sem_credited",
-    "curricular_units_2nd_sem_enrolled",
-    "curricular_units_2nd_sem_evaluations",
-    "curricular_units_2nd_sem_approved",
-    "curricular_units_2nd_sem_grade",
-    "curricular_units_2nd_sem_without_evaluations",
-]
-
-VARS_CATEGORICAS_AGRUPADAS_T0 = [
-    "application_mode_risk",
-    "previous_qualification_risk",
-    "mothers_qualification_level",
-    "fathers_qualification_level",
-    "mothers_occupation_level",
-    "fathers_occupation_level",
-]
-
-VARS_TARGET_ENCODING_T0 = ["course"]
-
-VARS_ORDINALES_T0 = ["application_order"]
-
-VARS_T0 = (
-    VARS_BINARIAS_T0
-    + VARS_NUMERICAS_T0
-    + VARS_CATEGORICAS_AGRUPADAS_T0
-    + VARS_TARGET_ENCODING_T0
-    + VARS_ORDINALES_T0
-)
-
-VARS_T1 = VARS_T0 + VARS_BINARIAS_T1 + VARS_NUMERICAS_T1
-
-VARS_T2 = VARS_T1 + VARS_NUMERICAS_T2
+# Variables de cada fase y sus roles: src/data/fases.py
 
 
 # ==============================================================================
 # FUNCIONES DE PREPROCESAMIENTO
 # ==============================================================================
 
-def obtiene_variables_por_fase(fase: str) -> dict:
-    if fase == "T0":
-        return {
-            "binarias":        VARS_BINARIAS_T0,
-            "numericas":       VARS_NUMERICAS_T0 + VARS_ORDINALES_T0,
-            "categoricas_ohe": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":  VARS_TARGET_ENCODING_T0,
-            "todas":           VARS_T0,
-        }
-    elif fase == "T1":
-        return {
-            "binarias":        VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":       VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1,
-            "categoricas_ohe": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":  VARS_TARGET_ENCODING_T0,
-            "todas":           VARS_T1,
-        }
-    elif fase == "T2":
-        return {
-            "binarias":        VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":       VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1 + VARS_NUMERICAS_T2,
-            "categoricas_ohe": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":  VARS_TARGET_ENCODING_T0,
-            "todas":           VARS_T2,
-        }
-    else:
-        raise ValueError(f"Fase no válida: {fase}. Usar 'T0', 'T1' o 'T2'.")
-
-
 def preprocesamiento_RL(
     X_train: pd.DataFrame,
     X_test: pd.DataFrame,
@@ -178,10 +99,12 @@ def preprocesamiento_RL(
     fase: str,
 ) -> tuple:
 
-    variables_fase = obtiene_variables_por_fase(fase)
+    from category_encoders import TargetEncoder
+
+    variables_fase = especificacion(fase)
 
-    X_train_fase = X_train[variables_fase["todas"]].copy()
-    X_test_fase  = X_test[variables_fase["todas"]].copy()
+    X_train_fase = variables_fase.selecciona(X_train)
+    X_test_fase  = variables_fase.selecciona(X_test)
 
     # ------------------------------------------------------------------
     # Variables zero-inflated → transformación log1p
@@ -200,6 +123,7 @@ def preprocesamiento_RL(
 
     X_train_fase["age_at_enrollment"] = np.log1p(X_train_fase["age_at_enrollment"])
     X_test_fase["age_at_enrollment"]  = np.log1p(X_test_fase["age_at_enrollment"])
+    log1p_cols = vars_zi_fase + ["age_at_enrollment"]
 
     # ------------------------------------------------------------------
     # Target Encoding para 'course'
@@ -222,13 +146,13 @@ def preprocesamiento_RL(
     # ------------------------------------------------------------------
     X_train_fase = pd.get_dummies(
         X_train_fase,
-        columns=variables_fase["categoricas_ohe"],
+        columns=variables_fase["categoricas"],
         drop_first=True,
         dtype=int,
     )
     X_test_fase = pd.get_dummies(
         X_test_fase,
-        columns=variables_fase["categoricas_ohe"],
+        columns=variables_fase["categoricas"],
         drop_first=True,
         dtype=int,
     )
@@ -249,9 +173,11 @@ def preprocesamiento_RL(
 
     feature_names  = X_train_fase.columns.tolist()
     preprocessors  = {
-        "target_encoder": te,
-        "scaler":         scaler,
-        "feature_names":  feature_names,
+        "target_encoder":  te,
+        "scaler":          scaler,
+        "feature_names":   feature_names,
+        "categoricas_ohe": variables_fase["categoricas"],
+        "log1p_cols":      log1p_cols,
     }
 
     return X_train_fase, X_test_fase, feature_names, preprocessors
@@ -261,7 +187,7 @@ def preprocesamiento_RL(
 # FUNCIONES DE ENTRENAMIENTO
 # ==============================================================================
 
-def _ejecuta_cv(modelo_params: dict, X_train: pd.DataFrame, y_train: pd.Series,
+def _ejecuta_cv(modelo_params: dict, X_train: pd.DataFrame | MatrizFase, y_train: pd.Series,
                 cv_folds: int) -> dict:
     cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
     cv_results = {
@@ -275,10 +201,11 @@ def _ejecuta_cv(modelo_params: dict, X_train: pd.DataFrame, y_train: pd.Series,
         ]
     }
 
+    matriz = como_matriz(X_train, y_train)
     modelo = None
-    for train_idx, val_idx in cv.split(X_train, y_train):
-        X_fold_tr = X_train.iloc[train_idx];  y_fold_tr = y_train.iloc[train_idx]
-        X_fold_val = X_train.iloc[val_idx];   y_fold_val = y_train.iloc[val_idx]
+    for train_idx, val_idx in cv.split(matriz.X, matriz.y):
+        X_fold_tr,  y_fold_tr  = matriz.fold(train_idx)
+        X_fold_val, y_fold_val = matriz.fold(val_idx)
 
         modelo = LogisticRegression(**modelo_params)
         modelo.fit(X_fold_tr, y_fold_tr)
@@ -295,11 +222,65 @@ def _ejecuta_cv(modelo_params: dict, X_train: pd.DataFrame, y_train: pd.Series,
     for key in cv_results:
         cv_results[key] = np.array(cv_results[key])
 
-    return cv_results, modelo
+    return cv_results, asigna_nombres(modelo, matriz.nombres)
+
+
+# Curva de F1 de un fold a lo largo de C_range (creciente)
+def _curva_f1_fold(
+    X_ftr: np.ndarray, y_ftr: np.ndarray,
+    X_fv: np.ndarray, y_fv: np.ndarray,
+    C_range: list, params: dict, camino: bool = True,
+) -> tuple:
+    """
+    Con camino=True un único LogisticRegression(warm_start=True) recorre C
+    de menor a mayor: cada ajuste parte de los coeficientes del C anterior
+    y converge en pocas épocas. Con camino=False cada C se ajusta desde cero.
+    """
+    m = LogisticRegression(**params, warm_start=camino)
+    train_row, val_row = [], []
+    for C in C_range:
+        if not camino:
+            m = LogisticRegression(**params)
+        m.set_params(C=C).fit(X_ftr, y_ftr)
+        train_row.append(f1_score(y_ftr, m.predict(X_ftr), pos_label=1, zero_division=0))
+        val_row.append(f1_score(y_fv,  m.predict(X_fv),  pos_label=1, zero_division=0))
+    return train_row, val_row
+
+
+# F1 train/val (folds × C) de la curva de regularización, folds en paralelo
+def _f1_curva_regularizacion(
+    X_train: pd.DataFrame | MatrizFase,
+    y_train: pd.Series,
+    cv_folds: int,
+    C_range: list,
+    extra_params: dict,
+    camino: bool = True,
+) -> tuple:
+    params = {"penalty": "l2", "solver": "saga",
+              "class_weight": "balanced", "random_state": RANDOM_STATE, **extra_params}
+    orden  = np.argsort(C_range)
+    C_ord  = [C_range[i] for i in orden]
+    cv     = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
+    matriz = como_matriz(X_train, y_train)
+
+    def fold(indices):
+        train_idx, val_idx = indices
+        return _curva_f1_fold(*matriz.fold(train_idx), *matriz.fold(val_idx), C_ord, params, camino)
+
+    # saga libera el GIL: los folds avanzan en paralelo dentro del presupuesto de hilos
+    n_hilos = min(cv_folds, presupuesto_hilos().por_tarea())
+    with ThreadPoolExecutor(max_workers=n_hilos) as pool:
+        filas = list(pool.map(fold, cv.split(matriz.X, matriz.y)))
+
+    # Se restaura el orden original de C_range
+    inversa   = np.argsort(orden)
+    train_f1  = np.array([r[0] for r in filas])[:, inversa]
+    val_f1    = np.array([r[1] for r in filas])[:, inversa]
+    return train_f1, val_f1
 
 
 def _grafica_curva_regularizacion(
-    X_train: pd.DataFrame,
+    X_train: pd.DataFrame | MatrizFase,
     y_train: pd.Series,
     fase: str,
     cv_folds: int,
@@ -309,31 +290,17 @@ def _grafica_curva_regularizacion(
     output_dir: Path = OUTPUT_DIR_FIGURES,
 ) -> None:
 
-    C_range = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
-    cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
-
-    all_train_f1, all_val_f1 = [], []
+    plt = pyplot(ESTILO_GRAFICOS)
 
-    for train_idx, val_idx in cv.split(X_train, y_train):
-        X_ftr = X_train.iloc[train_idx]; y_ftr = y_train.iloc[train_idx]
-        X_fv  = X_train.iloc[val_idx];  y_fv  = y_train.iloc[val_idx]
-
-        train_row, val_row = [], []
-        for C in C_range:
-            params = {"penalty": "l2", "C": C, "solver": "saga",
-                      "class_weight": "balanced", "random_state": RANDOM_STATE, **extra_params}
-            m = LogisticRegression(**params)
-            m.fit(X_ftr, y_ftr)
-            train_row.append(f1_score(y_ftr, m.predict(X_ftr), pos_label=1, zero_division=0))
-            val_row.append(f1_score(y_fv,  m.predict(X_fv),  pos_label=1, zero_division=0))
-
-        all_train_f1.append(train_row)
-        all_val_f1.append(val_row)
+    C_range = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
+    all_train_f1, all_val_f1 = _f1_curva_regularizacion(
+        X_train, y_train, cv_folds, C_range, extra_params
+    )
 
-    train_mean = np.array(all_train_f1).mean(axis=0)
-    train_std  = np.array(all_train_f1).std(axis=0)
-    val_mean   = np.array(all_val_f1).mean(axis=0)
-    val_std    = np.array(all_val_f1).std(axis=0)
+    train_mean = all_train_f1.mean(axis=0)
+    train_std  = all_train_f1.std(axis=0)
+    val_mean   = all_val_f1.mean(axis=0)
+    val_std    = all_val_f1.std(axis=0)
 
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.plot(C_range, train_mean, label="Train F1",      color="#3498DB", linewidth=2, marker="o")
@@ -379,44 +346,6 @@ def _grafica_curva_regularizacion(
     print(f"   Figura guardada: {fig_path}")
 
 
-def resumen_cv(cv_results: dict, fase: str, modelo: str) -> pd.DataFrame:
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-    summary = {"modelo": modelo, "fase": fase}
-
-    for metric in metrics:
-        summary[f"{metric}_val_mean"]   = cv_results[f"test_{metric}"].mean()
-        summary[f"{metric}_val_std"]    = cv_results[f"test_{metric}"].std()
-        summary[f"{metric}_train_mean"] = cv_results[f"train_{metric}"].mean()
-        summary[f"{metric}_train_std"]  = cv_results[f"train_{metric}"].std()
-
-    return pd.DataFrame([summary])
-
-
-def _imprime_resumen_cv(cv_results: dict, cv_folds: int, fase: str) -> None:
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-
-    print(f"\n Resultados por fold:")
-    for i in range(cv_folds):
-        print(f"\n  Fold {i + 1}:")
-        for m in metrics:
-            print(f"    {m:<10} | Train: {cv_results[f'train_{m}'][i]:.4f} "
-                  f"| Val: {cv_results[f'test_{m}'][i]:.4f}")
-
-    print(f"\n Resumen Cross-Validation ({fase}):")
-    print(f"   {'Métrica':<12} {'Train Mean':>12} {'Train Std':>12} {'Val Mean':>12} {'Val Std':>12}")
-    print(f"   {'-' * 60}")
-    for m in metrics:
-        marker = " ****" if m == "f1" else ""
-        print(
-            f"   {m:<12} "
-            f"{cv_results[f'train_{m}'].mean():>12.4f} "
-            f"{cv_results[f'train_{m}'].std():>12.4f} "
-            f"{cv_results[f'test_{m}'].mean():>12.4f} "
-            f"{cv_results[f'test_{m}'].std():>12.4f}"
-            f"{marker}"
-        )
-
-
 # ==============================================================================
 # ENTRENAMIENTO BASELINE (parámetros por defecto)
 # ==============================================================================
@@ -427,7 +356,10 @@ def entrena_RL(
     fase: str,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
 ) -> dict:
+    import mlflow
+
     mlflow.end_run()
 
     print("===========================================================================================")
@@ -446,28 +378,33 @@ def entrena_RL(
         "random_state": RANDOM_STATE,
     }
 
-    cv_results, modelo = _ejecuta_cv(modelo_params, X_train, y_train, cv_folds)
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
+    matriz = como_matriz(X_train, y_train)
+    with etapa("cv", fase=fase):
+        cv_results, modelo = _ejecuta_cv(modelo_params, matriz, y_train, cv_folds)
+    imprime_resumen_cv(cv_results, cv_folds, fase)
 
     # Curva de regularización
-    _grafica_curva_regularizacion(
-        X_train, y_train, fase, cv_folds,
-        extra_params={"max_iter": 1000},
-        tag_optimizado=False,
-        output_dir=output_dir_figures,
-    )
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_regularizacion(
+                matriz, y_train, fase, cv_folds,
+                extra_params={"max_iter": 1000},
+                tag_optimizado=False,
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
     mlflow.set_experiment("TFM_Dropout_Prediction")
-    with mlflow.start_run(run_name=f"NoOpt_RegresionLogistica_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Baseline - Params por default")
-        mlflow.set_tag("tipo", "Validación cruzada")
-        mlflow.log_params(modelo.get_params())
-        mlflow.log_param("cv_folds",    cv_folds)
-        mlflow.log_param("n_features",  X_train.shape[1])
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"NoOpt_RegresionLogistica_CV5_{fase}") as run:
+            run.set_tag("modelo", "Baseline - Params por default")
+            run.set_tag("tipo", "Validación cruzada")
+            run.log_params(modelo.get_params())
+            run.log_param("cv_folds",    cv_folds)
+            run.log_param("n_features",  X_train.shape[1])
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "fase":       fase,
@@ -488,8 +425,18 @@ def entrena_RL_con_optuna(
     n_trials: int = 25,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    output_dir_models: Path = OUTPUT_DIR_MODELS,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    trials_paralelos: int = 1,
+    checkpoints: Checkpoints | None = None,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
+    output_dir_optuna: Path = OPTUNA_DIR,
 ) -> dict:
 
+    import optuna
+
     print("===========================================================================================")
     print(f"  OPTIMIZACIÓN REGRESIÓN LOGÍSTICA CON OPTUNA - FASE {fase}")
     print("===========================================================================================")
@@ -501,6 +448,12 @@ def entrena_RL_con_optuna(
     # ------------------------------------------------------------------
     # Función objetivo
     # ------------------------------------------------------------------
+    # Cada fold se ajusta desde cero, igual que el refit final: arrancar desde
+    # la solución de otro trial haría que el F1 (y el efecto de max_iter)
+    # dependiera del orden de los trials. El camino con warm_start queda
+    # solo para la curva de regularización.
+    matriz = como_matriz(X_train, y_train)
+
     def objective(trial):
         params = {
             "penalty":      "l2",
@@ -510,30 +463,65 @@ def entrena_RL_con_optuna(
             "max_iter":     trial.suggest_int("max_iter", 500, 2000),
             "random_state": RANDOM_STATE,
         }
+        def f1_fold(tr_idx, val_idx):
+            m = LogisticRegression(**params).fit(*matriz.fold(tr_idx))
+            X_fv, y_fv = matriz.fold(val_idx)
+            return f1_score(y_fv, m.predict(X_fv), pos_label=1, zero_division=0)
+
+        if multifidelidad:
+            return evalua_multifidelidad(trial, f1_fold, y_train, cv_folds)
+
         cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
-        scores = []
-        for tr_idx, val_idx in cv.split(X_train, y_train):
+        scores, tiempos = [], []
+        for tr_idx, val_idx in cv.split(matriz.X, matriz.y):
+            t_fold = time.perf_counter()
             try:
-                m = LogisticRegression(**params)
-                m.fit(X_train.iloc[tr_idx], y_train.iloc[tr_idx])
-                scores.append(
-                    f1_score(y_train.iloc[val_idx], m.predict(X_train.iloc[val_idx]),
-                             pos_label=1, zero_division=0)
-                )
+                scores.append(f1_fold(tr_idx, val_idx))
             except Exception:
                 return 0.0
+            tiempos.append(time.perf_counter() - t_fold)
+        trial.set_user_attr("f1_folds", [float(s) for s in scores])
+        trial.set_user_attr("tiempos_folds_s", tiempos)
         return float(np.mean(scores))
 
     optuna.logging.set_verbosity(optuna.logging.CRITICAL)
-    study = optuna.create_study(
-        direction="maximize",
-        study_name=f"F1-score_{fase}",
-        sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+    if checkpoints is None:
+        checkpoints = Checkpoints(None, "RL")
+
+    # El estudio solo está disponible si la optimización se ejecuta en esta llamada
+    study = None
+
+    def _optimiza():
+        nonlocal study
+        study = crea_estudio(
+            study_name=f"F1-score_{fase}",
+            sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+            models_dir=output_dir_models,
+            fase=fase,
+            arranque_caliente=arranque_caliente,
+            top_k=top_k_historico,
+            pruner=crea_pruner() if multifidelidad else None,
+        )
+        telemetria = TelemetriaOptuna("RL", fase, output_dir_optuna)
+        with etapa("optuna", fase=fase), presupuesto_hilos().limita(trials_paralelos):
+            study.optimize(
+                instrumenta_objetivo(objective, fase=fase),
+                n_trials=n_trials, n_jobs=trials_paralelos, show_progress_bar=False,
+                callbacks=[telemetria],
+            )
+        return {"best_params": study.best_params, "best_value": study.best_value,
+                "telemetria": telemetria}
+
+    optimizacion = checkpoints.ejecuta(
+        fase, "optuna", (
+            X_train, y_train, n_trials, cv_folds, arranque_caliente, top_k_historico,
+            multifidelidad
+        ),
+        _optimiza,
     )
-    study.optimize(objective, n_trials=n_trials, show_progress_bar=False)
-
-    best_params    = study.best_params
-    best_f1_cv     = study.best_value
+    telemetria     = optimizacion["telemetria"]
+    best_params    = optimizacion["best_params"]
+    best_f1_cv     = optimizacion["best_value"]
 
     print(f"\n{'===========================================================================================' }")
     print(f"  MEJORES HIPERPARÁMETROS  —  F1-CV: {best_f1_cv:.4f}")
@@ -553,34 +541,42 @@ def entrena_RL_con_optuna(
         "random_state": RANDOM_STATE,
     }
 
-    cv_results, modelo_final = _ejecuta_cv(final_params, X_train, y_train, cv_folds)
+    with etapa("refit_final", fase=fase):
+        cv_results, modelo_final = checkpoints.ejecuta(
+            fase, "refit_final", (sin_hilos(final_params), X_train, y_train, cv_folds),
+            _ejecuta_cv, final_params, matriz, y_train, cv_folds,
+        )
 
     print(f"\n{'==========================================================================================='}")
     print(f"  RESUMEN CROSS-VALIDATION (Optimizado) — FASE {fase}")
     print(f"{'==========================================================================================='}")
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
+    imprime_resumen_cv(cv_results, cv_folds, fase)
 
     # Curva de regularización post-optimización
-    _grafica_curva_regularizacion(
-        X_train, y_train, fase, cv_folds,
-        extra_params={"max_iter": best_params["max_iter"]},
-        tag_optimizado=True,
-        best_C_optuna=best_params["C"],
-        output_dir=output_dir_figures,
-    )
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_regularizacion(
+                matriz, y_train, fase, cv_folds,
+                extra_params={"max_iter": best_params["max_iter"]},
+                tag_optimizado=True,
+                best_C_optuna=best_params["C"],
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
-    with mlflow.start_run(run_name=f"Optuna_RegresionLogistica_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Baseline - Optimizado_Optuna")
-        mlflow.set_tag("tipo",   "Validacion cruzada")
-        mlflow.log_params(modelo_final.get_params())
-        mlflow.log_param("n_trials",   n_trials)
-        mlflow.log_param("cv_folds",   cv_folds)
-        mlflow.log_param("n_features", X_train.shape[1])
-        mlflow.log_metric("optuna_best_f1_cv", round(best_f1_cv, 4))
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"Optuna_RegresionLogistica_CV5_{fase}") as run:
+            run.set_tag("modelo", "Baseline - Optimizado_Optuna")
+            run.set_tag("tipo",   "Validacion cruzada")
+            run.log_params(modelo_final.get_params())
+            run.log_param("n_trials",   n_trials)
+            run.log_param("cv_folds",   cv_folds)
+            run.log_param("n_features", X_train.shape[1])
+            run.log_metric("optuna_best_f1_cv", round(best_f1_cv, 4))
+            telemetria.registra(run)
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "fase":           fase,
@@ -600,17 +596,35 @@ def modelado_baseline_RL(
     input_path: str | None = None,
     output_dir_figures: str | None = None,
     output_dir_models: str | None = None,
+    models_dir_arranque: str | None = None,
     mlruns_dir: str | None = None,
     n_trials: int = 25,
     cv_folds: int = 5,
     verbose: bool = True,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    exporta_onnx: bool = False,
+    hilos: int | None = None,
+    trials_paralelos: int | None = None,
+    usa_checkpoints: bool = True,
+    modo_curvas: str | None = None,
+    fases: list | None = None,
 ) -> None:
+    import mlflow
+
     # ------------------------------------------------------------------
     # Resolución de rutas
     # ------------------------------------------------------------------
     data_path   = Path(input_path)         if input_path         else DATA_PROCESSED_PATH
     fig_dir     = Path(output_dir_figures) if output_dir_figures else OUTPUT_DIR_FIGURES
     models_dir  = Path(output_dir_models)  if output_dir_models  else OUTPUT_DIR_MODELS
+    # Estudios Optuna y best_params_cv.json previos (arranque en caliente);
+    # el orquestador pasa el directorio de la familia
+    arranque_dir = Path(models_dir_arranque) if models_dir_arranque else models_dir
+    # Tabla de trials junto a los modelos si se redirige --models (orquestador,
+    # benchmarks); outputs/optuna solo para la ejecución por defecto
+    optuna_dir   = models_dir / "optuna" if output_dir_models else OPTUNA_DIR
     _mlruns_path = Path(mlruns_dir).resolve() if mlruns_dir else MLRUNS_DIR.resolve()
     mlruns_uri   = _mlruns_path.as_uri()   # → file:///C:/... en Windows, file:///home/... en Linux
 
@@ -632,6 +646,21 @@ def modelado_baseline_RL(
         print(f"  Experiment ID  : {experiment.experiment_id if experiment else 'Nuevo'}")
         print(f"\n  Para visualizar resultados:\n    mlflow ui --port 5000")
 
+    fases  = list(fases) if fases else ["T0", "T1", "T2"]
+    sufijo = "" if fases == ["T0", "T1", "T2"] else "_" + "_".join(fases)
+    inicia_instrumentacion(f"modelado_RL{sufijo}")
+
+    presupuesto = configura_presupuesto_hilos(hilos, trials_paralelos)
+    presupuesto.aplica()
+    if verbose:
+        print(f"\n  Presupuesto de hilos : {presupuesto.total} "
+              f"({presupuesto.trials_paralelos} trial(s) en paralelo × "
+              f"{presupuesto.por_tarea(presupuesto.trials_paralelos)} hilos)")
+
+    modo_curvas = resuelve_modo_curvas(modo_curvas)
+    if verbose:
+        print(f"  Curvas de aprendizaje: {modo_curvas}")
+
     # ------------------------------------------------------------------
     # 1. Carga de datos
     # ------------------------------------------------------------------
@@ -640,9 +669,11 @@ def modelado_baseline_RL(
         print("  1. CARGA DE DATOS PREPROCESADOS")
         print("===========================================================================================")
 
-    df = pd.read_csv(data_path)
+    with etapa("carga"):
+        df = lee_csv(data_path)
     if verbose:
         print(f"\n  Dataset cargado: {df.shape[0]} filas × {df.shape[1]} columnas")
+        print(f"  Memoria en RAM  : {df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB")
         print(f"\n  Target binario:")
         print(df[TARGET].value_counts().to_string())
         ratio = df[TARGET].value_counts()[0] / df[TARGET].value_counts()[1]
@@ -685,39 +716,72 @@ def modelado_baseline_RL(
     # 4-7. Loop por fase: preprocesamiento → baseline → optuna → guardado
     # ------------------------------------------------------------------
     csv_path = models_dir / "cv_summary_RL.csv"
-    df_acumulado = pd.DataFrame()
+    registro     = RegistroResultados(models_dir / "folds_cv_RL.csv")
+    checkpoints  = Checkpoints(
+        models_dir / DIRECTORIO_CHECKPOINTS if usa_checkpoints else None, "RL", verbose=verbose
+    )
+    df_onnx      = []
 
-    for fase in ["T0", "T1", "T2"]:
+    for fase in fases:
         if verbose:
             print("\n" + "===========================================================================================")
             print(f"  FASE {fase}")
             print("===========================================================================================")
 
         # Preprocesamiento
-        X_tr, X_te, features, prep = preprocesamiento_RL(X_train, X_test, y_train, fase)
+        with etapa("preprocesamiento", fase=fase):
+            X_tr, X_te, features, prep = preprocesamiento_RL(X_train, X_test, y_train, fase)
 
         if verbose:
             print(f"\n  Dimensiones post-preprocesamiento:")
             print(f"    Train : {X_tr.shape}  |  Test: {X_te.shape}  |  Features: {len(features)}")
 
         # --- Baseline ---
-        results_base = entrena_RL(X_tr, y_train, fase, cv_folds, fig_dir)
+        results_base = checkpoints.ejecuta(
+            fase, "baseline", (X_tr, y_train, cv_folds),
+            entrena_RL, X_tr, y_train, fase, cv_folds, fig_dir, modo_curvas,
+        )
 
-        df_base = resumen_cv(results_base["cv_results"], fase, "RegresionLogistica")
-        df_acumulado = pd.concat([df_acumulado, df_base], ignore_index=True)
-        df_acumulado.to_csv(csv_path, index=False)
+        df_base = tabla_folds(results_base["cv_results"], fase, "RegresionLogistica")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_base)
 
         # --- Optuna ---
-        results_opt = entrena_RL_con_optuna(X_tr, y_train, fase, n_trials, cv_folds, fig_dir)
+        results_opt = entrena_RL_con_optuna(
+            X_tr, y_train, fase, n_trials, cv_folds, fig_dir,
+            arranque_dir, arranque_caliente, top_k_historico, multifidelidad,
+            trials_paralelos=presupuesto.trials_paralelos,
+            checkpoints=checkpoints,
+            modo_curvas=modo_curvas,
+            output_dir_optuna=optuna_dir,
+        )
+        guarda_best_params(models_dir, fase, results_opt["best_params"])
 
         if verbose:
             print(f"\n  Comparación F1-score — {fase}:")
             print(f"    Baseline : {results_base['cv_results']['test_f1'].mean():.4f}")
             print(f"    Optuna   : {results_opt['best_f1_sore_cv']:.4f}")
 
-        df_opt = resumen_cv(results_opt["cv_results"], fase, "RegresionLogistica_opt")
-        df_acumulado = pd.concat([df_acumulado, df_opt], ignore_index=True)
-        df_acumulado.to_csv(csv_path, index=False)
+        df_opt = tabla_folds(results_opt["cv_results"], fase, "RegresionLogistica_opt")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_opt)
+
+        # --- Exportación ONNX (opcional) ---
+        if exporta_onnx:
+            from src.models.onnx_export import exporta_y_valida_onnx
+            df_onnx.append(exporta_y_valida_onnx(
+                results_opt["model"], prep, "RL", fase,
+                especificacion(fase).selecciona(X_test), X_te, models_dir / "onnx",
+            ))
+
+    with etapa("guardado"):
+        df_final = resume(registro.resultados())
+        df_final.to_csv(csv_path, index=False)
+
+    if exporta_onnx and df_onnx:
+        csv_path_onnx = models_dir / "onnx" / "onnx_latencia_RL.csv"
+        pd.concat(df_onnx, ignore_index=True).to_csv(csv_path_onnx, index=False)
+        print(f"\n  Comparación de latencia ONNX guardada en: {csv_path_onnx}")
 
     # ------------------------------------------------------------------
     # 8. Resumen final
@@ -725,10 +789,11 @@ def modelado_baseline_RL(
     print("\n" + "===========================================================================================")
     print("  RESUMEN FINAL — REGRESIÓN LOGÍSTICA (CROSS-VALIDATION)")
     print("===========================================================================================")
-    df_final = pd.read_csv(csv_path)
     print(df_final.to_string(index=False))
     print(f"\n  Resultados guardados en: {csv_path}")
 
+    finaliza_registro_mlflow(verbose=verbose)
+    finaliza_instrumentacion(mlruns_uri, verbose=verbose)
 
 
 # Funcion principal
@@ -778,6 +843,47 @@ def main():
         action="store_true",
         help="Ejecutar sin mensajes de progreso",
     )
+    parser.add_argument(
+        "--arranque-caliente",
+        action="store_true",
+        help="Encola best_params_cv.json (y el top-k histórico) como primeros trials",
+    )
+    parser.add_argument(
+        "--top-k-historico",
+        type=int, default=0,
+        help="Trials históricos a encolar con --arranque-caliente (default: 0)",
+    )
+    parser.add_argument(
+        "--multifidelidad",
+        action="store_true",
+        help="Evalúa los trials por rungs (submuestras y menos folds) con Hyperband",
+    )
+    parser.add_argument(
+        "--exporta-onnx",
+        action="store_true",
+        help="Exporta el modelo optimizado de cada fase a ONNX y compara latencia con ONNX Runtime",
+    )
+    parser.add_argument(
+        "--sin-checkpoints",
+        action="store_true",
+        help="Recalcula todos los pasos sin leer ni escribir checkpoints",
+    )
+    parser.add_argument(
+        "--hilos",
+        type=int, default=None,
+        help="Núcleos del proceso (default: THREAD_BUDGET de config, 0 = todos)",
+    )
+    parser.add_argument(
+        "--trials-paralelos",
+        type=int, default=None,
+        help="Trials de Optuna concurrentes (default: OPTUNA_PARALLEL_TRIALS de config)",
+    )
+    parser.add_argument(
+        "--curvas",
+        choices=MODOS_CURVAS, default=None,
+        help="Curva de regularización: completa/perezosa la calculan, ninguna la omite "
+             "(default: CURVE_MODE del entorno o completa)",
+    )
 
     args = parser.parse_args()
 
@@ -789,6 +895,14 @@ def main():
         n_trials=args.n_trials,
         cv_folds=args.cv_folds,
         verbose=not args.quiet,
+        arranque_caliente=args.arranque_caliente,
+        top_k_historico=args.top_k_historico,
+        multifidelidad=args.multifidelidad,
+        exporta_onnx=args.exporta_onnx,
+        hilos=args.hilos,
+        trials_paralelos=args.trials_paralelos,
+        usa_checkpoints=not args.sin_checkpoints,
+        modo_curvas=args.curvas,
     )
 
     print("\n" + "===========================================================================================")
@@ -5,10 +5,8 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import sys
+import time
 import argparse
 import warnings
 warnings.filterwarnings("ignore")
@@ -19,25 +17,14 @@ from pathlib import Path
 from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import LabelEncoder
 
-# Modelo
-import lightgbm as lgb
-from lightgbm import LGBMClassifier
-
 # Métricas
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
     roc_auc_score
 )
 
-# Encoders
-from category_encoders import TargetEncoder
-
-# Optimización
-import optuna
-
-# MLflow
-import mlflow
-import mlflow.sklearn
+# matplotlib, optuna, mlflow, category_encoders y lightgbm se importan en las
+# funciones que los usan: --help y el orquestador no pagan su carga
 
 # ==============================================================================
 # CONFIGURACIÓN DE RUTAS
@@ -46,10 +33,36 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.data.esquema import lee_csv
+from src.data.fases import VARS_T0, VARS_T1, VARS_T2, especificacion
+from src.models.arranque_optuna import crea_estudio, guarda_best_params
+from src.models.curvas_staged import (
+    MODO_CURVAS_DEFECTO, MODOS_CURVAS, curva_train, resuelve_modo_curvas,
+)
+from src.models.incremental import ajusta_con_margen, margen_bruto, selecciona, sigmoide
+from src.models.matrices import MatrizFase, asigna_nombres, como_matriz
+from src.models.multifidelidad import crea_pruner, evalua_multifidelidad
+from src.utils.checkpoints import (
+    DIRECTORIO_CHECKPOINTS,
+    Checkpoints,
+    RegistroResultados,
+    sin_hilos,
+)
+from src.utils.graficos import ESTILO_GRAFICOS, pyplot
+from src.utils.hilos import configura_presupuesto_hilos, presupuesto_hilos
+from src.utils.instrumentacion import (
+    etapa,
+    finaliza_instrumentacion,
+    inicia_instrumentacion,
+    instrumenta_objetivo,
+)
+from src.utils.mlflow_asincrono import finaliza_registro_mlflow, registro_mlflow
+from src.utils.reporte_cv import imprime_resumen_cv, resume, tabla_folds
+from src.utils.telemetria_optuna import OPTUNA_DIR, TelemetriaOptuna
+
 DATA_PROCESSED_PATH      = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
 OUTPUT_DIR_FIGURES       = PROJECT_ROOT / "outputs" / "figures" / "modelado" / "LightGBM"
 OUTPUT_DIR_MODELS        = PROJECT_ROOT / "outputs" / "models"  / "LightGBM"
-OUTPUT_DIR_MODELS_GLOBAL = PROJECT_ROOT / "outputs" / "models"
 MLRUNS_DIR               = PROJECT_ROOT / "mlruns"
 
 # Semilla global
@@ -57,7 +70,6 @@ RANDOM_STATE = 42
 np.random.seed(RANDOM_STATE)
 
 # Estilo de visualización
-plt.style.use("seaborn-v0_8-whitegrid")
 pd.set_option("display.max_columns", None)
 pd.set_option("display.float_format", "{:.4f}".format)
 
@@ -67,108 +79,13 @@ pd.set_option("display.float_format", "{:.4f}".format)
 
 TARGET = "target_binario"
 
-VARS_BINARIAS_T0 = [
-    "daytimeevening_attendance",
-    "displaced",
-    "educational_special_needs",
-    "gender",
-    "scholarship_holder",
-    "international",
-    "is_single",
-]
-
-VARS_BINARIAS_T1 = [
-    "debtor",
-    "tuition_fees_up_to_date",
-]
-
-VARS_NUMERICAS_T0 = [
-    "age_at_enrollment",
-    "admission_grade",
-    "previous_qualification_grade",
-]
-
-VARS_NUMERICAS_T1 = [
-    "curricular_units_1st_sem_credited",
-    "curricular_units_1st_sem_enrolled",
-    "curricular_units_1st_sem_evaluations",
-    "curricular_units_1st_sem_approved",
-    "curricular_units_1st_sem_grade",
-    "curricular_units_1st_sem_without_evaluations",
-    "unemployment_rate",
-    "inflation_rate",
-    "gdp",
-]
-
-VARS_NUMERICAS_T2 = [
-    "curricular_units_2nd_sem_credited",
-    "curricular_units_2nd_sem_enrolled",
-    "curricular_units_2nd_sem_evaluations",
-    "curricular_units_2nd_sem_approved",
-    "curricular_units_2nd_sem_grade",
-    "curricular_units_2nd_sem_without_evaluations",
-]
-
-VARS_CATEGORICAS_AGRUPADAS_T0 = [
-    "application_mode_risk",
-    "previous_qualification_risk",
-    "mothers_qualification_level",
-    "fathers_qualification_level",
-    "mothers_occupation_level",
-    "fathers_occupation_level",
-]
-
-VARS_TARGET_ENCODING_T0 = ["course"]
-
-VARS_ORDINALES_T0 = ["application_order"]
-
-VARS_T0 = (
-    VARS_BINARIAS_T0
-    + VARS_NUMERICAS_T0
-    + VARS_CATEGORICAS_AGRUPADAS_T0
-    + VARS_TARGET_ENCODING_T0
-    + VARS_ORDINALES_T0
-)
-
-VARS_T1 = VARS_T0 + VARS_BINARIAS_T1 + VARS_NUMERICAS_T1
-
-VARS_T2 = VARS_T1 + VARS_NUMERICAS_T2
+# Variables de cada fase y sus roles: src/data/fases.py
 
 
 # ==============================================================================
 # FUNCIONES DE PREPROCESAMIENTO
 # ==============================================================================
 
-def obtiene_variables_por_fase(fase: str) -> dict:
-
-    if fase == "T0":
-        return {
-            "binarias":       VARS_BINARIAS_T0,
-            "numericas":      VARS_NUMERICAS_T0 + VARS_ORDINALES_T0,
-            "categoricas_le": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te": VARS_TARGET_ENCODING_T0,
-            "all":            VARS_T0,
-        }
-    elif fase == "T1":
-        return {
-            "binarias":       VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":      VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1,
-            "categoricas_le": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te": VARS_TARGET_ENCODING_T0,
-            "all":            VARS_T1,
-        }
-    elif fase == "T2":
-        return {
-            "binarias":       VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":      VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1 + VARS_NUMERICAS_T2,
-            "categoricas_le": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te": VARS_TARGET_ENCODING_T0,
-            "all":            VARS_T2,
-        }
-    else:
-        raise ValueError(f"Fase no válida: {fase}. Usar 'T0', 'T1' o 'T2'.")
-
-
 def preprocesamiento_LightGBM(
     X_train: pd.DataFrame,
     X_test: pd.DataFrame,
@@ -176,10 +93,12 @@ def preprocesamiento_LightGBM(
     fase: str,
 ) -> tuple:
 
-    variables_fase = obtiene_variables_por_fase(fase)
+    from category_encoders import TargetEncoder
+
+    variables_fase = especificacion(fase)
 
-    X_train_fase = X_train[variables_fase["all"]].copy()
-    X_test_fase  = X_test[variables_fase["all"]].copy()
+    X_train_fase = variables_fase.selecciona(X_train)
+    X_test_fase  = variables_fase.selecciona(X_test)
 
     label_encoders = {}
 
@@ -197,7 +116,7 @@ def preprocesamiento_LightGBM(
     # ------------------------------------------------------------------
     # 2. Label Encoding para categóricas agrupadas
     # ------------------------------------------------------------------
-    for col in variables_fase["categoricas_le"]:
+    for col in variables_fase["categoricas"]:
         le = LabelEncoder()
         X_train_fase[col] = le.fit_transform(X_train_fase[col].astype(str))
         X_test_fase[col]  = le.transform(X_test_fase[col].astype(str))
@@ -224,12 +143,15 @@ def _calcula_scale_pos_weight(y_train: pd.Series) -> float:
 
 def _ejecuta_cv_LightGBM(
     modelo_params: dict,
-    X_train: pd.DataFrame,
+    X_train: pd.DataFrame | MatrizFase,
     y_train: pd.Series,
     cv_folds: int,
-    registra_losses: bool = True,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
+    margen_inicial: np.ndarray | None = None,
 ) -> tuple:
 
+    from lightgbm import LGBMClassifier
+
     cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
     cv_results = {
         k: []
@@ -243,28 +165,35 @@ def _ejecuta_cv_LightGBM(
     }
     train_losses, val_losses = [], []
     modelo = None
+    matriz = como_matriz(X_train, y_train)
+    margen_oof = np.zeros(len(matriz))
 
-    for train_idx, val_idx in cv.split(X_train, y_train):
-        X_ftr = X_train.iloc[train_idx]; y_ftr = y_train.iloc[train_idx]
-        X_fv  = X_train.iloc[val_idx];  y_fv  = y_train.iloc[val_idx]
+    for train_idx, val_idx in cv.split(matriz.X, matriz.y):
+        X_ftr, y_ftr = matriz.fold(train_idx)
+        X_fv,  y_fv  = matriz.fold(val_idx)
+        m_ftr = selecciona(margen_inicial, train_idx)
+        m_fv  = selecciona(margen_inicial, val_idx)
 
         modelo = LGBMClassifier(**modelo_params)
-
-        if registra_losses:
-            modelo.fit(
-                X_ftr, y_ftr,
-                eval_set=[(X_ftr, y_ftr), (X_fv, y_fv)],
-                eval_names=["train", "validation"],
-                callbacks=[lgb.log_evaluation(period=0)],
+        if modo_curvas == "ninguna":
+            ajusta_con_margen(modelo, X_ftr, y_ftr, m_ftr, feature_name=matriz.nombres)
+        else:
+            # Durante el ajuste solo se evalúa el fold de validación; la curva
+            # de train se reconstruye después por predicción staged
+            ajusta_con_margen(
+                modelo, X_ftr, y_ftr, m_ftr, [m_fv],
+                eval_set=[(X_fv, y_fv)],
+                eval_names=["validation"],
+                feature_name=matriz.nombres,
             )
-            train_losses.append(modelo.evals_result_["train"]["binary_logloss"])
             val_losses.append(modelo.evals_result_["validation"]["binary_logloss"])
-        else:
-            modelo.fit(X_ftr, y_ftr)
+            train_losses.append(curva_train(modelo, X_ftr, y_ftr, m_ftr, modo_curvas))
 
-        for split_name, X_s, y_s in [("train", X_ftr, y_ftr), ("test", X_fv, y_fv)]:
-            y_pred  = modelo.predict(X_s)
-            y_proba = modelo.predict_proba(X_s)[:, 1]
+        margen_oof[val_idx] = margen_bruto(modelo, X_fv, m_fv)
+
+        for split_name, X_s, y_s, m_s in [("train", X_ftr, y_ftr, m_ftr), ("test", X_fv, y_fv, m_fv)]:
+            y_proba = sigmoide(margen_bruto(modelo, X_s, m_s))
+            y_pred  = (y_proba >= 0.5).astype(int)
             cv_results[f"{split_name}_accuracy"].append(accuracy_score(y_s, y_pred))
             cv_results[f"{split_name}_precision"].append(
                 precision_score(y_s, y_pred, pos_label=1, zero_division=0))
@@ -276,8 +205,9 @@ def _ejecuta_cv_LightGBM(
 
     for key in cv_results:
         cv_results[key] = np.array(cv_results[key])
+    cv_results["margen_oof"] = margen_oof
 
-    return cv_results, modelo, train_losses, val_losses
+    return cv_results, asigna_nombres(modelo, matriz.nombres), train_losses, val_losses
 
 
 def _grafica_curva_perdida(
@@ -289,6 +219,8 @@ def _grafica_curva_perdida(
     output_dir: Path = OUTPUT_DIR_FIGURES,
 ) -> None:
 
+    plt = pyplot(ESTILO_GRAFICOS)
+
     min_len   = min(len(l) for l in train_losses)
     train_arr = np.array([l[:min_len] for l in train_losses])
     val_arr   = np.array([l[:min_len] for l in val_losses])
@@ -337,46 +269,6 @@ def _grafica_curva_perdida(
           f"Gap: {gap:.4f}")
 
 
-def resumen_cv(cv_results: dict, fase: str, modelo: str) -> pd.DataFrame:
-
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-    summary = {"modelo": modelo, "fase": fase}
-
-    for metric in metrics:
-        summary[f"{metric}_val_mean"]   = cv_results[f"test_{metric}"].mean()
-        summary[f"{metric}_val_std"]    = cv_results[f"test_{metric}"].std()
-        summary[f"{metric}_train_mean"] = cv_results[f"train_{metric}"].mean()
-        summary[f"{metric}_train_std"]  = cv_results[f"train_{metric}"].std()
-
-    return pd.DataFrame([summary])
-
-# Imprime tabla de métricas train/val por fold y su resumen
-def _imprime_resumen_cv(cv_results: dict, cv_folds: int, fase: str) -> None:
-    
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-
-    print(f"\n Resultados por fold:")
-    for i in range(cv_folds):
-        print(f"\n  Fold {i + 1}:")
-        for m in metrics:
-            print(f"    {m:<10} | Train: {cv_results[f'train_{m}'][i]:.4f} "
-                  f"| Val: {cv_results[f'test_{m}'][i]:.4f}")
-
-    print(f"\n Resumen Cross-Validation ({fase}):")
-    print(f"   {'Métrica':<12} {'Train Mean':>12} {'Train Std':>12} {'Val Mean':>12} {'Val Std':>12}")
-    print(f"   {'---------------------------------------------------------------------------------'}")
-    for m in metrics:
-        marker = " ****" if m == "f1" else ""
-        print(
-            f"   {m:<12} "
-            f"{cv_results[f'train_{m}'].mean():>12.4f} "
-            f"{cv_results[f'train_{m}'].std():>12.4f} "
-            f"{cv_results[f'test_{m}'].mean():>12.4f} "
-            f"{cv_results[f'test_{m}'].std():>12.4f}"
-            f"{marker}"
-        )
-
-
 # ==============================================================================
 # ENTRENAMIENTO CON PARÁMETROS POR DEFECTO
 # ==============================================================================
@@ -387,6 +279,7 @@ def entrena_LightGBM(
     fase: str,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
 ) -> dict:
     """
     Entrena LightGBM con parámetros por defecto + Cross-Validation.
@@ -398,11 +291,14 @@ def entrena_LightGBM(
     fase               : str
     cv_folds           : int
     output_dir_figures : Path
+    modo_curvas        : str ("completa", "perezosa" o "ninguna")
 
     Retorna
     -------
     dict con claves: 'phase', 'model', 'n_features', 'cv_results'
     """
+    import mlflow
+
     mlflow.end_run()
 
     scale_pos_weight = _calcula_scale_pos_weight(y_train)
@@ -432,31 +328,35 @@ def entrena_LightGBM(
         "metric":           "binary_logloss",
         "boosting_type":    "gbdt",
         "random_state":     RANDOM_STATE,
-        "n_jobs":           -1,
+        **presupuesto_hilos().hilos_modelo("LightGBM"),
         "verbose":          -1,
     }
 
-    cv_results, modelo, train_losses, val_losses = _ejecuta_cv_LightGBM(
-        modelo_params, X_train, y_train, cv_folds, registra_losses=True
-    )
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
-    _grafica_curva_perdida(
-        train_losses, val_losses, fase, cv_folds,
-        tag_optimizado=False,
-        output_dir=output_dir_figures,
-    )
+    with etapa("cv", fase=fase):
+        cv_results, modelo, train_losses, val_losses = _ejecuta_cv_LightGBM(
+            modelo_params, como_matriz(X_train, y_train), y_train, cv_folds, modo_curvas=modo_curvas
+        )
+    imprime_resumen_cv(cv_results, cv_folds, fase)
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_perdida(
+                train_losses, val_losses, fase, cv_folds,
+                tag_optimizado=False,
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
     mlflow.set_experiment("TFM_Dropout_Prediction")
-    with mlflow.start_run(run_name=f"LightGBM_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Params por default")
-        mlflow.set_tag("tipo",   "Validacion cruzada")
-        mlflow.log_params(modelo.get_params())
-        mlflow.log_param("cv_folds",   cv_folds)
-        mlflow.log_param("n_features", X_train.shape[1])
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"LightGBM_CV5_{fase}") as run:
+            run.set_tag("modelo", "Params por default")
+            run.set_tag("tipo",   "Validacion cruzada")
+            run.log_params(modelo.get_params())
+            run.log_param("cv_folds",   cv_folds)
+            run.log_param("n_features", X_train.shape[1])
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "phase":      fase,
@@ -477,8 +377,21 @@ def entrena_LightGBM_con_optuna(
     n_trials: int = 50,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    output_dir_models: Path = OUTPUT_DIR_MODELS,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    margen_inicial: np.ndarray | None = None,
+    params_previos: dict | None = None,
+    trials_paralelos: int = 1,
+    checkpoints: Checkpoints | None = None,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
+    output_dir_optuna: Path = OPTUNA_DIR,
 ) -> dict:
 
+    import optuna
+    from lightgbm import LGBMClassifier
+
     scale_pos_weight = _calcula_scale_pos_weight(y_train)
 
     print("================================================================================================")
@@ -490,6 +403,8 @@ def entrena_LightGBM_con_optuna(
     print(f"  Métrica a optimizar    : F1-score (clase Dropout = 1)")
     print(f"  scale_pos_weight base  : {scale_pos_weight:.2f}")
 
+    matriz = como_matriz(X_train, y_train)
+
     # ------------------------------------------------------------------
     # Función objetivo
     # ------------------------------------------------------------------
@@ -509,33 +424,71 @@ def entrena_LightGBM_con_optuna(
             "objective":         "binary",
             "metric":            "binary_logloss",
             "random_state":      RANDOM_STATE,
-            "n_jobs":            -1,
+            **presupuesto_hilos().hilos_modelo("LightGBM", trials_paralelos),
             "verbose":           -1,
         }
+        def f1_fold(tr_idx, val_idx):
+            m = LGBMClassifier(**params)
+            ajusta_con_margen(m, *matriz.fold(tr_idx), selecciona(margen_inicial, tr_idx))
+            X_fv, y_fv = matriz.fold(val_idx)
+            y_pred = margen_bruto(m, X_fv, selecciona(margen_inicial, val_idx)) > 0
+            return f1_score(y_fv, y_pred, pos_label=1, zero_division=0)
+
+        if multifidelidad:
+            return evalua_multifidelidad(trial, f1_fold, y_train, cv_folds)
+
         cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
-        scores = []
-        for tr_idx, val_idx in cv.split(X_train, y_train):
+        scores, tiempos = [], []
+        for tr_idx, val_idx in cv.split(matriz.X, matriz.y):
+            t_fold = time.perf_counter()
             try:
-                m = LGBMClassifier(**params)
-                m.fit(X_train.iloc[tr_idx], y_train.iloc[tr_idx])
-                scores.append(
-                    f1_score(y_train.iloc[val_idx], m.predict(X_train.iloc[val_idx]),
-                             pos_label=1, zero_division=0)
-                )
+                scores.append(f1_fold(tr_idx, val_idx))
             except Exception:
                 return 0.0
+            tiempos.append(time.perf_counter() - t_fold)
+        trial.set_user_attr("f1_folds", [float(s) for s in scores])
+        trial.set_user_attr("tiempos_folds_s", tiempos)
         return float(np.mean(scores))
 
     optuna.logging.set_verbosity(optuna.logging.CRITICAL)
-    study = optuna.create_study(
-        direction="maximize",
-        study_name=f"F1-score_LightGBM_{fase}",
-        sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+    if checkpoints is None:
+        checkpoints = Checkpoints(None, "LightGBM")
+
+    # El estudio solo está disponible si la optimización se ejecuta en esta llamada
+    study = None
+
+    def _optimiza():
+        nonlocal study
+        study = crea_estudio(
+            study_name=f"F1-score_LightGBM_{fase}",
+            sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+            models_dir=output_dir_models,
+            fase=fase,
+            arranque_caliente=arranque_caliente,
+            top_k=top_k_historico,
+            pruner=crea_pruner() if multifidelidad else None,
+            params_iniciales=[params_previos] if params_previos else None,
+        )
+        telemetria = TelemetriaOptuna("LightGBM", fase, output_dir_optuna)
+        with etapa("optuna", fase=fase), presupuesto_hilos().limita(trials_paralelos):
+            study.optimize(
+                instrumenta_objetivo(objective, fase=fase),
+                n_trials=n_trials, n_jobs=trials_paralelos, show_progress_bar=False,
+                callbacks=[telemetria],
+            )
+        return {"best_params": study.best_params, "best_value": study.best_value,
+                "telemetria": telemetria}
+
+    optimizacion = checkpoints.ejecuta(
+        fase, "optuna", (
+            X_train, y_train, n_trials, cv_folds, arranque_caliente, top_k_historico,
+            multifidelidad, margen_inicial, params_previos
+        ),
+        _optimiza,
     )
-    study.optimize(objective, n_trials=n_trials, show_progress_bar=False)
-
-    best_params = study.best_params
-    best_f1_cv  = study.best_value
+    telemetria  = optimizacion["telemetria"]
+    best_params = optimizacion["best_params"]
+    best_f1_cv  = optimizacion["best_value"]
 
     print(f"\n{'================================================================================================'}")
     print(f"  MEJORES HIPERPARÁMETROS  —  F1-CV: {best_f1_cv:.4f}")
@@ -561,37 +514,45 @@ def entrena_LightGBM_con_optuna(
         "objective":         "binary",
         "metric":            "binary_logloss",
         "random_state":      RANDOM_STATE,
-        "n_jobs":            -1,
+        **presupuesto_hilos().hilos_modelo("LightGBM"),
         "verbose":           -1,
     }
 
-    cv_results, modelo_final, train_losses, val_losses = _ejecuta_cv_LightGBM(
-        final_params, X_train, y_train, cv_folds, registra_losses=True
-    )
+    with etapa("refit_final", fase=fase):
+        cv_results, modelo_final, train_losses, val_losses = checkpoints.ejecuta(
+            fase, "refit_final",
+            (sin_hilos(final_params), X_train, y_train, cv_folds, margen_inicial, modo_curvas),
+            _ejecuta_cv_LightGBM, final_params, matriz, y_train, cv_folds,
+            modo_curvas=modo_curvas, margen_inicial=margen_inicial,
+        )
 
     print(f"\n{'================================================================================================'}")
     print(f"  RESUMEN CROSS-VALIDATION (Optimizado) — FASE {fase}")
     print(f"{'================================================================================================'}")
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
-
-    _grafica_curva_perdida(
-        train_losses, val_losses, fase, cv_folds,
-        tag_optimizado=True,
-        output_dir=output_dir_figures,
-    )
+    imprime_resumen_cv(cv_results, cv_folds, fase)
+
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_perdida(
+                train_losses, val_losses, fase, cv_folds,
+                tag_optimizado=True,
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
-    with mlflow.start_run(run_name=f"Optuna_LightGBM_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Optimizado_Optuna")
-        mlflow.set_tag("tipo",   "Validacion cruzada")
-        mlflow.log_params(modelo_final.get_params())
-        mlflow.log_param("n_trials",   n_trials)
-        mlflow.log_param("cv_folds",   cv_folds)
-        mlflow.log_param("n_features", X_train.shape[1])
-        mlflow.log_metric("optuna_best_f1_cv", round(best_f1_cv, 4))
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"Optuna_LightGBM_CV5_{fase}") as run:
+            run.set_tag("modelo", "Optimizado_Optuna")
+            run.set_tag("tipo",   "Validacion cruzada")
+            run.log_params(modelo_final.get_params())
+            run.log_param("n_trials",   n_trials)
+            run.log_param("cv_folds",   cv_folds)
+            run.log_param("n_features", X_train.shape[1])
+            run.log_metric("optuna_best_f1_cv", round(best_f1_cv, 4))
+            telemetria.registra(run)
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "fase":            fase,
@@ -611,25 +572,49 @@ def modelado_LightGBM(
     input_path: str | None = None,
     output_dir_figures: str | None = None,
     output_dir_models: str | None = None,
+    models_dir_arranque: str | None = None,
     mlruns_dir: str | None = None,
     n_trials: int = 50,
     cv_folds: int = 5,
     verbose: bool = True,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    incremental: bool = False,
+    exporta_onnx: bool = False,
+    hilos: int | None = None,
+    trials_paralelos: int | None = None,
+    usa_checkpoints: bool = True,
+    modo_curvas: str | None = None,
+    fases: list | None = None,
 ) -> None:
 
+    # Con --incremental el modelo de T1/T2 puntúa sobre el margen de la fase
+    # anterior (base_margin), que el grafo ONNX no recibe: la exportación y la
+    # paridad se harían sobre un modelo incompleto.
+    if incremental and exporta_onnx:
+        raise ValueError("--exporta-onnx no es compatible con --incremental")
+
+    import mlflow
+
     # ------------------------------------------------------------------
     # Resolución de rutas
     # ------------------------------------------------------------------
     data_path  = Path(input_path)         if input_path         else DATA_PROCESSED_PATH
     fig_dir    = Path(output_dir_figures) if output_dir_figures else OUTPUT_DIR_FIGURES
     models_dir = Path(output_dir_models)  if output_dir_models  else OUTPUT_DIR_MODELS
+    # Estudios Optuna y best_params_cv.json previos (arranque en caliente);
+    # el orquestador pasa el directorio de la familia
+    arranque_dir = Path(models_dir_arranque) if models_dir_arranque else models_dir
+    # Tabla de trials junto a los modelos si se redirige --models (orquestador,
+    # benchmarks); outputs/optuna solo para la ejecución por defecto
+    optuna_dir   = models_dir / "optuna" if output_dir_models else OPTUNA_DIR
 
     _mlruns_path = Path(mlruns_dir).resolve() if mlruns_dir else MLRUNS_DIR.resolve()
     mlruns_uri   = _mlruns_path.as_uri()
 
     fig_dir.mkdir(parents=True, exist_ok=True)
     models_dir.mkdir(parents=True, exist_ok=True)
-    OUTPUT_DIR_MODELS_GLOBAL.mkdir(parents=True, exist_ok=True)
 
     # ------------------------------------------------------------------
     # Configuración MLflow
@@ -646,6 +631,21 @@ def modelado_LightGBM(
         print(f"  Experiment ID : {experiment.experiment_id if experiment else 'Nuevo'}")
         print(f"\n  Para visualizar resultados:\n    mlflow ui --port 5000")
 
+    fases  = list(fases) if fases else ["T0", "T1", "T2"]
+    sufijo = "" if fases == ["T0", "T1", "T2"] else "_" + "_".join(fases)
+    inicia_instrumentacion(f"modelado_LightGBM{sufijo}")
+
+    presupuesto = configura_presupuesto_hilos(hilos, trials_paralelos)
+    presupuesto.aplica()
+    if verbose:
+        print(f"\n  Presupuesto de hilos : {presupuesto.total} "
+              f"({presupuesto.trials_paralelos} trial(s) en paralelo × "
+              f"{presupuesto.por_tarea(presupuesto.trials_paralelos)} hilos)")
+
+    modo_curvas = resuelve_modo_curvas(modo_curvas)
+    if verbose:
+        print(f"  Curvas de aprendizaje: {modo_curvas}")
+
     # ------------------------------------------------------------------
     # 1. Carga de datos
     # ------------------------------------------------------------------
@@ -654,9 +654,11 @@ def modelado_LightGBM(
         print("  1. CARGA DE DATOS PREPROCESADOS")
         print("================================================================================================")
 
-    df = pd.read_csv(data_path)
+    with etapa("carga"):
+        df = lee_csv(data_path)
     if verbose:
         print(f"\n  Dataset cargado: {df.shape[0]} filas × {df.shape[1]} columnas")
+        print(f"  Memoria en RAM  : {df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB")
         print(f"\n  Target binario:")
         print(df[TARGET].value_counts().to_string())
         ratio = df[TARGET].value_counts()[0] / df[TARGET].value_counts()[1]
@@ -699,38 +701,76 @@ def modelado_LightGBM(
     # 4-7. Loop por fase
     # ------------------------------------------------------------------
     csv_path_lgb = models_dir / "cv_summary_LightGBM.csv"
-    df_acumulado = pd.DataFrame()
+    registro     = RegistroResultados(models_dir / "folds_cv_LightGBM.csv")
+    checkpoints  = Checkpoints(
+        models_dir / DIRECTORIO_CHECKPOINTS if usa_checkpoints else None, "LightGBM", verbose=verbose
+    )
+    df_onnx      = []
 
-    for fase in ["T0", "T1", "T2"]:
+    margen_previo, params_previos = None, None
+    for fase in fases:
         if verbose:
             print("\n" + "================================================================================================")
             print(f"  FASE {fase}")
             print("================================================================================================")
 
-        X_tr, X_te, features, prep = preprocesamiento_LightGBM(X_train, X_test, y_train, fase)
+        with etapa("preprocesamiento", fase=fase):
+            X_tr, X_te, features, prep = preprocesamiento_LightGBM(X_train, X_test, y_train, fase)
 
         if verbose:
             print(f"\n  Dimensiones post-preprocesamiento:")
             print(f"    Train : {X_tr.shape}  |  Test: {X_te.shape}  |  Features: {len(features)}")
 
         # --- Sin optimización ---
-        results_base = entrena_LightGBM(X_tr, y_train, fase, cv_folds, fig_dir)
+        results_base = checkpoints.ejecuta(
+            fase, "baseline", (X_tr, y_train, cv_folds, modo_curvas),
+            entrena_LightGBM, X_tr, y_train, fase, cv_folds, fig_dir, modo_curvas,
+        )
 
-        df_base = resumen_cv(results_base["cv_results"], fase, "LightGBM")
-        df_acumulado = pd.concat([df_acumulado, df_base], ignore_index=True)
-        df_acumulado.to_csv(csv_path_lgb, index=False)
+        df_base = tabla_folds(results_base["cv_results"], fase, "LightGBM")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_base)
 
         # --- Optuna ---
-        results_opt = entrena_LightGBM_con_optuna(X_tr, y_train, fase, n_trials, cv_folds, fig_dir)
+        results_opt = entrena_LightGBM_con_optuna(
+            X_tr, y_train, fase, n_trials, cv_folds, fig_dir,
+            arranque_dir, arranque_caliente, top_k_historico, multifidelidad,
+            margen_previo, params_previos,
+            trials_paralelos=presupuesto.trials_paralelos,
+            checkpoints=checkpoints,
+            modo_curvas=modo_curvas,
+            output_dir_optuna=optuna_dir,
+        )
+        guarda_best_params(models_dir, fase, results_opt["best_params"])
+        if incremental:
+            margen_previo  = results_opt["cv_results"]["margen_oof"]
+            params_previos = results_opt["best_params"]
 
         if verbose:
             print(f"\n  Comparación F1-score — {fase}:")
             print(f"    Sin optimización : {results_base['cv_results']['test_f1'].mean():.4f}")
             print(f"    Optuna           : {results_opt['best_f1_sore_cv']:.4f}")
 
-        df_opt = resumen_cv(results_opt["cv_results"], fase, "LightGBM_opt")
-        df_acumulado = pd.concat([df_acumulado, df_opt], ignore_index=True)
-        df_acumulado.to_csv(csv_path_lgb, index=False)
+        df_opt = tabla_folds(results_opt["cv_results"], fase, "LightGBM_opt")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_opt)
+
+        # --- Exportación ONNX (opcional) ---
+        if exporta_onnx:
+            from src.models.onnx_export import exporta_y_valida_onnx
+            df_onnx.append(exporta_y_valida_onnx(
+                results_opt["model"], prep, "LightGBM", fase,
+                especificacion(fase).selecciona(X_test), X_te, models_dir / "onnx",
+            ))
+
+    with etapa("guardado"):
+        df_lgb_final = resume(registro.resultados())
+        df_lgb_final.to_csv(csv_path_lgb, index=False)
+
+    if exporta_onnx and df_onnx:
+        csv_path_onnx = models_dir / "onnx" / "onnx_latencia_LightGBM.csv"
+        pd.concat(df_onnx, ignore_index=True).to_csv(csv_path_onnx, index=False)
+        print(f"\n  Comparación de latencia ONNX guardada en: {csv_path_onnx}")
 
     # ------------------------------------------------------------------
     # 8. Resumen final LightGBM
@@ -738,26 +778,11 @@ def modelado_LightGBM(
     print("\n" + "================================================================================================")
     print("  RESUMEN FINAL — LIGHTGBM (CROSS-VALIDATION)")
     print("================================================================================================")
-    df_lgb_final = pd.read_csv(csv_path_lgb)
     print(df_lgb_final.to_string(index=False))
     print(f"\n  Resultados guardados en: {csv_path_lgb}")
 
-    # ------------------------------------------------------------------
-    # 9. Resumen comparativo global acumulado (RL + RF + XGBoost + LightGBM)
-    # ------------------------------------------------------------------
-    csv_path_global = OUTPUT_DIR_MODELS_GLOBAL / "cv_summary_entrenamiento.csv"
-
-    if csv_path_global.exists():
-        df_previo = pd.read_csv(csv_path_global)
-        df_global = pd.concat([df_previo, df_lgb_final], ignore_index=True)
-    else:
-        df_global = df_lgb_final.copy()
-        if verbose:
-            print(f"\n  Aviso: no se encontró {csv_path_global}. "
-                  f"Se crea con los resultados de LightGBM únicamente.")
-
-    df_global.to_csv(csv_path_global, index=False)
-    print(f"\n  Resumen comparativo global guardado en: {csv_path_global}")
+    finaliza_registro_mlflow(verbose=verbose)
+    finaliza_instrumentacion(mlruns_uri, verbose=verbose)
 
 
 # Funcion principal
@@ -800,8 +825,57 @@ def main():
         action="store_true",
         help="Ejecutar sin mensajes de progreso",
     )
+    parser.add_argument(
+        "--arranque-caliente",
+        action="store_true",
+        help="Encola best_params_cv.json (y el top-k histórico) como primeros trials",
+    )
+    parser.add_argument(
+        "--top-k-historico",
+        type=int, default=0,
+        help="Trials históricos a encolar con --arranque-caliente (default: 0)",
+    )
+    parser.add_argument(
+        "--multifidelidad",
+        action="store_true",
+        help="Evalúa los trials por rungs (submuestras y menos folds) con Hyperband",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Inicializa T1/T2 desde el margen y los mejores parámetros de la fase anterior",
+    )
+    parser.add_argument(
+        "--exporta-onnx",
+        action="store_true",
+        help="Exporta el modelo optimizado de cada fase a ONNX y compara latencia con ONNX Runtime "
+             "(incompatible con --incremental)",
+    )
+    parser.add_argument(
+        "--sin-checkpoints",
+        action="store_true",
+        help="Recalcula todos los pasos sin leer ni escribir checkpoints",
+    )
+    parser.add_argument(
+        "--hilos",
+        type=int, default=None,
+        help="Núcleos del proceso (default: THREAD_BUDGET de config, 0 = todos)",
+    )
+    parser.add_argument(
+        "--trials-paralelos",
+        type=int, default=None,
+        help="Trials de Optuna concurrentes (default: OPTUNA_PARALLEL_TRIALS de config)",
+    )
+    parser.add_argument(
+        "--curvas",
+        choices=MODOS_CURVAS, default=None,
+        help="Curvas de aprendizaje: completa, perezosa (train sobre submuestra) o ninguna "
+             "(default: CURVE_MODE del entorno o completa)",
+    )
 
     args = parser.parse_args()
+    if args.incremental and args.exporta_onnx:
+        parser.error("--exporta-onnx no es compatible con --incremental")
 
     modelado_LightGBM(
         input_path=args.input,
@@ -811,6 +885,15 @@ def main():
         n_trials=args.n_trials,
         cv_folds=args.cv_folds,
         verbose=not args.quiet,
+        arranque_caliente=args.arranque_caliente,
+        top_k_historico=args.top_k_historico,
+        multifidelidad=args.multifidelidad,
+        incremental=args.incremental,
+        exporta_onnx=args.exporta_onnx,
+        hilos=args.hilos,
+        trials_paralelos=args.trials_paralelos,
+        usa_checkpoints=not args.sin_checkpoints,
+        modo_curvas=args.curvas,
     )
 
     print("\n" + "================================================================================================")
@@ -5,10 +5,8 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import sys
+import time
 import os
 import argparse
 import warnings
@@ -19,24 +17,14 @@ from pathlib import Path
 # Preprocesamiento
 from sklearn.model_selection import train_test_split, StratifiedKFold
 
-# Modelo
-from catboost import CatBoostClassifier
-
 # Métricas
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
     roc_auc_score
 )
 
-# Encoders
-from category_encoders import TargetEncoder
-
-# Optimización
-import optuna
-
-# MLflow
-import mlflow
-import mlflow.sklearn
+# matplotlib, optuna, mlflow, category_encoders y catboost se importan en las
+# funciones que los usan: --help y el orquestador no pagan su carga
 
 # ==============================================================================
 # CONFIGURACIÓN DE RUTAS
@@ -45,10 +33,34 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.data.esquema import lee_csv
+from src.data.fases import VARS_T0, VARS_T1, VARS_T2, especificacion
+from src.models.arranque_optuna import crea_estudio, guarda_best_params
+from src.models.curvas_staged import MODO_CURVAS_DEFECTO, MODOS_CURVAS, resuelve_modo_curvas
+from src.models.incremental import ajusta_con_margen, margen_bruto, selecciona, sigmoide
+from src.models.matrices import pool_fase
+from src.models.multifidelidad import crea_pruner, evalua_multifidelidad
+from src.utils.checkpoints import (
+    DIRECTORIO_CHECKPOINTS,
+    Checkpoints,
+    RegistroResultados,
+    sin_hilos,
+)
+from src.utils.graficos import ESTILO_GRAFICOS, pyplot
+from src.utils.hilos import configura_presupuesto_hilos, presupuesto_hilos
+from src.utils.instrumentacion import (
+    etapa,
+    finaliza_instrumentacion,
+    inicia_instrumentacion,
+    instrumenta_objetivo,
+)
+from src.utils.mlflow_asincrono import finaliza_registro_mlflow, registro_mlflow
+from src.utils.reporte_cv import imprime_resumen_cv, resume, tabla_folds
+from src.utils.telemetria_optuna import OPTUNA_DIR, TelemetriaOptuna
+
 DATA_PROCESSED_PATH      = PROJECT_ROOT / "data" / "processed" / "preprocessed_data.csv"
 OUTPUT_DIR_FIGURES       = PROJECT_ROOT / "outputs" / "figures" / "modelado" / "CatBoost"
 OUTPUT_DIR_MODELS        = PROJECT_ROOT / "outputs" / "models"  / "CatBoost"
-OUTPUT_DIR_MODELS_GLOBAL = PROJECT_ROOT / "outputs" / "models"
 MLRUNS_DIR               = PROJECT_ROOT / "mlruns"
 
 # Semilla global
@@ -56,7 +68,6 @@ RANDOM_STATE = 42
 np.random.seed(RANDOM_STATE)
 
 # Estilo de visualización
-plt.style.use("seaborn-v0_8-whitegrid")
 pd.set_option("display.max_columns", None)
 pd.set_option("display.float_format", "{:.4f}".format)
 
@@ -66,109 +77,13 @@ pd.set_option("display.float_format", "{:.4f}".format)
 
 TARGET = "target_binario"
 
-VARS_BINARIAS_T0 = [
-    "daytimeevening_attendance",
-    "displaced",
-    "educational_special_needs",
-    "gender",
-    "scholarship_holder",
-    "international",
-    "is_single",
-]
-
-VARS_BINARIAS_T1 = [
-    "debtor",
-    "tuition_fees_up_to_date",
-]
-
-VARS_NUMERICAS_T0 = [
-    "age_at_enrollment",
-    "admission_grade",
-    "previous_qualification_grade",
-]
-
-VARS_NUMERICAS_T1 = [
-    "curricular_units_1st_sem_credited",
-    "curricular_units_1st_sem_enrolled",
-    "curricular_units_1st_sem_evaluations",
-    "curricular_units_1st_sem_approved",
-    "curricular_units_1st_sem_grade",
-    "curricular_units_1st_sem_without_evaluations",
-    "unemployment_rate",
-    "inflation_rate",
-    "gdp",
-]
-
-VARS_NUMERICAS_T2 = [
-    "curricular_units_2nd_sem_credited",
-    "curricular_units_2nd_sem_enrolled",
-    "curricular_units_2nd_sem_evaluations",
-    "curricular_units_2nd_sem_approved",
-    "curricular_units_2nd_sem_grade",
-    "curricular_units_2nd_sem_without_evaluations",
-]
-
-# CatBoost maneja estas variables nativamente como categóricas (string)
-VARS_CATEGORICAS_AGRUPADAS_T0 = [
-    "application_mode_risk",
-    "previous_qualification_risk",
-    "mothers_qualification_level",
-    "fathers_qualification_level",
-    "mothers_occupation_level",
-    "fathers_occupation_level",
-]
-
-VARS_TARGET_ENCODING_T0 = ["course"]
-
-VARS_ORDINALES_T0 = ["application_order"]
-
-VARS_T0 = (
-    VARS_BINARIAS_T0
-    + VARS_NUMERICAS_T0
-    + VARS_CATEGORICAS_AGRUPADAS_T0
-    + VARS_TARGET_ENCODING_T0
-    + VARS_ORDINALES_T0
-)
-
-VARS_T1 = VARS_T0 + VARS_BINARIAS_T1 + VARS_NUMERICAS_T1
-
-VARS_T2 = VARS_T1 + VARS_NUMERICAS_T2
+# Variables de cada fase y sus roles: src/data/fases.py
 
 
 # ==============================================================================
 # FUNCIONES DE PREPROCESAMIENTO
 # ==============================================================================
 
-def obtiene_variables_por_fase(fase: str) -> dict:
-
-    if fase == "T0":
-        return {
-            "binarias":            VARS_BINARIAS_T0,
-            "numericas":           VARS_NUMERICAS_T0 + VARS_ORDINALES_T0,
-            "categoricas_nativas": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":      VARS_TARGET_ENCODING_T0,
-            "all":                 VARS_T0,
-        }
-    elif fase == "T1":
-        return {
-            "binarias":            VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":           VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1,
-            "categoricas_nativas": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":      VARS_TARGET_ENCODING_T0,
-            "all":                 VARS_T1,
-        }
-    elif fase == "T2":
-        return {
-            "binarias":            VARS_BINARIAS_T0 + VARS_BINARIAS_T1,
-            "numericas":           VARS_NUMERICAS_T0 + VARS_ORDINALES_T0 + VARS_NUMERICAS_T1 + VARS_NUMERICAS_T2,
-            "categoricas_nativas": VARS_CATEGORICAS_AGRUPADAS_T0,
-            "categoricas_te":      VARS_TARGET_ENCODING_T0,
-            "all":                 VARS_T2,
-        }
-    else:
-        raise ValueError(f"Fase no válida: {fase}. Usar 'T0', 'T1' o 'T2'.")
-
-
 def preprocesamiento_catboost(
     X_train: pd.DataFrame,
     X_test: pd.DataFrame,
@@ -176,10 +91,12 @@ def preprocesamiento_catboost(
     fase: str,
 ) -> tuple:
 
-    variables_fase = obtiene_variables_por_fase(fase)
+    from category_encoders import TargetEncoder
 
-    X_train_fase = X_train[variables_fase["all"]].copy()
-    X_test_fase  = X_test[variables_fase["all"]].copy()
+    variables_fase = especificacion(fase)
+
+    X_train_fase = variables_fase.selecciona(X_train)
+    X_test_fase  = variables_fase.selecciona(X_test)
 
     # ------------------------------------------------------------------
     # 1. Target Encoding para 'course'
@@ -195,7 +112,7 @@ def preprocesamiento_catboost(
     # ------------------------------------------------------------------
     # 2. Convertir categóricas a string (CatBoost las requiere así)
     # ------------------------------------------------------------------
-    for col in variables_fase["categoricas_nativas"]:
+    for col in variables_fase["categoricas"]:
         X_train_fase[col] = X_train_fase[col].astype(str)
         X_test_fase[col]  = X_test_fase[col].astype(str)
 
@@ -203,8 +120,8 @@ def preprocesamiento_catboost(
     # 3. Índices de columnas categóricas para CatBoost
     # ------------------------------------------------------------------
     cat_features_idx   = [X_train_fase.columns.get_loc(c)
-                          for c in variables_fase["categoricas_nativas"]]
-    cat_features_names = variables_fase["categoricas_nativas"]
+                          for c in variables_fase["categoricas"]]
+    cat_features_names = variables_fase["categoricas"]
 
     feature_names = X_train_fase.columns.tolist()
     preprocessors = {
@@ -238,6 +155,8 @@ def _grafica_curva_perdida(
     """
     Genera y guarda la curva de pérdida (Logloss) vs iteraciones con bandas ± std.
     """
+    plt = pyplot(ESTILO_GRAFICOS)
+
     min_len   = min(len(l) for l in train_losses)
     train_arr = np.array([l[:min_len] for l in train_losses])
     val_arr   = np.array([l[:min_len] for l in val_losses])
@@ -286,44 +205,6 @@ def _grafica_curva_perdida(
           f"Gap: {gap:.4f}")
 
 
-def resumen_cv(cv_results: dict, fase: str, modelo: str) -> pd.DataFrame:
-    """Genera un DataFrame de resumen con media y std de las métricas CV."""
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-    summary = {"modelo": modelo, "fase": fase}
-    for metric in metrics:
-        summary[f"{metric}_val_mean"]   = cv_results[f"test_{metric}"].mean()
-        summary[f"{metric}_val_std"]    = cv_results[f"test_{metric}"].std()
-        summary[f"{metric}_train_mean"] = cv_results[f"train_{metric}"].mean()
-        summary[f"{metric}_train_std"]  = cv_results[f"train_{metric}"].std()
-    return pd.DataFrame([summary])
-
-
-def _imprime_resumen_cv(cv_results: dict, cv_folds: int, fase: str) -> None:
-    """Imprime tabla de métricas train/val por fold y su resumen."""
-    metrics = ["accuracy", "precision", "recall", "f1", "roc_auc"]
-
-    print(f"\n Resultados por fold:")
-    for i in range(cv_folds):
-        print(f"\n  Fold {i + 1}:")
-        for m in metrics:
-            print(f"    {m:<10} | Train: {cv_results[f'train_{m}'][i]:.4f} "
-                  f"| Val: {cv_results[f'test_{m}'][i]:.4f}")
-
-    print(f"\n Resumen Cross-Validation ({fase}):")
-    print(f"   {'Métrica':<12} {'Train Mean':>12} {'Train Std':>12} {'Val Mean':>12} {'Val Std':>12}")
-    print(f"   {'-' * 60}")
-    for m in metrics:
-        marker = " ****" if m == "f1" else ""
-        print(
-            f"   {m:<12} "
-            f"{cv_results[f'train_{m}'].mean():>12.4f} "
-            f"{cv_results[f'train_{m}'].std():>12.4f} "
-            f"{cv_results[f'test_{m}'].mean():>12.4f} "
-            f"{cv_results[f'test_{m}'].std():>12.4f}"
-            f"{marker}"
-        )
-
-
 # ==============================================================================
 # ENTRENAMIENTO CON PARÁMETROS POR DEFECTO
 # ==============================================================================
@@ -335,8 +216,12 @@ def entrena_catboost(
     cat_features_idx: list,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
 ) -> dict:
 
+    import mlflow
+    from catboost import CatBoostClassifier
+
     mlflow.end_run()
 
     class_weights = _calcula_class_weights(y_train)
@@ -363,68 +248,72 @@ def entrena_catboost(
     }
     train_losses, val_losses = [], []
     modelo_catb = None
-
-    for train_idx, val_idx in cv.split(X_train, y_train):
-        X_fold_train = X_train.iloc[train_idx]; y_fold_train = y_train.iloc[train_idx]
-        X_fold_val   = X_train.iloc[val_idx];   y_fold_val   = y_train.iloc[val_idx]
-
-        modelo_catb = CatBoostClassifier(
-            iterations=1000,
-            depth=6,
-            learning_rate=0.1,
-            l2_leaf_reg=3,
-            border_count=254,
-            class_weights=class_weights,
-            loss_function="Logloss",
-            eval_metric="F1",
-            cat_features=cat_features_idx,
-            random_seed=RANDOM_STATE,
-            verbose=False,
-        )
-        # eval_set con fold de validación real → curvas train/val correctas
-        modelo_catb.fit(
-            X_fold_train, y_fold_train,
-            eval_set=(X_fold_val, y_fold_val),
-        )
-
-        evals = modelo_catb.get_evals_result()
-        train_losses.append(evals["learn"]["Logloss"])
-        val_losses.append(evals["validation"]["Logloss"])
-
-        for split_name, X_s, y_s in [("train", X_fold_train, y_fold_train),
-                                      ("test",  X_fold_val,   y_fold_val)]:
-            y_pred  = modelo_catb.predict(X_s)
-            y_proba = modelo_catb.predict_proba(X_s)[:, 1]
-            cv_results[f"{split_name}_accuracy"].append(accuracy_score(y_s, y_pred))
-            cv_results[f"{split_name}_precision"].append(
-                precision_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_recall"].append(
-                recall_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_f1"].append(
-                f1_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_roc_auc"].append(roc_auc_score(y_s, y_proba))
+    pool = pool_fase(X_train, y_train, cat_features_idx)
+    y    = np.asarray(y_train)
+
+    with etapa("cv", fase=fase):
+        for train_idx, val_idx in cv.split(np.zeros(len(y)), y):
+            X_fold_train, y_fold_train = pool.slice(train_idx), y[train_idx]
+            X_fold_val,   y_fold_val   = pool.slice(val_idx),   y[val_idx]
+
+            modelo_catb = CatBoostClassifier(
+                iterations=1000,
+                depth=6,
+                learning_rate=0.1,
+                l2_leaf_reg=3,
+                border_count=254,
+                class_weights=class_weights,
+                loss_function="Logloss",
+                eval_metric="F1",
+                cat_features=cat_features_idx,
+                **presupuesto_hilos().hilos_modelo("CatBoost"),
+                random_seed=RANDOM_STATE,
+                verbose=False,
+            )
+            # eval_set con fold de validación real → curvas train/val correctas
+            modelo_catb.fit(X_fold_train, eval_set=X_fold_val)
+
+            evals = modelo_catb.get_evals_result()
+            train_losses.append(evals["learn"]["Logloss"])
+            val_losses.append(evals["validation"]["Logloss"])
+
+            for split_name, X_s, y_s in [("train", X_fold_train, y_fold_train),
+                                          ("test",  X_fold_val,   y_fold_val)]:
+                y_pred  = modelo_catb.predict(X_s)
+                y_proba = modelo_catb.predict_proba(X_s)[:, 1]
+                cv_results[f"{split_name}_accuracy"].append(accuracy_score(y_s, y_pred))
+                cv_results[f"{split_name}_precision"].append(
+                    precision_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_recall"].append(
+                    recall_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_f1"].append(
+                    f1_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_roc_auc"].append(roc_auc_score(y_s, y_proba))
 
     for key in cv_results:
         cv_results[key] = np.array(cv_results[key])
 
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
-    _grafica_curva_perdida(
-        train_losses, val_losses, fase, cv_folds,
-        tag_optimizado=False,
-        output_dir=output_dir_figures,
-    )
+    imprime_resumen_cv(cv_results, cv_folds, fase)
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_perdida(
+                train_losses, val_losses, fase, cv_folds,
+                tag_optimizado=False,
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
     mlflow.set_experiment("TFM_Dropout_Prediction")
-    with mlflow.start_run(run_name=f"CatBoost_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Params por default")
-        mlflow.set_tag("tipo",   "Validacion cruzada")
-        mlflow.log_params(modelo_catb.get_params())
-        mlflow.log_param("cv_folds",   cv_folds)
-        mlflow.log_param("n_features", X_train.shape[1])
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"CatBoost_CV5_{fase}") as run:
+            run.set_tag("modelo", "Params por default")
+            run.set_tag("tipo",   "Validacion cruzada")
+            run.log_params(modelo_catb.get_params())
+            run.log_param("cv_folds",   cv_folds)
+            run.log_param("n_features", X_train.shape[1])
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "phase":      fase,
@@ -446,8 +335,21 @@ def entrena_catBoost_con_optuna(
     n_trials: int = 25,
     cv_folds: int = 5,
     output_dir_figures: Path = OUTPUT_DIR_FIGURES,
+    output_dir_models: Path = OUTPUT_DIR_MODELS,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    margen_inicial: np.ndarray | None = None,
+    params_previos: dict | None = None,
+    trials_paralelos: int = 1,
+    checkpoints: Checkpoints | None = None,
+    modo_curvas: str = MODO_CURVAS_DEFECTO,
+    output_dir_optuna: Path = OPTUNA_DIR,
 ) -> dict:
 
+    import optuna
+    from catboost import CatBoostClassifier
+
     class_weights = _calcula_class_weights(y_train)
 
     print("=" * 80)
@@ -460,6 +362,9 @@ def entrena_catBoost_con_optuna(
     print(f"  Métrica a optimizar    : F1-score (clase Dropout = 1)")
     print(f"  class_weights base     : {{0: 1.0, 1: {class_weights[1]:.2f}}}")
 
+    pool = pool_fase(X_train, y_train, cat_features_idx)
+    y    = np.asarray(y_train)
+
     # ------------------------------------------------------------------
     # Función objetivo
     # ------------------------------------------------------------------
@@ -478,38 +383,78 @@ def entrena_catBoost_con_optuna(
             "loss_function":       "Logloss",
             "eval_metric":         "F1",
             "random_seed":         RANDOM_STATE,
+            **presupuesto_hilos().hilos_modelo("CatBoost", trials_paralelos),
             "verbose":             False,
             "early_stopping_rounds": 50,
         }
 
+        def f1_fold(tr_idx, val_idx):
+            m = CatBoostClassifier(**params)
+            pool_val = pool.slice(val_idx)
+            ajusta_con_margen(
+                m, pool.slice(tr_idx), None,
+                selecciona(margen_inicial, tr_idx), [selecciona(margen_inicial, val_idx)],
+                eval_set=pool_val,
+                verbose=False,
+            )
+            y_pred = margen_bruto(m, pool_val, selecciona(margen_inicial, val_idx)) > 0
+            return f1_score(y[val_idx], y_pred, pos_label=1, zero_division=0)
+
+        if multifidelidad:
+            return evalua_multifidelidad(trial, f1_fold, y_train, cv_folds)
+
         cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
-        scores = []
-        for tr_idx, val_idx in cv.split(X_train, y_train):
+        scores, tiempos = [], []
+        for tr_idx, val_idx in cv.split(np.zeros(len(y)), y):
+            t_fold = time.perf_counter()
             try:
-                m = CatBoostClassifier(**params)
-                m.fit(
-                    X_train.iloc[tr_idx], y_train.iloc[tr_idx],
-                    eval_set=(X_train.iloc[val_idx], y_train.iloc[val_idx]),
-                    verbose=False,
-                )
-                scores.append(
-                    f1_score(y_train.iloc[val_idx], m.predict(X_train.iloc[val_idx]),
-                             pos_label=1, zero_division=0)
-                )
+                scores.append(f1_fold(tr_idx, val_idx))
             except Exception:
                 return 0.0
+            tiempos.append(time.perf_counter() - t_fold)
+        trial.set_user_attr("f1_folds", [float(s) for s in scores])
+        trial.set_user_attr("tiempos_folds_s", tiempos)
         return float(np.mean(scores))
 
     optuna.logging.set_verbosity(optuna.logging.CRITICAL)
-    study = optuna.create_study(
-        direction="maximize",
-        study_name=f"F1-socre_{fase}",
-        sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+    if checkpoints is None:
+        checkpoints = Checkpoints(None, "CatBoost")
+
+    # El estudio solo está disponible si la optimización se ejecuta en esta llamada
+    study = None
+
+    def _optimiza():
+        nonlocal study
+        study = crea_estudio(
+            study_name=f"F1-socre_{fase}",
+            sampler=optuna.samplers.TPESampler(seed=RANDOM_STATE),
+            models_dir=output_dir_models,
+            fase=fase,
+            arranque_caliente=arranque_caliente,
+            top_k=top_k_historico,
+            pruner=crea_pruner() if multifidelidad else None,
+            params_iniciales=[params_previos] if params_previos else None,
+        )
+        telemetria = TelemetriaOptuna("CatBoost", fase, output_dir_optuna)
+        with etapa("optuna", fase=fase), presupuesto_hilos().limita(trials_paralelos):
+            study.optimize(
+                instrumenta_objetivo(objective, fase=fase),
+                n_trials=n_trials, n_jobs=trials_paralelos, show_progress_bar=False,
+                callbacks=[telemetria],
+            )
+        return {"best_params": study.best_params, "best_value": study.best_value,
+                "telemetria": telemetria}
+
+    optimizacion = checkpoints.ejecuta(
+        fase, "optuna", (
+            X_train, y_train, cat_features_idx, n_trials, cv_folds, arranque_caliente,
+            top_k_historico, multifidelidad, margen_inicial, params_previos
+        ),
+        _optimiza,
     )
-    study.optimize(objective, n_trials=n_trials, show_progress_bar=False)
-
-    best_params   = study.best_params
-    best_f1_score = study.best_value
+    telemetria    = optimizacion["telemetria"]
+    best_params   = optimizacion["best_params"]
+    best_f1_score = optimizacion["best_value"]
 
     print(f"\n{'=' * 70}")
     print(f"  MEJORES HIPERPARÁMETROS  —  F1-CV: {best_f1_score:.4f}")
@@ -533,77 +478,96 @@ def entrena_catBoost_con_optuna(
         "loss_function":       "Logloss",
         "eval_metric":         "F1",
         "random_seed":         RANDOM_STATE,
+        **presupuesto_hilos().hilos_modelo("CatBoost"),
         "verbose":             False,
         "early_stopping_rounds": 50,
     }
 
-    cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
-    cv_results = {
-        k: [] for k in [
-            "train_accuracy", "test_accuracy",
-            "train_precision", "test_precision",
-            "train_recall", "test_recall",
-            "train_f1", "test_f1",
-            "train_roc_auc", "test_roc_auc",
-        ]
-    }
-    train_losses, val_losses = [], []
-    modelo_catb_opt = None
-
-    for train_idx, val_idx in cv.split(X_train, y_train):
-        X_fold_train = X_train.iloc[train_idx]; y_fold_train = y_train.iloc[train_idx]
-        X_fold_val   = X_train.iloc[val_idx];   y_fold_val   = y_train.iloc[val_idx]
-
-        modelo_catb_opt = CatBoostClassifier(**final_params)
-        modelo_catb_opt.fit(
-            X_fold_train, y_fold_train,
-            eval_set=(X_fold_val, y_fold_val),
+    def _refit():
+        cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
+        cv_results = {
+            k: [] for k in [
+                "train_accuracy", "test_accuracy",
+                "train_precision", "test_precision",
+                "train_recall", "test_recall",
+                "train_f1", "test_f1",
+                "train_roc_auc", "test_roc_auc",
+            ]
+        }
+        train_losses, val_losses = [], []
+        modelo_catb_opt = None
+        margen_oof = np.zeros(len(y_train))
+
+        for train_idx, val_idx in cv.split(np.zeros(len(y)), y):
+            X_fold_train, y_fold_train = pool.slice(train_idx), y[train_idx]
+            X_fold_val,   y_fold_val   = pool.slice(val_idx),   y[val_idx]
+
+            m_ftr = selecciona(margen_inicial, train_idx)
+            m_fv  = selecciona(margen_inicial, val_idx)
+
+            modelo_catb_opt = CatBoostClassifier(**final_params)
+            ajusta_con_margen(
+                modelo_catb_opt, X_fold_train, None, m_ftr, [m_fv],
+                eval_set=X_fold_val,
+            )
+            margen_oof[val_idx] = margen_bruto(modelo_catb_opt, X_fold_val, m_fv)
+
+            evals = modelo_catb_opt.get_evals_result()
+            train_losses.append(evals["learn"]["Logloss"])
+            val_losses.append(evals["validation"]["Logloss"])
+
+            for split_name, X_s, y_s, m_s in [("train", X_fold_train, y_fold_train, m_ftr),
+                                               ("test",  X_fold_val,   y_fold_val,   m_fv)]:
+                y_proba = sigmoide(margen_bruto(modelo_catb_opt, X_s, m_s))
+                y_pred  = (y_proba >= 0.5).astype(int)
+                cv_results[f"{split_name}_accuracy"].append(accuracy_score(y_s, y_pred))
+                cv_results[f"{split_name}_precision"].append(
+                    precision_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_recall"].append(
+                    recall_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_f1"].append(
+                    f1_score(y_s, y_pred, pos_label=1, zero_division=0))
+                cv_results[f"{split_name}_roc_auc"].append(roc_auc_score(y_s, y_proba))
+
+        for key in cv_results:
+            cv_results[key] = np.array(cv_results[key])
+        cv_results["margen_oof"] = margen_oof
+        return cv_results, modelo_catb_opt, train_losses, val_losses
+
+    with etapa("refit_final", fase=fase):
+        cv_results, modelo_catb_opt, train_losses, val_losses = checkpoints.ejecuta(
+            fase, "refit_final", (sin_hilos(final_params), X_train, y_train, cv_folds, margen_inicial),
+            _refit,
         )
 
-        evals = modelo_catb_opt.get_evals_result()
-        train_losses.append(evals["learn"]["Logloss"])
-        val_losses.append(evals["validation"]["Logloss"])
-
-        for split_name, X_s, y_s in [("train", X_fold_train, y_fold_train),
-                                      ("test",  X_fold_val,   y_fold_val)]:
-            y_pred  = modelo_catb_opt.predict(X_s)
-            y_proba = modelo_catb_opt.predict_proba(X_s)[:, 1]
-            cv_results[f"{split_name}_accuracy"].append(accuracy_score(y_s, y_pred))
-            cv_results[f"{split_name}_precision"].append(
-                precision_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_recall"].append(
-                recall_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_f1"].append(
-                f1_score(y_s, y_pred, pos_label=1, zero_division=0))
-            cv_results[f"{split_name}_roc_auc"].append(roc_auc_score(y_s, y_proba))
-
-    for key in cv_results:
-        cv_results[key] = np.array(cv_results[key])
-
     print(f"\n{'=' * 70}")
     print(f"  RESUMEN CROSS-VALIDATION (Optimizado) — FASE {fase}")
     print(f"{'=' * 70}")
-    _imprime_resumen_cv(cv_results, cv_folds, fase)
+    imprime_resumen_cv(cv_results, cv_folds, fase)
 
-    _grafica_curva_perdida(
-        train_losses, val_losses, fase, cv_folds,
-        tag_optimizado=True,
-        output_dir=output_dir_figures,
-    )
+    if modo_curvas != "ninguna":
+        with etapa("graficos", fase=fase):
+            _grafica_curva_perdida(
+                train_losses, val_losses, fase, cv_folds,
+                tag_optimizado=True,
+                output_dir=output_dir_figures,
+            )
 
     # Registro en MLflow
-    with mlflow.start_run(run_name=f"OptunaCoste_CatBoost_CV5_{fase}"):
-        mlflow.set_tag("modelo", "Baseline - Optimizado_Optuna")
-        mlflow.set_tag("tipo",   "Validacion cruzada")
-        mlflow.log_params(modelo_catb_opt.get_params())
-        mlflow.log_param("n_trials",   n_trials)
-        mlflow.log_param("cv_folds",   cv_folds)
-        mlflow.log_param("n_features", X_train.shape[1])
-        mlflow.log_metric("optuna_best_f1_cv", best_f1_score)
-
-        for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
-            mlflow.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
-            mlflow.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
+    with etapa("registro_mlflow", fase=fase):
+        with registro_mlflow().inicia_run(run_name=f"OptunaCoste_CatBoost_CV5_{fase}") as run:
+            run.set_tag("modelo", "Baseline - Optimizado_Optuna")
+            run.set_tag("tipo",   "Validacion cruzada")
+            run.log_params(modelo_catb_opt.get_params())
+            run.log_param("n_trials",   n_trials)
+            run.log_param("cv_folds",   cv_folds)
+            run.log_param("n_features", X_train.shape[1])
+            run.log_metric("optuna_best_f1_cv", best_f1_score)
+            telemetria.registra(run)
+
+            for m in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+                run.log_metric(f"test_{m}_mean", round(float(cv_results[f"test_{m}"].mean()), 4))
+                run.log_metric(f"test_{m}_std",  round(float(cv_results[f"test_{m}"].std()),  4))
 
     return {
         "fase":            fase,
@@ -623,25 +587,42 @@ def modelado_CatBoost(
     input_path: str | None = None,
     output_dir_figures: str | None = None,
     output_dir_models: str | None = None,
+    models_dir_arranque: str | None = None,
     mlruns_dir: str | None = None,
     n_trials: int = 25,
     cv_folds: int = 5,
     verbose: bool = True,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    incremental: bool = False,
+    hilos: int | None = None,
+    trials_paralelos: int | None = None,
+    usa_checkpoints: bool = True,
+    modo_curvas: str | None = None,
+    fases: list | None = None,
 ) -> None:
 
+    import mlflow
+
     # ------------------------------------------------------------------
     # Resolución de rutas
     # ------------------------------------------------------------------
     data_path  = Path(input_path)         if input_path         else DATA_PROCESSED_PATH
     fig_dir    = Path(output_dir_figures) if output_dir_figures else OUTPUT_DIR_FIGURES
     models_dir = Path(output_dir_models)  if output_dir_models  else OUTPUT_DIR_MODELS
+    # Estudios Optuna y best_params_cv.json previos (arranque en caliente);
+    # el orquestador pasa el directorio de la familia
+    arranque_dir = Path(models_dir_arranque) if models_dir_arranque else models_dir
+    # Tabla de trials junto a los modelos si se redirige --models (orquestador,
+    # benchmarks); outputs/optuna solo para la ejecución por defecto
+    optuna_dir   = models_dir / "optuna" if output_dir_models else OPTUNA_DIR
 
     _mlruns_path = Path(mlruns_dir).resolve() if mlruns_dir else MLRUNS_DIR.resolve()
     mlruns_uri   = _mlruns_path.as_uri()
 
     fig_dir.mkdir(parents=True, exist_ok=True)
     models_dir.mkdir(parents=True, exist_ok=True)
-    OUTPUT_DIR_MODELS_GLOBAL.mkdir(parents=True, exist_ok=True)
 
     # ------------------------------------------------------------------
     # Configuración MLflow
@@ -658,6 +639,21 @@ def modelado_CatBoost(
         print(f"  Experiment ID : {experiment.experiment_id if experiment else 'Nuevo'}")
         print(f"\n  Para visualizar resultados:\n    mlflow ui --port 5000")
 
+    fases  = list(fases) if fases else ["T0", "T1", "T2"]
+    sufijo = "" if fases == ["T0", "T1", "T2"] else "_" + "_".join(fases)
+    inicia_instrumentacion(f"modelado_CatBoost{sufijo}")
+
+    presupuesto = configura_presupuesto_hilos(hilos, trials_paralelos)
+    presupuesto.aplica()
+    if verbose:
+        print(f"\n  Presupuesto de hilos : {presupuesto.total} "
+              f"({presupuesto.trials_paralelos} trial(s) en paralelo × "
+              f"{presupuesto.por_tarea(presupuesto.trials_paralelos)} hilos)")
+
+    modo_curvas = resuelve_modo_curvas(modo_curvas)
+    if verbose:
+        print(f"  Curvas de aprendizaje: {modo_curvas}")
+
     # ------------------------------------------------------------------
     # 1. Carga de datos
     # ------------------------------------------------------------------
@@ -666,9 +662,11 @@ def modelado_CatBoost(
         print("  1. CARGA DE DATOS PREPROCESADOS")
         print("=" * 80)
 
-    df = pd.read_csv(data_path)
+    with etapa("carga"):
+        df = lee_csv(data_path)
     if verbose:
         print(f"\n  Dataset cargado: {df.shape[0]} filas × {df.shape[1]} columnas")
+        print(f"  Memoria en RAM  : {df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB")
         print(f"\n  Target binario:")
         print(df[TARGET].value_counts().to_string())
         ratio = df[TARGET].value_counts()[0] / df[TARGET].value_counts()[1]
@@ -711,15 +709,20 @@ def modelado_CatBoost(
     # 4-7. Loop por fase
     # ------------------------------------------------------------------
     csv_path_cb = models_dir / "cv_summary_CatBoost.csv"
-    df_acumulado = pd.DataFrame()
+    registro     = RegistroResultados(models_dir / "folds_cv_CatBoost.csv")
+    checkpoints  = Checkpoints(
+        models_dir / DIRECTORIO_CHECKPOINTS if usa_checkpoints else None, "CatBoost", verbose=verbose
+    )
 
-    for fase in ["T0", "T1", "T2"]:
+    margen_previo, params_previos = None, None
+    for fase in fases:
         if verbose:
             print("\n" + "=" * 80)
             print(f"  FASE {fase}")
             print("=" * 80)
 
-        X_tr, X_te, features, prep = preprocesamiento_catboost(X_train, X_test, y_train, fase)
+        with etapa("preprocesamiento", fase=fase):
+            X_tr, X_te, features, prep = preprocesamiento_catboost(X_train, X_test, y_train, fase)
         cat_idx = prep["cat_features_idx"]
 
         if verbose:
@@ -728,25 +731,42 @@ def modelado_CatBoost(
             print(f"    Categóricas nativas: {prep['cat_features_names']}")
 
         # --- Sin optimización ---
-        results_base = entrena_catboost(X_tr, y_train, fase, cat_idx, cv_folds, fig_dir)
+        results_base = checkpoints.ejecuta(
+            fase, "baseline", (X_tr, y_train, cv_folds, cat_idx),
+            entrena_catboost, X_tr, y_train, fase, cat_idx, cv_folds, fig_dir, modo_curvas,
+        )
 
-        df_base = resumen_cv(results_base["cv_results"], fase, "CatBoost")
-        df_acumulado = pd.concat([df_acumulado, df_base], ignore_index=True)
-        df_acumulado.to_csv(csv_path_cb, index=False)
+        df_base = tabla_folds(results_base["cv_results"], fase, "CatBoost")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_base)
 
         # --- Optuna ---
         results_opt = entrena_catBoost_con_optuna(
-            X_tr, y_train, fase, cat_idx, n_trials, cv_folds, fig_dir
+            X_tr, y_train, fase, cat_idx, n_trials, cv_folds, fig_dir,
+            arranque_dir, arranque_caliente, top_k_historico, multifidelidad,
+            margen_previo, params_previos,
+            trials_paralelos=presupuesto.trials_paralelos,
+            checkpoints=checkpoints,
+            modo_curvas=modo_curvas,
+            output_dir_optuna=optuna_dir,
         )
+        guarda_best_params(models_dir, fase, results_opt["best_params"])
+        if incremental:
+            margen_previo  = results_opt["cv_results"]["margen_oof"]
+            params_previos = results_opt["best_params"]
 
         if verbose:
             print(f"\n  Comparación F1-score — {fase}:")
             print(f"    Sin optimización : {results_base['cv_results']['test_f1'].mean():.4f}")
             print(f"    Optuna           : {results_opt['best_f1_sore_cv']:.4f}")
 
-        df_opt = resumen_cv(results_opt["cv_results"], fase, "CatBoost_opt")
-        df_acumulado = pd.concat([df_acumulado, df_opt], ignore_index=True)
-        df_acumulado.to_csv(csv_path_cb, index=False)
+        df_opt = tabla_folds(results_opt["cv_results"], fase, "CatBoost_opt")
+        with etapa("guardado", fase=fase):
+            registro.anade(df_opt)
+
+    with etapa("guardado"):
+        df_cb_final = resume(registro.resultados())
+        df_cb_final.to_csv(csv_path_cb, index=False)
 
     # ------------------------------------------------------------------
     # 8. Resumen final CatBoost
@@ -754,27 +774,11 @@ def modelado_CatBoost(
     print("\n" + "=" * 80)
     print("  RESUMEN FINAL — CATBOOST (CROSS-VALIDATION)")
     print("=" * 80)
-    df_cb_final = pd.read_csv(csv_path_cb)
     print(df_cb_final.to_string(index=False))
     print(f"\n  Resultados guardados en: {csv_path_cb}")
 
-    # ------------------------------------------------------------------
-    # 9. Resumen comparativo global acumulado (RL + RF + XGB + LGB + CatBoost)
-    # ------------------------------------------------------------------
-    csv_path_global = OUTPUT_DIR_MODELS_GLOBAL / "cv_summary_entrenamiento.csv"
-
-    if csv_path_global.exists():
-        df_previo = pd.read_csv(csv_path_global)
-        df_global = pd.concat([df_previo, df_cb_final], ignore_index=True)
-    else:
-        df_global = df_cb_final.copy()
-        if verbose:
-            print(f"\n  Aviso: no se encontró {csv_path_global}. "
-                  f"Se crea con los resultados de CatBoost únicamente.")
-
-    df_global.to_csv(csv_path_global, index=False)
-    print(f"\n  Resumen comparativo global guardado en: {csv_path_global}")
-
+    finaliza_registro_mlflow(verbose=verbose)
+    finaliza_instrumentacion(mlruns_uri, verbose=verbose)
 
 
 # Funcion principal
@@ -796,6 +800,23 @@ def main():
                         help="Número de folds para Cross-Validation (default: 5)")
     parser.add_argument("--quiet",    "-q", action="store_true",
                         help="Ejecutar sin mensajes de progreso")
+    parser.add_argument("--arranque-caliente", action="store_true",
+                        help="Encola best_params_cv.json (y el top-k histórico) como primeros trials")
+    parser.add_argument("--top-k-historico", type=int, default=0,
+                        help="Trials históricos a encolar con --arranque-caliente (default: 0)")
+    parser.add_argument("--multifidelidad", action="store_true",
+                        help="Evalúa los trials por rungs (submuestras y menos folds) con Hyperband")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Inicializa T1/T2 desde el margen y los mejores parámetros de la fase anterior")
+    parser.add_argument("--sin-checkpoints", action="store_true",
+                        help="Recalcula todos los pasos sin leer ni escribir checkpoints")
+    parser.add_argument("--hilos", type=int, default=None,
+                        help="Núcleos del proceso (default: THREAD_BUDGET de config, 0 = todos)")
+    parser.add_argument("--trials-paralelos", type=int, default=None,
+                        help="Trials de Optuna concurrentes (default: OPTUNA_PARALLEL_TRIALS de config)")
+    parser.add_argument("--curvas", choices=MODOS_CURVAS, default=None,
+                        help="Curvas de aprendizaje: completa, perezosa o ninguna "
+                             "(default: CURVE_MODE del entorno o completa)")
 
     args = parser.parse_args()
 
@@ -807,6 +828,14 @@ def main():
         n_trials=args.n_trials,
         cv_folds=args.cv_folds,
         verbose=not args.quiet,
+        arranque_caliente=args.arranque_caliente,
+        top_k_historico=args.top_k_historico,
+        multifidelidad=args.multifidelidad,
+        incremental=args.incremental,
+        hilos=args.hilos,
+        trials_paralelos=args.trials_paralelos,
+        usa_checkpoints=not args.sin_checkpoints,
+        modo_curvas=args.curvas,
     )
 
     print("\n" + "=" * 80)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# RESUMEN COMPARATIVO DE ENTRENAMIENTO
+#
+# Etapa de agregación: une los cv_summary_<familia>.csv que escribe cada etapa
+# de modelado (4.1–4.5) en outputs/models/cv_summary_entrenamiento.csv. Las
+# etapas de modelado solo escriben su propio resumen, así que dvc repro (o
+# dvc exp run con workers de cola) puede ejecutarlas en paralelo y esta etapa
+# las une al final.
+#
+# Uso:
+#   python src/pipelines/4.6_resumen_entrenamiento.py
+
+import sys
+import argparse
+from pathlib import Path
+
+# ==============================================================================
+# CONFIGURACIÓN DE RUTAS
+# ==============================================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.reporte_cv import agrega_resumenes
+
+OUTPUT_DIR_MODELS = PROJECT_ROOT / "outputs" / "models"
+
+# Resumen de cada familia relativo a outputs/models, en el orden de la tabla global
+RESUMENES = {
+    "RL":       Path("baseline_RL") / "cv_summary_RL.csv",
+    "RF":       Path("RF")          / "cv_summary_RF.csv",
+    "XGBoost":  Path("XGBoost")     / "cv_summary_XGBoost.csv",
+    "LightGBM": Path("LightGBM")    / "cv_summary_LightGBM.csv",
+    "CatBoost": Path("CatBoost")    / "cv_summary_CatBoost.csv",
+}
+
+
+def resumen_entrenamiento(
+    output_dir_models: str | None = None,
+    familias: list | None = None,
+    verbose: bool = True,
+):
+    models_dir = Path(output_dir_models) if output_dir_models else OUTPUT_DIR_MODELS
+    familias   = familias or list(RESUMENES)
+    rutas      = [models_dir / RESUMENES[familia] for familia in familias]
+    destino    = models_dir / "cv_summary_entrenamiento.csv"
+
+    faltan = [str(ruta) for ruta in rutas if not ruta.exists()]
+    df_global = agrega_resumenes(rutas, destino)
+
+    if verbose:
+        print("================================================================================")
+        print("  RESUMEN COMPARATIVO GLOBAL (CROSS-VALIDATION)")
+        print("================================================================================")
+        for ruta in faltan:
+            print(f"  Aviso: no se encontró {ruta}; la familia se omite.")
+        if not df_global.empty:
+            print(df_global.to_string(index=False))
+            print(f"\n  Resumen comparativo global guardado en: {destino}")
+    return df_global
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Une los cv_summary de cada familia en cv_summary_entrenamiento.csv"
+    )
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Directorio raíz de modelos (default: outputs/models)")
+    parser.add_argument("--familias", nargs="+", choices=list(RESUMENES), default=None,
+                        help="Familias a incluir (default: todas)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Ejecutar sin mensajes de progreso")
+
+    args = parser.parse_args()
+
+    resumen_entrenamiento(
+        output_dir_models=args.models,
+        familias=args.familias,
+        verbose=not args.quiet,
+    )
+
+
+if __name__ == "__main__":
+    main()
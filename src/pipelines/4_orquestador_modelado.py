@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# ORQUESTADOR DE MODELADO (TODAS LAS FAMILIAS EN PARALELO)
+#
+# Cada par (familia, fase) de modelado_* es un trabajo independiente: comparten
+# únicamente el CSV preprocesado y el split train/test (misma semilla). Los
+# trabajos se reparten en un pool de procesos con un presupuesto de núcleos
+# (PresupuestoHilos): con W workers cada trabajo recibe total // W hilos.
+# Se lanzan primero los trabajos más largos (duración de la última ejecución
+# o coste relativo por familia), de modo que el barrido completo dura
+# aproximadamente lo que la familia más lenta y no la suma de las cinco.
+#
+# Con --incremental las fases de XGBoost, LightGBM y CatBoost dependen de la
+# anterior (margen OOF) y se ejecutan como un único trabajo por familia.
+#
+# Salidas:
+#   <models>/<familia>/trabajos/<fases>/   resultados y checkpoints de cada trabajo
+#   <models>/<familia>/optuna_estudios.db  estudios (arranque en caliente, compartido
+#                                          con las etapas DVC de la familia)
+#   <models>/<familia>/cv_summary_<familia>.csv y best_params_cv.json (fusionados)
+#   <models>/cv_summary_entrenamiento.csv  tabla comparativa global
+#   <models>/orquestador/trabajos.csv      estado, duración e hilos por trabajo
+#   <models>/orquestador/logs/*.log        salida de consola de cada trabajo
+#
+# Uso:
+#   python src/pipelines/4_orquestador_modelado.py --workers 4 --hilos 16
+
+import sys
+import json
+import time
+import argparse
+import importlib.util
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import pandas as pd
+
+# ==============================================================================
+# CONFIGURACIÓN DE RUTAS
+# ==============================================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.arranque_optuna import ARCHIVO_BEST_PARAMS, escribe_json_atomico
+from src.models.curvas_staged import MODOS_CURVAS
+from src.utils.hilos import PresupuestoHilos, presupuesto_hilos
+from src.utils.reporte_cv import agrega_resumenes
+
+PIPELINES_DIR     = PROJECT_ROOT / "src" / "pipelines"
+OUTPUT_DIR_MODELS = PROJECT_ROOT / "outputs" / "models"
+MLRUNS_DIR        = PROJECT_ROOT / "mlruns"
+
+FASES = ["T0", "T1", "T2"]
+
+# familia → (script, función modelado_*, directorio de modelos, admite incremental)
+FAMILIAS = {
+    "RL":       ("4.1_modelo_baseline_RL_train.py", "modelado_baseline_RL", "baseline_RL", False),
+    "RF":       ("4.2_modelo_RF_train.py",          "modelado_RF",          "RF",          False),
+    "XGBoost":  ("4.3_modelado_XGBoost_train.py",   "modelado_XGBoost",     "XGBoost",     True),
+    "LightGBM": ("4.4_modelado_LightGBM_train.py",  "modelado_LightGBM",    "LightGBM",    True),
+    "CatBoost": ("4.5_modelado_CatBoost_train.py",  "modelado_CatBoost",    "CatBoost",    True),
+}
+
+# Coste relativo aproximado de una fase (sin historial de duraciones)
+COSTE_RELATIVO = {"RL": 1.0, "RF": 3.0, "XGBoost": 3.0, "LightGBM": 2.0, "CatBoost": 6.0}
+COSTE_FASE     = {"T0": 1.0, "T1": 1.2, "T2": 1.4}
+
+
+# ==============================================================================
+# TRABAJOS
+# ==============================================================================
+
+def nombre_trabajo(fases: list) -> str:
+    return "_".join(fases)
+
+
+def crea_trabajos(familias: list, fases: list, incremental: bool) -> list:
+    """Un trabajo por (familia, fase); uno por familia si sus fases están encadenadas."""
+    trabajos = []
+    for familia in familias:
+        encadenada = incremental and FAMILIAS[familia][3]
+        grupos = [fases] if encadenada else [[fase] for fase in fases]
+        for grupo in grupos:
+            trabajos.append({"familia": familia, "fases": list(grupo)})
+    return trabajos
+
+
+def estima_duracion(trabajo: dict, historial: pd.DataFrame) -> float:
+    """wall_s de la última ejecución correcta del trabajo o, si no hay, su coste relativo."""
+    if not historial.empty:
+        previos = historial[
+            (historial["familia"] == trabajo["familia"])
+            & (historial["trabajo"] == nombre_trabajo(trabajo["fases"]))
+            & (historial["estado"] == "ok")
+        ]
+        if not previos.empty:
+            return float(previos["wall_s"].iloc[-1])
+    return COSTE_RELATIVO[trabajo["familia"]] * sum(COSTE_FASE[f] for f in trabajo["fases"])
+
+
+def directorio_trabajo(models_root: Path, familia: str, fases: list) -> Path:
+    return models_root / FAMILIAS[familia][2] / "trabajos" / nombre_trabajo(fases)
+
+
+def _carga_pipeline(script: str):
+    """Importa un script de src/pipelines (sus nombres no son importables)."""
+    ruta = PIPELINES_DIR / script
+    nombre_modulo = "pipeline_" + ruta.stem.split("_")[0].replace(".", "_")
+    if nombre_modulo in sys.modules:
+        return sys.modules[nombre_modulo]
+    spec = importlib.util.spec_from_file_location(nombre_modulo, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre_modulo] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def ejecuta_trabajo(trabajo: dict, opciones: dict, hilos: int, models_root: str, log_dir: str) -> dict:
+    """
+    Ejecuta modelado_<familia> para las fases del trabajo en el proceso worker.
+
+    La salida de consola va a <log_dir>/<familia>_<fases>.log; los errores se
+    devuelven en el resultado en lugar de propagarse al orquestador.
+    """
+    familia, fases = trabajo["familia"], trabajo["fases"]
+    script, funcion, directorio, admite_incremental = FAMILIAS[familia]
+    salida   = directorio_trabajo(Path(models_root), familia, fases)
+    log_path = Path(log_dir) / f"{familia}_{nombre_trabajo(fases)}.log"
+
+    # Límite de hilos antes de importar las librerías nativas del pipeline
+    PresupuestoHilos(hilos).aplica()
+
+    kwargs = {
+        "input_path":        opciones["input_path"],
+        "output_dir_models": str(salida),
+        # Arranque en caliente desde el estado de la familia (best_params_cv.json
+        # fusionado y estudios de las etapas DVC), no desde trabajos/<fases>
+        "models_dir_arranque": str(Path(models_root) / directorio),
+        "mlruns_dir":        opciones["mlruns_dir"],
+        "cv_folds":          opciones["cv_folds"],
+        "arranque_caliente": opciones["arranque_caliente"],
+        "top_k_historico":   opciones["top_k_historico"],
+        "multifidelidad":    opciones["multifidelidad"],
+        "hilos":             hilos,
+        "trials_paralelos":  1,
+        "usa_checkpoints":   opciones["usa_checkpoints"],
+        "modo_curvas":       opciones["modo_curvas"],
+        "fases":             fases,
+    }
+    if opciones["n_trials"] is not None:
+        kwargs["n_trials"] = opciones["n_trials"]
+    if admite_incremental:
+        kwargs["incremental"] = opciones["incremental"]
+
+    resultado = {
+        "familia": familia,
+        "trabajo": nombre_trabajo(fases),
+        "hilos":   hilos,
+        "log":     str(log_path),
+    }
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            getattr(_carga_pipeline(script), funcion)(**kwargs)
+            resultado.update(estado="ok", error="")
+        except Exception as exc:
+            traceback.print_exc()
+            resultado.update(estado="error", error=f"{type(exc).__name__}: {exc}")
+    resultado["wall_s"] = round(time.perf_counter() - t0, 2)
+    return resultado
+
+
+# ==============================================================================
+# FUSIÓN DE RESULTADOS
+# ==============================================================================
+
+def fusiona_resultados(trabajos: list, resultados: list, models_root: Path) -> pd.DataFrame:
+    """
+    Une los cv_summary y best_params_cv.json de los trabajos correctos de cada
+    familia (en orden de fases) y escribe la tabla comparativa global.
+
+    Los ficheros de familia existentes se actualizan, no se reescriben: solo
+    se sustituyen las fases de esta ejecución, de modo que un --fases parcial
+    conserva el resto de fases de ejecuciones anteriores.
+    """
+    correctos = {(r["familia"], r["trabajo"]) for r in resultados if r["estado"] == "ok"}
+    rutas     = []
+
+    for familia in FAMILIAS:
+        de_familia = [
+            t for t in trabajos
+            if t["familia"] == familia and (familia, nombre_trabajo(t["fases"])) in correctos
+        ]
+        if not de_familia:
+            continue
+        de_familia.sort(key=lambda t: FASES.index(t["fases"][0]))
+
+        dir_familia  = models_root / FAMILIAS[familia][2]
+        ruta_familia = dir_familia / f"cv_summary_{familia}.csv"
+        ruta_best_familia = dir_familia / ARCHIVO_BEST_PARAMS
+        fases_nuevas = {fase for t in de_familia for fase in t["fases"]}
+
+        # Fases de ejecuciones anteriores que esta ejecución no ha tocado
+        partes, best_params = [], {}
+        if ruta_familia.exists():
+            previo = pd.read_csv(ruta_familia)
+            partes.append(previo[~previo["fase"].isin(fases_nuevas)])
+        if ruta_best_familia.exists():
+            best_params = {
+                fase: params
+                for fase, params in json.loads(ruta_best_familia.read_text(encoding="utf-8")).items()
+                if fase not in fases_nuevas
+            }
+
+        for t in de_familia:
+            salida = directorio_trabajo(models_root, familia, t["fases"])
+            partes.append(pd.read_csv(salida / f"cv_summary_{familia}.csv"))
+            ruta_best = salida / ARCHIVO_BEST_PARAMS
+            if ruta_best.exists():
+                best_params.update(json.loads(ruta_best.read_text(encoding="utf-8")))
+
+        df_familia = pd.concat(partes, ignore_index=True).sort_values(
+            "fase", key=lambda fase: fase.map(FASES.index), kind="stable",
+        )
+        df_familia.to_csv(ruta_familia, index=False)
+        if best_params:
+            escribe_json_atomico(
+                ruta_best_familia,
+                {fase: best_params[fase] for fase in sorted(best_params, key=FASES.index)},
+            )
+        rutas.append(ruta_familia)
+
+    return agrega_resumenes(rutas, models_root / "cv_summary_entrenamiento.csv")
+
+
+# ==============================================================================
+# FUNCIÓN PRINCIPAL DEL ORQUESTADOR
+# ==============================================================================
+
+def orquesta_modelado(
+    familias: list | None = None,
+    fases: list | None = None,
+    workers: int | None = None,
+    hilos: int | None = None,
+    input_path: str | None = None,
+    output_dir_models: str | None = None,
+    mlruns_dir: str | None = None,
+    n_trials: int | None = None,
+    cv_folds: int = 5,
+    arranque_caliente: bool = False,
+    top_k_historico: int = 0,
+    multifidelidad: bool = False,
+    incremental: bool = False,
+    usa_checkpoints: bool = True,
+    modo_curvas: str | None = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+
+    familias    = familias or list(FAMILIAS)
+    fases       = fases or FASES
+    models_root = Path(output_dir_models) if output_dir_models else OUTPUT_DIR_MODELS
+    orq_dir     = models_root / "orquestador"
+    log_dir     = orq_dir / "logs"
+    csv_trabajos = orq_dir / "trabajos.csv"
+    orq_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Presupuesto: W workers × (total // W) hilos
+    # ------------------------------------------------------------------
+    trabajos    = crea_trabajos(familias, fases, incremental)
+    presupuesto = PresupuestoHilos(hilos or presupuesto_hilos().total)
+    workers     = max(1, min(workers or presupuesto.total, len(trabajos), presupuesto.total))
+    hilos_trabajo = presupuesto.por_tarea(workers)
+
+    # Trabajos más largos primero (LPT): reduce el tiempo total del barrido
+    historial = pd.read_csv(csv_trabajos) if csv_trabajos.exists() else pd.DataFrame()
+    trabajos.sort(key=lambda t: estima_duracion(t, historial), reverse=True)
+
+    # El experimento MLflow se crea aquí para que los workers no compitan al crearlo
+    import mlflow
+    mlruns_path = Path(mlruns_dir).resolve() if mlruns_dir else MLRUNS_DIR.resolve()
+    mlflow.set_tracking_uri(mlruns_path.as_uri())
+    mlflow.set_experiment("TFM_Dropout_Prediction")
+
+    if verbose:
+        print("================================================================================")
+        print("  ORQUESTADOR DE MODELADO")
+        print("================================================================================")
+        print(f"  Familias          : {', '.join(familias)}")
+        print(f"  Fases             : {', '.join(fases)}")
+        print(f"  Trabajos          : {len(trabajos)}")
+        print(f"  Presupuesto       : {presupuesto.total} núcleos = {workers} workers × {hilos_trabajo} hilos")
+        print(f"  Logs por trabajo  : {log_dir}")
+
+    opciones = {
+        "input_path":        input_path,
+        "mlruns_dir":        str(mlruns_path),
+        "n_trials":          n_trials,
+        "cv_folds":          cv_folds,
+        "arranque_caliente": arranque_caliente,
+        "top_k_historico":   top_k_historico,
+        "multifidelidad":    multifidelidad,
+        "incremental":       incremental,
+        "usa_checkpoints":   usa_checkpoints,
+        "modo_curvas":       modo_curvas,
+    }
+
+    # ------------------------------------------------------------------
+    # Pool de procesos (spawn: sin estado heredado de OpenMP ni de MLflow)
+    # ------------------------------------------------------------------
+    t0 = time.perf_counter()
+    resultados = []
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as pool:
+        futuros = [
+            pool.submit(ejecuta_trabajo, t, opciones, hilos_trabajo, str(models_root), str(log_dir))
+            for t in trabajos
+        ]
+        for futuro in as_completed(futuros):
+            r = futuro.result()
+            resultados.append(r)
+            if verbose:
+                print(f"  [{r['estado']:<5}] {r['familia']:<9} {r['trabajo']:<9} {r['wall_s']:>9.1f}s"
+                      + (f"  {r['error']}" if r["error"] else ""))
+    wall_total = time.perf_counter() - t0
+
+    df_trabajos = pd.DataFrame(resultados)
+    df_trabajos.to_csv(csv_trabajos, mode="a", header=not csv_trabajos.exists(), index=False)
+
+    # ------------------------------------------------------------------
+    # Fusión de resultados por familia y tabla global
+    # ------------------------------------------------------------------
+    df_global = fusiona_resultados(trabajos, resultados, models_root)
+
+    if verbose:
+        suma = df_trabajos["wall_s"].sum()
+        print(f"\n  Tiempo total      : {wall_total:.1f}s  (suma de trabajos: {suma:.1f}s, "
+              f"speedup {suma / wall_total:.2f}x)")
+        if not df_global.empty:
+            print("\n" + df_global.to_string(index=False))
+            print(f"\n  Resumen comparativo global guardado en: {models_root / 'cv_summary_entrenamiento.csv'}")
+
+    fallidos = df_trabajos[df_trabajos["estado"] != "ok"]
+    if not fallidos.empty:
+        raise RuntimeError(
+            f"{len(fallidos)} trabajo(s) fallidos: "
+            + ", ".join(f"{r.familia}/{r.trabajo}" for r in fallidos.itertuples())
+            + f" (ver logs en {log_dir})"
+        )
+    return df_global
+
+
+# Funcion principal
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entrena todas las familias de modelos en paralelo con un presupuesto de núcleos"
+    )
+    parser.add_argument("--familias", nargs="+", choices=list(FAMILIAS), default=None,
+                        help="Familias a entrenar (default: todas)")
+    parser.add_argument("--fases", nargs="+", choices=FASES, default=None,
+                        help="Fases a entrenar (default: T0 T1 T2)")
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help="Trabajos simultáneos (default: uno por núcleo, hasta el número de trabajos)")
+    parser.add_argument("--hilos", type=int, default=None,
+                        help="Núcleos del presupuesto total (default: THREAD_BUDGET de config, 0 = todos)")
+    parser.add_argument("--input", "-i", type=str, default=None,
+                        help="Ruta al CSV preprocesado")
+    parser.add_argument("--models", "-m", type=str, default=None,
+                        help="Directorio raíz de modelos (default: outputs/models)")
+    parser.add_argument("--mlruns", "-r", type=str, default=None,
+                        help="Directorio de tracking MLflow")
+    parser.add_argument("--n-trials", "-t", type=int, default=None,
+                        help="Trials de Optuna por fase (default: el de cada familia)")
+    parser.add_argument("--cv-folds", "-k", type=int, default=5,
+                        help="Número de folds para Cross-Validation (default: 5)")
+    parser.add_argument("--arranque-caliente", action="store_true",
+                        help="Encola best_params_cv.json (y el top-k histórico) como primeros trials")
+    parser.add_argument("--top-k-historico", type=int, default=0,
+                        help="Trials históricos a encolar con --arranque-caliente (default: 0)")
+    parser.add_argument("--multifidelidad", action="store_true",
+                        help="Evalúa los trials por rungs (submuestras y menos folds) con Hyperband")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Encadena las fases de los boosters (un trabajo por familia)")
+    parser.add_argument("--sin-checkpoints", action="store_true",
+                        help="Recalcula todos los pasos sin leer ni escribir checkpoints")
+    parser.add_argument("--curvas", choices=MODOS_CURVAS, default=None,
+                        help="Curvas de aprendizaje: completa, perezosa o ninguna "
+                             "(default: CURVE_MODE del entorno o completa)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Ejecutar sin mensajes de progreso")
+
+    args = parser.parse_args()
+
+    orquesta_modelado(
+        familias=args.familias,
+        fases=args.fases,
+        workers=args.workers,
+        hilos=args.hilos,
+        input_path=args.input,
+        output_dir_models=args.models,
+        mlruns_dir=args.mlruns,
+        n_trials=args.n_trials,
+        cv_folds=args.cv_folds,
+        arranque_caliente=args.arranque_caliente,
+        top_k_historico=args.top_k_historico,
+        multifidelidad=args.multifidelidad,
+        incremental=args.incremental,
+        usa_checkpoints=not args.sin_checkpoints,
+        modo_curvas=args.curvas,
+        verbose=not args.quiet,
+    )
+
+
+if __name__ == "__main__":
+    main()
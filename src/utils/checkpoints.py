@@ -0,0 +1,234 @@
+"""
+Checkpoints reanudables de los pipelines de modelado
+====================================================
+Este módulo contiene:
+- huella: hash SHA-256 del contenido de las entradas de un paso
+  (DataFrames, Series, arrays, parámetros)
+- sin_hilos: parámetros de modelo sin las claves de número de hilos, que
+  no cambian el resultado y no deben invalidar un checkpoint
+- Checkpoints: resultado de cada paso (familia, fase, paso) guardado en
+  <models_dir>/checkpoints; una nueva ejecución con las mismas entradas, el
+  mismo código (pipeline y módulos compartidos de src/) y las mismas
+  versiones de librerías carga el resultado en lugar de recalcularlo
+- RegistroResultados: log de resultados CV append-only por familia, del que
+  se materializa cv_summary_<familia>.csv una sola vez al final
+
+Si el proceso muere durante la optimización de T2, al relanzarlo se
+reutilizan el baseline, el estudio y el refit de T0 y T1 y se repite
+únicamente el paso interrumpido. Cualquier cambio en los datos, en los
+argumentos del paso, en el fichero del pipeline, en src/data, src/models o
+src/utils, o en la versión de una librería de modelado cambia la huella e
+invalida el checkpoint. Los pasos cargados no repiten sus efectos
+secundarios (figuras, runs de MLflow) salvo los que viven fuera del paso.
+
+Example:
+    >>> checkpoints = Checkpoints(models_dir / "checkpoints", "LightGBM")
+    >>> results_base = checkpoints.ejecuta(
+    ...     fase, "baseline", (X_tr, y_train, cv_folds),
+    ...     entrena_LightGBM, X_tr, y_train, fase, cv_folds, fig_dir,
+    ... )
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO_CHECKPOINTS = "checkpoints"
+LONGITUD_CLAVE         = 16
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Código compartido que importan los pipelines (helpers de CV, esquema, fases...)
+DIRECTORIOS_CODIGO = ["src/data", "src/models", "src/utils"]
+
+# Librerías cuya versión cambia los resultados de un paso
+LIBRERIAS = [
+    "numpy", "pandas", "scikit-learn", "category_encoders", "optuna",
+    "xgboost", "lightgbm", "catboost",
+]
+
+# Parámetros de hilos de los modelos (dependen de --hilos y del orquestador)
+CLAVES_HILOS = ("n_jobs", "thread_count", "nthread", "num_threads")
+
+
+# =============================================================================
+# HUELLAS DE CONTENIDO
+# =============================================================================
+
+def _actualiza(h, obj) -> None:
+    """Añade al hash el contenido de obj (recursivo en listas, tuplas y dicts)."""
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"DataFrame")
+        h.update(json.dumps([str(c) for c in obj.columns]).encode())
+        h.update(json.dumps([str(t) for t in obj.dtypes]).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"Series")
+        h.update(str(obj.name).encode() + str(obj.dtype).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"ndarray" + str(obj.dtype).encode() + str(obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for elemento in obj:
+            _actualiza(h, elemento)
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for k in sorted(obj, key=str):
+            h.update(str(k).encode())
+            _actualiza(h, obj[k])
+    else:
+        h.update(repr(obj).encode())
+
+
+def huella(*entradas) -> str:
+    """Hash SHA-256 (hex) del contenido de las entradas."""
+    h = hashlib.sha256()
+    for entrada in entradas:
+        _actualiza(h, entrada)
+    return h.hexdigest()
+
+
+def sin_hilos(params: dict) -> dict:
+    """Copia de params sin CLAVES_HILOS, para usarla como entrada de un paso."""
+    return {k: v for k, v in params.items() if k not in CLAVES_HILOS}
+
+
+def huella_fichero(ruta: Path) -> str:
+    return hashlib.sha256(Path(ruta).read_bytes()).hexdigest()
+
+
+def huella_entorno(root: Path = PROJECT_ROOT) -> str:
+    """Hash de los módulos compartidos de src/ y de las versiones de LIBRERIAS."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    h = hashlib.sha256()
+    for directorio in DIRECTORIOS_CODIGO:
+        for ruta in sorted((Path(root) / directorio).rglob("*.py")):
+            h.update(str(ruta.relative_to(root)).encode())
+            h.update(ruta.read_bytes())
+    for libreria in LIBRERIAS:
+        try:
+            h.update(f"{libreria}=={version(libreria)}".encode())
+        except PackageNotFoundError:
+            h.update(f"{libreria}==ausente".encode())
+    return h.hexdigest()
+
+
+# =============================================================================
+# CHECKPOINTS POR PASO
+# =============================================================================
+
+class Checkpoints:
+    """
+    Almacén de resultados por (fase, paso) indexado por huella de entradas.
+
+    Con directorio=None los checkpoints están desactivados y ejecuta() se
+    limita a llamar a la función.
+    """
+
+    def __init__(self, directorio: Path | None, familia: str, verbose: bool = True):
+        self.directorio = Path(directorio) if directorio is not None else None
+        self.familia    = familia
+        self.verbose    = verbose
+        self._huellas_codigo = {}
+        self._huella_entorno = None
+
+    @property
+    def activo(self) -> bool:
+        return self.directorio is not None
+
+    def _huella_codigo(self, func) -> str:
+        """Huella del fichero que define func (el pipeline completo)."""
+        codigo = getattr(func, "__code__", None)
+        ruta   = Path(codigo.co_filename) if codigo is not None else None
+        if ruta is None or not ruta.exists():
+            return getattr(func, "__qualname__", repr(func))
+        if ruta not in self._huellas_codigo:
+            self._huellas_codigo[ruta] = huella_fichero(ruta)
+        return self._huellas_codigo[ruta]
+
+    def ruta(self, fase: str, paso: str, clave: str) -> Path:
+        return self.directorio / self.familia / f"{fase}_{paso}_{clave[:LONGITUD_CLAVE]}.joblib"
+
+    def ejecuta(self, fase: str, paso: str, entradas: tuple, func, *args, **kwargs):
+        """
+        Devuelve el resultado guardado del paso si existe uno con la misma
+        huella; en otro caso ejecuta func(*args, **kwargs) y lo guarda.
+
+        entradas son los valores de los que depende el resultado (los
+        argumentos que solo afectan a rutas de salida no deben incluirse).
+        """
+        if not self.activo:
+            return func(*args, **kwargs)
+
+        import joblib
+
+        if self._huella_entorno is None:
+            self._huella_entorno = huella_entorno()
+        clave = huella(self.familia, fase, paso, self._huella_codigo(func), self._huella_entorno,
+                       getattr(func, "__qualname__", ""), entradas)
+        ruta  = self.ruta(fase, paso, clave)
+
+        if ruta.exists():
+            if self.verbose:
+                print(f"  Checkpoint {self.familia}/{fase}/{paso} reutilizado ({ruta.name})")
+            return joblib.load(ruta)
+
+        resultado = func(*args, **kwargs)
+
+        # Escritura atómica: un proceso interrumpido nunca deja un checkpoint a medias
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_suffix(".tmp")
+        joblib.dump(resultado, tmp)
+        os.replace(tmp, ruta)
+        return resultado
+
+    def limpia(self) -> int:
+        """Elimina los checkpoints de la familia. Retorna el número de ficheros borrados."""
+        if not self.activo:
+            return 0
+        rutas = list((self.directorio / self.familia).glob("*.joblib"))
+        for ruta in rutas:
+            ruta.unlink()
+        return len(rutas)
+
+
+# =============================================================================
+# LOG DE RESULTADOS APPEND-ONLY
+# =============================================================================
+
+class RegistroResultados:
+    """
+    Log CSV append-only de los resultados CV de una familia (tabla_folds).
+
+    Cada fila lleva el identificador de la ejecución; resultados() devuelve
+    las de la ejecución en curso, en orden de inserción.
+    """
+
+    COLUMNA_EJECUCION = "ejecucion"
+
+    def __init__(self, ruta: Path):
+        self.ruta      = Path(ruta)
+        self.ejecucion = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    def anade(self, df: pd.DataFrame) -> None:
+        filas = df.assign(**{self.COLUMNA_EJECUCION: self.ejecucion})
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        filas.to_csv(self.ruta, mode="a", header=not self.ruta.exists(), index=False)
+
+    def resultados(self) -> pd.DataFrame:
+        if not self.ruta.exists():
+            return pd.DataFrame()
+        df = pd.read_csv(self.ruta)
+        df = df[df[self.COLUMNA_EJECUCION] == self.ejecucion]
+        return df.drop(columns=self.COLUMNA_EJECUCION).reset_index(drop=True)
@@ -1,8 +1,24 @@
 import os
-from dotenv import load_dotenv
+from functools import cached_property
+
+# ==================================================
+# Lazy configuration
+# ==================================================
+# Importing this module has no side effects: the .env file is loaded and each
+# variable is read (and validated, if required) the first time it is used.
+# Module attributes (config.PROJECT_NAME, from src.utils.config import
+# THREAD_BUDGET) resolve through `settings`, so existing callers still work.
+_dotenv_loaded = False
+
+
+def load_env():
+    """Load the .env file once, on first access to a setting."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
 
-# Load the .env file
-load_dotenv()
 
 # ==================================================
 # Helper function: safer access to environment vars
@@ -13,6 +29,7 @@ def get_env(name, default=None, required=False):
     If required=True, raises error if missing.
     If default provided, returns it when variable missing.
     """
+    load_env()
     value = os.getenv(name, default)
 
     if required and value is None:
@@ -21,50 +38,128 @@ def get_env(name, default=None, required=False):
     return value
 
 
-# ==================================================
-# PROJECT CONFIG
-# ==================================================
-PROJECT_NAME = get_env("PROJECT_NAME", required=True)
-ENVIRONMENT = get_env("ENVIRONMENT", "development")
-RANDOM_STATE = int(get_env("RANDOM_STATE", 42))
-
-
-# ==================================================
-# DATA CONFIG
-# ==================================================
-RAW_DATA_PATH = get_env("RAW_DATA_PATH", required=True)
-PROCESSED_DATA_PATH = get_env("PROCESSED_DATA_PATH")
-FEATURES_DATA_PATH = get_env("FEATURES_DATA_PATH")
-TARGET_COLUMN = get_env("TARGET_COLUMN", "Target")
-
-
-# ==================================================
-# MLFLOW CONFIGURATION
-# ==================================================
-MLFLOW_TRACKING_URI = get_env("MLFLOW_TRACKING_URI")
-MLFLOW_EXPERIMENT_NAME = get_env("MLFLOW_EXPERIMENT_NAME", "TFM_Experiments")
-MLFLOW_ARTIFACT_URI = get_env("MLFLOW_ARTIFACT_URI", "mlruns")
-
-
-# ==================================================
-# DVC REMOTE CONFIGURATION
-# ==================================================
-DVC_REMOTE = get_env("DVC_REMOTE", "gdrive_remote")
-GDRIVE_FOLDER_ID = get_env("GDRIVE_FOLDER_ID")  # Optional for now
-
-
-# ==================================================
-# MODEL STORAGE CONFIG
-# ==================================================
-MODEL_DIR = get_env("MODEL_DIR", "models")
-MODEL_NAME = get_env("MODEL_NAME")   # can be empty for now
+class Settings:
+    """
+    Project settings, read from the environment on first access and cached.
 
+    A missing required variable only raises when that variable is used, so
+    processes that never need it (scoring, quality checks, --help) start
+    without a complete .env. Call reload() to re-read the environment.
+    """
 
-# ==================================================
-# CLASS IMBALANCE / SMOTE CONFIG
-# ==================================================
-USE_SMOTE = get_env("USE_SMOTE", "False").lower() == "true"
-SMOTE_SAMPLING_STRATEGY = get_env("SMOTE_SAMPLING_STRATEGY")
+    # ==================================================
+    # PROJECT CONFIG
+    # ==================================================
+    @cached_property
+    def PROJECT_NAME(self):
+        return get_env("PROJECT_NAME", required=True)
+
+    @cached_property
+    def ENVIRONMENT(self):
+        return get_env("ENVIRONMENT", "development")
+
+    @cached_property
+    def RANDOM_STATE(self):
+        return int(get_env("RANDOM_STATE", 42))
+
+    # ==================================================
+    # DATA CONFIG
+    # ==================================================
+    @cached_property
+    def RAW_DATA_PATH(self):
+        return get_env("RAW_DATA_PATH", required=True)
+
+    @cached_property
+    def PROCESSED_DATA_PATH(self):
+        return get_env("PROCESSED_DATA_PATH")
+
+    @cached_property
+    def FEATURES_DATA_PATH(self):
+        return get_env("FEATURES_DATA_PATH")
+
+    @cached_property
+    def TARGET_COLUMN(self):
+        return get_env("TARGET_COLUMN", "Target")
+
+    # ==================================================
+    # MLFLOW CONFIGURATION
+    # ==================================================
+    @cached_property
+    def MLFLOW_TRACKING_URI(self):
+        return get_env("MLFLOW_TRACKING_URI")
+
+    @cached_property
+    def MLFLOW_EXPERIMENT_NAME(self):
+        return get_env("MLFLOW_EXPERIMENT_NAME", "TFM_Experiments")
+
+    @cached_property
+    def MLFLOW_ARTIFACT_URI(self):
+        return get_env("MLFLOW_ARTIFACT_URI", "mlruns")
+
+    # ==================================================
+    # DVC REMOTE CONFIGURATION
+    # ==================================================
+    @cached_property
+    def DVC_REMOTE(self):
+        return get_env("DVC_REMOTE", "gdrive_remote")
+
+    @cached_property
+    def GDRIVE_FOLDER_ID(self):
+        return get_env("GDRIVE_FOLDER_ID")  # Optional for now
+
+    # ==================================================
+    # MODEL STORAGE CONFIG
+    # ==================================================
+    @cached_property
+    def MODEL_DIR(self):
+        return get_env("MODEL_DIR", "models")
+
+    @cached_property
+    def MODEL_NAME(self):
+        return get_env("MODEL_NAME")   # can be empty for now
+
+    # ==================================================
+    # CLASS IMBALANCE / SMOTE CONFIG
+    # ==================================================
+    @cached_property
+    def USE_SMOTE(self):
+        return get_env("USE_SMOTE", "False").lower() == "true"
+
+    @cached_property
+    def SMOTE_SAMPLING_STRATEGY(self):
+        return get_env("SMOTE_SAMPLING_STRATEGY")
+
+    # ==================================================
+    # THREAD BUDGET CONFIG
+    # ==================================================
+    # Total cores this process may use (0 = all cores). Lower it when several
+    # DVC stages or Optuna processes run at the same time on the same machine.
+    @cached_property
+    def THREAD_BUDGET(self):
+        return int(get_env("THREAD_BUDGET", 0))
+
+    # Concurrent Optuna trials per study; each trial gets THREAD_BUDGET // n cores
+    @cached_property
+    def OPTUNA_PARALLEL_TRIALS(self):
+        return int(get_env("OPTUNA_PARALLEL_TRIALS", 1))
+
+    def reload(self):
+        """Forget cached values; the next access re-reads the environment."""
+        self.__dict__.clear()
+
+
+settings = Settings()
+
+SETTING_NAMES = tuple(
+    name for name, value in vars(Settings).items() if isinstance(value, cached_property)
+)
+
+
+def __getattr__(name):
+    # Module-level access (config.THREAD_BUDGET) evaluates the setting lazily
+    if name in SETTING_NAMES:
+        return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==================================================
@@ -72,12 +167,14 @@ SMOTE_SAMPLING_STRATEGY = get_env("SMOTE_SAMPLING_STRATEGY")
 # ==================================================
 def print_config():
     print("========== CONFIGURATION LOADED ==========")
-    print(f"Project: {PROJECT_NAME}")
-    print(f"Environment: {ENVIRONMENT}")
-    print(f"Random State: {RANDOM_STATE}")
-    print(f"Raw Data Path: {RAW_DATA_PATH}")
-    print(f"Processed Data Path: {PROCESSED_DATA_PATH}")
-    print(f"MLflow URI: {MLFLOW_TRACKING_URI}")
-    print(f"DVC Remote: {DVC_REMOTE}")
-    print(f"Use SMOTE: {USE_SMOTE}")
+    print(f"Project: {settings.PROJECT_NAME}")
+    print(f"Environment: {settings.ENVIRONMENT}")
+    print(f"Random State: {settings.RANDOM_STATE}")
+    print(f"Raw Data Path: {settings.RAW_DATA_PATH}")
+    print(f"Processed Data Path: {settings.PROCESSED_DATA_PATH}")
+    print(f"MLflow URI: {settings.MLFLOW_TRACKING_URI}")
+    print(f"DVC Remote: {settings.DVC_REMOTE}")
+    print(f"Use SMOTE: {settings.USE_SMOTE}")
+    print(f"Thread Budget: {settings.THREAD_BUDGET or 'all cores'}")
+    print(f"Optuna Parallel Trials: {settings.OPTUNA_PARALLEL_TRIALS}")
     print("==========================================")
@@ -37,16 +37,17 @@ VARS_CATEGORICAS_ORDINALES = [
     "application_order"
 ]
 
-VARS_NUMERICAS = [
-    # Continuas
+VARS_NUMERICAS_CONTINUAS = [
     "previous_qualification_grade",
     "admission_grade",
     "curricular_units_1st_sem_grade",
     "curricular_units_2nd_sem_grade",
     "unemployment_rate",
     "inflation_rate",
-    "gdp",
-    # Discretas
+    "gdp"
+]
+
+VARS_NUMERICAS_DISCRETAS = [
     "age_at_enrollment",
     "curricular_units_1st_sem_credited",
     "curricular_units_1st_sem_enrolled",
@@ -60,11 +61,46 @@ VARS_NUMERICAS = [
     "curricular_units_2nd_sem_without_evaluations"
 ]
 
+VARS_NUMERICAS = VARS_NUMERICAS_CONTINUAS + VARS_NUMERICAS_DISCRETAS
+
 TARGET = ["target"]
 
 TARGET_VALUES = ["Dropout", "Graduate", "Enrolled"]
 
 
+# =============================================================================
+# VARIABLES DERIVADAS (PREPROCESAMIENTO)
+# =============================================================================
+VARS_BINARIAS_DERIVADAS = [
+    "is_single"
+]
+
+TARGET_BINARIO = "target_binario"
+
+# Niveles de las agrupaciones de 3_preprocesamiento.py (agrupar_*)
+NIVELES_RIESGO = ["Alto_Riesgo", "Riesgo_Medio", "Bajo_Riesgo"]
+
+NIVELES_QUALIFICATION = [
+    "Desconocido",
+    "Sin_Educacion",
+    "Basica_Baja",
+    "Basica_Media",
+    "Secundaria",
+    "Superior"
+]
+
+NIVELES_OCCUPATION = ["Sin_Info", "Estudiante", "Profesional", "Otro_Trabajo"]
+
+NIVELES_AGRUPADOS = {
+    "application_mode_risk":       NIVELES_RIESGO,
+    "previous_qualification_risk": NIVELES_RIESGO,
+    "mothers_qualification_level": NIVELES_QUALIFICATION,
+    "fathers_qualification_level": NIVELES_QUALIFICATION,
+    "mothers_occupation_level":    NIVELES_OCCUPATION,
+    "fathers_occupation_level":    NIVELES_OCCUPATION
+}
+
+
 # =============================================================================
 # DICCIONARIOS DE ETIQUETAS (LABELS)
 # =============================================================================
@@ -0,0 +1,34 @@
+"""
+matplotlib bajo demanda
+=======================
+Este módulo contiene:
+- pyplot: matplotlib.pyplot con backend Agg, importado en la primera llamada
+  y, opcionalmente, con el estilo de visualización del proyecto
+
+Los pipelines y el motor SHAP importaban matplotlib en la cabecera, así que
+--help, el orquestador o un proceso que solo puntúa pagaban su carga sin
+dibujar nada. Las funciones de gráficos piden plt al empezar.
+
+Example:
+    >>> plt = pyplot(ESTILO_GRAFICOS)
+    >>> fig, ax = plt.subplots(figsize=(10, 6))
+"""
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+ESTILO_GRAFICOS = "seaborn-v0_8-whitegrid"
+
+_estilos_aplicados = set()
+
+
+def pyplot(estilo: str | None = None):
+    """matplotlib.pyplot (backend Agg) con el estilo aplicado una vez por proceso."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if estilo is not None and estilo not in _estilos_aplicados:
+        plt.style.use(estilo)
+        _estilos_aplicados.add(estilo)
+    return plt
@@ -0,0 +1,118 @@
+"""
+Presupuesto global de hilos
+===========================
+Este módulo contiene:
+- PresupuestoHilos: reparte los núcleos del proceso entre las tareas
+  concurrentes (trials de Optuna en paralelo) y devuelve el número de
+  hilos que corresponde a cada una
+- hilos_modelo: parámetro explícito de hilos por familia (n_jobs o
+  thread_count) para construir los modelos
+- limita / aplica: límite de threadpoolctl para BLAS y OpenMP (NumPy,
+  scikit-learn, LightGBM, XGBoost) durante un bloque o el resto del proceso
+- presupuesto_hilos(): instancia del proceso, configurada desde
+  src/utils/config.py (THREAD_BUDGET, OPTUNA_PARALLEL_TRIALS)
+
+Con n_jobs=-1 en cada modelo, k trials concurrentes (o k etapas DVC en la
+misma máquina) lanzan k × n_cpu hilos y compiten por los mismos núcleos.
+Con el presupuesto cada tarea recibe total // k núcleos, tanto en los
+modelos como en las librerías nativas, y la suma nunca excede el total.
+
+Example:
+    >>> presupuesto = presupuesto_hilos()
+    >>> params = {**params, **presupuesto.hilos_modelo("LightGBM", trials_paralelos)}
+    >>> with presupuesto.limita(trials_paralelos):
+    ...     study.optimize(objective, n_trials=n_trials, n_jobs=trials_paralelos)
+"""
+
+import os
+from contextlib import contextmanager, nullcontext
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+# Parámetro de hilos de cada familia de modelos
+PARAMETRO_HILOS = {
+    "RL":       "n_jobs",
+    "RF":       "n_jobs",
+    "XGBoost":  "n_jobs",
+    "LightGBM": "n_jobs",
+    "CatBoost": "thread_count",
+}
+
+
+def _configuracion() -> tuple:
+    """(THREAD_BUDGET, OPTUNA_PARALLEL_TRIALS) de config.py o del entorno."""
+    from src.utils.config import settings
+    try:
+        return settings.THREAD_BUDGET, settings.OPTUNA_PARALLEL_TRIALS
+    except ImportError:
+        # Sin python-dotenv se leen las mismas variables directamente del entorno
+        return int(os.getenv("THREAD_BUDGET", 0)), int(os.getenv("OPTUNA_PARALLEL_TRIALS", 1))
+
+
+class PresupuestoHilos:
+    """Núcleos disponibles para el proceso y su reparto entre tareas concurrentes."""
+
+    def __init__(self, total: int | None = None, trials_paralelos: int = 1):
+        self.total            = total if total and total > 0 else (os.cpu_count() or 1)
+        self.trials_paralelos = max(1, trials_paralelos)
+        self._limite_global   = None
+
+    def por_tarea(self, concurrencia: int = 1) -> int:
+        """Hilos de cada una de `concurrencia` tareas simultáneas (mínimo 1)."""
+        return max(1, self.total // max(1, concurrencia))
+
+    def hilos_modelo(self, familia: str, concurrencia: int = 1) -> dict:
+        """{"n_jobs": h} o {"thread_count": h} según la familia."""
+        return {PARAMETRO_HILOS[familia]: self.por_tarea(concurrencia)}
+
+    @contextmanager
+    def limita(self, concurrencia: int = 1):
+        """Limita BLAS/OpenMP a por_tarea(concurrencia) hilos durante el bloque."""
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            limite = nullcontext()
+        else:
+            limite = threadpool_limits(limits=self.por_tarea(concurrencia))
+        with limite:
+            yield self.por_tarea(concurrencia)
+
+    def aplica(self) -> int:
+        """Limita BLAS/OpenMP al total del presupuesto para el resto del proceso."""
+        hilos = self.por_tarea(1)
+        # Procesos hijos (loky, multiprocessing) heredan el límite por entorno
+        for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ.setdefault(variable, str(hilos))
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            return hilos
+        self._limite_global = threadpool_limits(limits=hilos)
+        return hilos
+
+
+# =============================================================================
+# INSTANCIA DEL PROCESO
+# =============================================================================
+_PRESUPUESTO = None
+
+
+def presupuesto_hilos() -> PresupuestoHilos:
+    """Devuelve el presupuesto del proceso, creándolo desde config la primera vez."""
+    global _PRESUPUESTO
+    if _PRESUPUESTO is None:
+        total, trials_paralelos = _configuracion()
+        _PRESUPUESTO = PresupuestoHilos(total, trials_paralelos)
+    return _PRESUPUESTO
+
+
+def configura_presupuesto_hilos(total: int | None = None,
+                                trials_paralelos: int | None = None) -> PresupuestoHilos:
+    """Sobrescribe (p. ej. desde la CLI) los valores de config.py que no sean None."""
+    presupuesto = presupuesto_hilos()
+    if total:
+        presupuesto.total = total
+    if trials_paralelos:
+        presupuesto.trials_paralelos = max(1, trials_paralelos)
+    return presupuesto
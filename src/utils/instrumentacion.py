@@ -0,0 +1,327 @@
+"""
+Instrumentación de etapas de los pipelines
+==========================================
+Este módulo contiene:
+- Instrumentador: registra tiempo real, tiempo de CPU y pico de RSS por
+  etapa (carga, preprocesamiento, CV, trials Optuna, refit, gráficos,
+  guardado)
+- Anidamiento por hilo: cada hilo tiene su pila de etapas; las etapas de un
+  hilo sin etapas abiertas (trials con trials_paralelos > 1) cuelgan de la
+  etapa abierta del hilo principal
+
+cpu_s es CPU del proceso (os.times, incluidos hijos): con trials en hilos
+concurrentes incluye la CPU de todos ellos. cpu_hilo_s (time.thread_time)
+es la CPU del hilo que ejecuta la etapa; no incluye los hilos nativos de
+las librerías (OpenMP) ni los procesos hijos.
+- Funciones de módulo (etapa, instrumentado, instrumenta_objetivo) que
+  actúan sobre el instrumentador activo y no hacen nada si no hay ninguno
+- Persistencia por ejecución en JSON/CSV y registro como métricas MLflow
+
+Example:
+    >>> inicia_instrumentacion("modelado_LightGBM")
+    >>> with etapa("preprocesamiento", fase="T1"):
+    ...     X_tr, X_te, features, prep = preprocesamiento_LightGBM(...)
+    >>> finaliza_instrumentacion(mlruns_uri)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+PROJECT_ROOT        = Path(__file__).resolve().parents[2]
+INSTRUMENTACION_DIR = PROJECT_ROOT / "outputs" / "instrumentacion"
+MLRUNS_DIR          = PROJECT_ROOT / "mlruns"
+EXPERIMENTO_MLFLOW  = "TFM_Dropout_Prediction"
+
+INTERVALO_MUESTREO_S = 0.05
+
+
+# =============================================================================
+# MEDICIÓN DE RECURSOS
+# =============================================================================
+
+def _tiempo_cpu() -> float:
+    """CPU de usuario + sistema del proceso y de sus hijos (joblib/loky)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _rss_mb() -> float:
+    """RSS actual; sin psutil se usa el pico del proceso (ru_maxrss)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 1024 ** 2 if sys.platform == "darwin" else maxrss / 1024
+
+
+# =============================================================================
+# INSTRUMENTADOR
+# =============================================================================
+
+class Instrumentador:
+    """
+    Registro de etapas de una ejecución.
+
+    Un hilo muestrea el RSS cada `intervalo_muestreo` segundos mientras haya
+    etapas abiertas y actualiza el pico de todas ellas, de modo que las
+    etapas anidadas (p. ej. un trial dentro de la optimización) tienen cada
+    una su propio pico.
+    """
+
+    def __init__(self, nombre: str, output_dir: Path = INSTRUMENTACION_DIR,
+                 intervalo_muestreo: float = INTERVALO_MUESTREO_S):
+        self.nombre     = nombre
+        self.output_dir = Path(output_dir)
+        self.run_id     = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.intervalo  = intervalo_muestreo
+        self.registros  = []
+
+        self._abiertas  = {}
+        self._local     = threading.local()
+        self._pila_raiz = []
+        self._lock      = threading.Lock()
+        self._parar     = threading.Event()
+        self._hilo      = None
+        self._contador  = 0
+
+    # ------------------------------------------------------------------
+    # Muestreo de memoria
+    # ------------------------------------------------------------------
+    def _muestrea(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            rss = _rss_mb()
+            with self._lock:
+                for id_etapa in self._abiertas:
+                    self._abiertas[id_etapa] = max(self._abiertas[id_etapa], rss)
+
+    def _asegura_hilo(self) -> None:
+        if self._hilo is None or not self._hilo.is_alive():
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self._muestrea, daemon=True)
+            self._hilo.start()
+
+    def detiene(self) -> None:
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+    def _pila(self) -> list:
+        """Pila de etapas del hilo actual (la del hilo principal es la raíz)."""
+        if threading.current_thread() is threading.main_thread():
+            return self._pila_raiz
+        if not hasattr(self._local, "pila"):
+            self._local.pila = []
+        return self._local.pila
+
+    @contextmanager
+    def etapa(self, nombre: str, **etiquetas):
+        rss_inicio = _rss_mb()
+        pila = self._pila()
+        with self._lock:
+            self._contador += 1
+            id_etapa = self._contador
+            if pila:
+                padre = pila[-1]
+            else:
+                padre = self._pila_raiz[-1] if self._pila_raiz else None
+            pila.append(id_etapa)
+            self._abiertas[id_etapa] = rss_inicio
+        self._asegura_hilo()
+
+        inicio    = datetime.now().isoformat(timespec="seconds")
+        wall_0    = time.perf_counter()
+        cpu_0     = _tiempo_cpu()
+        hilo_0    = time.thread_time()
+        error     = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            wall = time.perf_counter() - wall_0
+            cpu  = _tiempo_cpu() - cpu_0
+            cpu_hilo = time.thread_time() - hilo_0
+            rss_fin = _rss_mb()
+            with self._lock:
+                pico = max(self._abiertas.pop(id_etapa), rss_fin)
+                pila.remove(id_etapa)
+            self.registros.append({
+                "run_id":      self.run_id,
+                "pipeline":    self.nombre,
+                "id":          id_etapa,
+                "padre":       padre,
+                "etapa":       nombre,
+                **etiquetas,
+                "inicio":      inicio,
+                "wall_s":      round(wall, 6),
+                "cpu_s":       round(cpu, 6),
+                "cpu_hilo_s":  round(cpu_hilo, 6),
+                "rss_inicio_mb": round(rss_inicio, 2),
+                "rss_pico_mb": round(pico, 2),
+                "error":       error,
+            })
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    def resumen(self):
+        """Agregado por etapa (y fase, si existe): suma de tiempos y pico de RSS."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.registros)
+        if df.empty:
+            return df
+        df["fase"] = df["fase"].fillna("-") if "fase" in df.columns else "-"
+        return df.groupby(["etapa", "fase"], sort=False).agg(
+            n=("wall_s", "size"),
+            wall_s=("wall_s", "sum"),
+            cpu_s=("cpu_s", "sum"),
+            cpu_hilo_s=("cpu_hilo_s", "sum"),
+            rss_pico_mb=("rss_pico_mb", "max"),
+        ).reset_index()
+
+    def guarda(self) -> tuple:
+        """Escribe <pipeline>_<run_id>.json (registros) y .csv (resumen)."""
+        import pandas as pd
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"{self.nombre}_{self.run_id}"
+
+        with open(base.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {"pipeline": self.nombre, "run_id": self.run_id, "etapas": self.registros},
+                f, indent=2, default=str,
+            )
+        pd.DataFrame(self.registros).to_csv(base.with_suffix(".csv"), index=False)
+        return base.with_suffix(".json"), base.with_suffix(".csv")
+
+    def registra_mlflow(self, mlruns_uri: str | None = None,
+                        experimento: str = EXPERIMENTO_MLFLOW, artefactos: tuple = ()) -> None:
+        """Registra el resumen como métricas de un run 'instrumentacion_<pipeline>'."""
+        import mlflow
+
+        mlflow.set_tracking_uri(mlruns_uri or MLRUNS_DIR.resolve().as_uri())
+        mlflow.set_experiment(experimento)
+
+        metricas = {}
+        for fila in self.resumen().to_dict(orient="records"):
+            sufijo = fila["etapa"] if fila.get("fase", "-") == "-" else f"{fila['etapa']}_{fila['fase']}"
+            metricas[f"wall_s_{sufijo}"]      = float(fila["wall_s"])
+            metricas[f"cpu_s_{sufijo}"]       = float(fila["cpu_s"])
+            metricas[f"cpu_hilo_s_{sufijo}"]  = float(fila["cpu_hilo_s"])
+            metricas[f"rss_pico_mb_{sufijo}"] = float(fila["rss_pico_mb"])
+            metricas[f"n_{sufijo}"]           = float(fila["n"])
+
+        with mlflow.start_run(run_name=f"instrumentacion_{self.nombre}"):
+            mlflow.set_tag("tipo", "Instrumentacion")
+            mlflow.set_tag("pipeline", self.nombre)
+            mlflow.log_param("run_id_instrumentacion", self.run_id)
+            mlflow.log_metrics(metricas)
+            for ruta in artefactos:
+                mlflow.log_artifact(str(ruta))
+
+
+# =============================================================================
+# INSTRUMENTADOR ACTIVO
+# =============================================================================
+_ACTIVO = None
+
+
+def inicia_instrumentacion(nombre: str, output_dir: Path | None = None) -> Instrumentador:
+    """Crea el instrumentador de la ejecución y lo deja activo."""
+    global _ACTIVO
+    _ACTIVO = Instrumentador(nombre, output_dir or INSTRUMENTACION_DIR)
+    return _ACTIVO
+
+
+def finaliza_instrumentacion(mlruns_uri: str | None = None, registra_mlflow: bool = True,
+                             verbose: bool = True) -> Instrumentador | None:
+    """Guarda JSON/CSV, registra en MLflow y desactiva el instrumentador."""
+    global _ACTIVO
+    inst, _ACTIVO = _ACTIVO, None
+    if inst is None:
+        return None
+
+    inst.detiene()
+    rutas = inst.guarda()
+    if registra_mlflow:
+        # Un fallo del tracking store al final no debe perder una ejecución
+        # completa: los registros ya están en disco
+        try:
+            inst.registra_mlflow(mlruns_uri, artefactos=rutas)
+        except ImportError:
+            pass
+        except Exception as exc:
+            print(f"   Aviso: no se pudo registrar la instrumentación en MLflow "
+                  f"({type(exc).__name__}: {exc})")
+
+    if verbose:
+        print("\n" + "================================================================================")
+        print(f"  INSTRUMENTACIÓN — {inst.nombre}")
+        print("================================================================================")
+        print(inst.resumen().to_string(index=False))
+        print(f"\n  Registros guardados en: {rutas[0]}")
+    return inst
+
+
+def instrumentador_activo() -> Instrumentador | None:
+    return _ACTIVO
+
+
+@contextmanager
+def instrumentacion_temporal(nombre: str):
+    """Activa un instrumentador sin persistirlo ni registrarlo (benchmarks)."""
+    global _ACTIVO
+    previo, _ACTIVO = _ACTIVO, Instrumentador(nombre)
+    inst = _ACTIVO
+    try:
+        yield inst
+    finally:
+        inst.detiene()
+        _ACTIVO = previo
+
+
+def etapa(nombre: str, **etiquetas):
+    """Context manager de etapa sobre el instrumentador activo (no-op si no hay)."""
+    if _ACTIVO is None:
+        return nullcontext()
+    return _ACTIVO.etapa(nombre, **etiquetas)
+
+
+def instrumentado(nombre: str | None = None):
+    """Decorador equivalente a envolver la función en etapa(nombre)."""
+    def decorador(func):
+        nombre_etapa = nombre or func.__name__
+
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            with etapa(nombre_etapa):
+                return func(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def instrumenta_objetivo(objective, **etiquetas):
+    """Envuelve una función objetivo de Optuna para registrar cada trial."""
+    @functools.wraps(objective)
+    def envoltura(trial):
+        with etapa("optuna_trial", trial=trial.number, **etiquetas):
+            return objective(trial)
+    return envoltura
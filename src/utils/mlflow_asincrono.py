@@ -0,0 +1,321 @@
+"""
+Registro asíncrono y por lotes en MLflow
+========================================
+Este módulo contiene:
+- RegistroMLflowAsincrono: cola FIFO de operaciones (crear run, tags,
+  params, métricas, artefactos, cerrar run) que consume un hilo en segundo
+  plano; las operaciones consecutivas de un mismo run se agrupan en log_batch
+- RunAsincrono: fachada con la interfaz de mlflow (set_tag, log_param(s),
+  log_metric(s), log_artifact) que solo encola
+- Vaciado de la cola al salir (atexit) y estadísticas del tiempo de E/S
+  retirado de la ruta crítica
+
+El orden de las operaciones se conserva: la cola es FIFO y solo se agrupan
+operaciones contiguas del mismo run. Los errores del tracking store no
+interrumpen el entrenamiento; se acumulan en `errores` y se informan al
+vaciar la cola.
+
+Example:
+    >>> with registro_mlflow().inicia_run("LightGBM_CV5_T1") as run:
+    ...     run.set_tag("modelo", "Params por default")
+    ...     run.log_params(modelo.get_params())
+    ...     run.log_metric("test_f1_mean", 0.81)
+    >>> finaliza_registro_mlflow()
+"""
+
+import time
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+EXPERIMENTO_MLFLOW = "TFM_Dropout_Prediction"
+
+# Límites de MlflowClient.log_batch por llamada
+MAX_PARAMS_LOTE   = 100
+MAX_TAGS_LOTE     = 100
+MAX_METRICAS_LOTE = 1000
+
+_OPERACIONES_LOTE = ("tags", "params", "metricas")
+_FIN = object()
+
+
+# =============================================================================
+# RUN ASÍNCRONO
+# =============================================================================
+
+class RunAsincrono:
+    """Run de MLflow cuyas operaciones se encolan; el run_id llega al crearse."""
+
+    def __init__(self, registro: "RegistroMLflowAsincrono", run_name: str):
+        self.run_name  = run_name
+        self.run_id    = None
+        self._registro = registro
+        self._cliente  = None
+        self._creado   = threading.Event()
+
+    def set_tag(self, clave: str, valor) -> None:
+        self._registro._encola(("tags", self, {clave: str(valor)}))
+
+    def set_tags(self, tags: dict) -> None:
+        self._registro._encola(("tags", self, {k: str(v) for k, v in tags.items()}))
+
+    def log_param(self, clave: str, valor) -> None:
+        self._registro._encola(("params", self, {clave: str(valor)}))
+
+    def log_params(self, params: dict) -> None:
+        self._registro._encola(("params", self, {k: str(v) for k, v in params.items()}))
+
+    def log_metric(self, clave: str, valor: float, step: int = 0) -> None:
+        self.log_metrics({clave: valor}, step)
+
+    def log_metrics(self, metricas: dict, step: int = 0) -> None:
+        timestamp = int(time.time() * 1000)
+        self._registro._encola((
+            "metricas", self, {k: float(v) for k, v in metricas.items()}, step, timestamp
+        ))
+
+    def log_artifact(self, ruta, artifact_path: str | None = None) -> None:
+        self._registro._encola(("artefacto", self, str(ruta), artifact_path))
+
+    def espera_run_id(self, timeout: float | None = None) -> str | None:
+        """Bloquea hasta que el hilo ha creado el run (o vence el timeout)."""
+        self._creado.wait(timeout)
+        return self.run_id
+
+
+# =============================================================================
+# REGISTRO ASÍNCRONO
+# =============================================================================
+
+class RegistroMLflowAsincrono:
+    """
+    Cola de operaciones MLflow con un hilo consumidor.
+
+    El hilo se crea con la primera operación. Cada run guarda el tracking
+    URI vigente al abrirlo, de modo que cambios posteriores de
+    mlflow.set_tracking_uri no afectan a operaciones ya encoladas.
+    """
+
+    def __init__(self, tracking_uri: str | None = None, experimento: str = EXPERIMENTO_MLFLOW):
+        self.tracking_uri = tracking_uri
+        self.experimento  = experimento
+        self.errores      = []
+
+        self._cola     = queue.Queue()
+        self._hilo     = None
+        self._lock     = threading.Lock()
+        self._clientes = {}
+        self._stats    = {
+            "operaciones":       0,
+            "lotes":             0,
+            "tiempo_encolado_s": 0.0,
+            "tiempo_io_s":       0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Productor
+    # ------------------------------------------------------------------
+    def _encola(self, operacion: tuple) -> None:
+        t0 = time.perf_counter()
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._consume, daemon=True)
+                self._hilo.start()
+        self._cola.put(operacion)
+        with self._lock:
+            self._stats["operaciones"]       += 1
+            self._stats["tiempo_encolado_s"] += time.perf_counter() - t0
+
+    @contextmanager
+    def inicia_run(self, run_name: str, tags: dict | None = None, experimento: str | None = None):
+        """Equivalente asíncrono de mlflow.start_run; cierra el run al salir."""
+        import mlflow
+
+        run = RunAsincrono(self, run_name)
+        uri = self.tracking_uri or mlflow.get_tracking_uri()
+        self._encola((
+            "crea", run, uri, experimento or self.experimento,
+            {k: str(v) for k, v in (tags or {}).items()},
+        ))
+        estado = "FINISHED"
+        try:
+            yield run
+        except BaseException:
+            estado = "FAILED"
+            raise
+        finally:
+            self._encola(("fin", run, estado))
+
+    # ------------------------------------------------------------------
+    # Consumidor
+    # ------------------------------------------------------------------
+    def _consume(self) -> None:
+        siguiente = None
+        while True:
+            operacion = siguiente if siguiente is not None else self._cola.get()
+            siguiente = None
+            if operacion is _FIN:
+                self._cola.task_done()
+                return
+
+            # Agrupa operaciones contiguas de log del mismo run ya encoladas
+            lote = [operacion]
+            if operacion[0] in _OPERACIONES_LOTE:
+                while True:
+                    try:
+                        candidata = self._cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    if (candidata is not _FIN and candidata[0] in _OPERACIONES_LOTE
+                            and candidata[1] is operacion[1]):
+                        lote.append(candidata)
+                    else:
+                        siguiente = candidata
+                        break
+
+            t0 = time.perf_counter()
+            try:
+                self._ejecuta(lote)
+            except Exception as e:
+                self.errores.append(f"{operacion[1].run_name} ({operacion[0]}): {e}")
+            finally:
+                with self._lock:
+                    self._stats["tiempo_io_s"] += time.perf_counter() - t0
+                for _ in lote:
+                    self._cola.task_done()
+
+    def _cliente(self, uri: str):
+        if uri not in self._clientes:
+            from mlflow.tracking import MlflowClient
+            self._clientes[uri] = MlflowClient(tracking_uri=uri)
+        return self._clientes[uri]
+
+    def _ejecuta(self, lote: list) -> None:
+        tipo, run = lote[0][0], lote[0][1]
+
+        if tipo == "crea":
+            _, _, uri, experimento, tags = lote[0]
+            try:
+                cliente = self._cliente(uri)
+                exp     = cliente.get_experiment_by_name(experimento)
+                exp_id  = exp.experiment_id if exp else cliente.create_experiment(experimento)
+                run._cliente = cliente
+                run.run_id   = cliente.create_run(exp_id, tags=tags, run_name=run.run_name).info.run_id
+            finally:
+                run._creado.set()
+            return
+
+        if run.run_id is None:
+            raise RuntimeError("run no creado; operación descartada")
+
+        if tipo == "fin":
+            run._cliente.set_terminated(run.run_id, status=lote[0][2])
+        elif tipo == "artefacto":
+            run._cliente.log_artifact(run.run_id, lote[0][2], lote[0][3])
+        else:
+            self._log_batch(run, lote)
+
+    def _log_batch(self, run: RunAsincrono, lote: list) -> None:
+        from mlflow.entities import Metric, Param, RunTag
+
+        params, tags, metricas = {}, {}, []
+        for operacion in lote:
+            if operacion[0] == "params":
+                params.update(operacion[2])
+            elif operacion[0] == "tags":
+                tags.update(operacion[2])
+            else:
+                _, _, valores, step, timestamp = operacion
+                metricas.extend(Metric(k, v, timestamp, step) for k, v in valores.items())
+
+        params = [Param(k, v) for k, v in params.items()]
+        tags   = [RunTag(k, v) for k, v in tags.items()]
+
+        i_p = i_t = i_m = 0
+        while i_p < len(params) or i_t < len(tags) or i_m < len(metricas):
+            run._cliente.log_batch(
+                run.run_id,
+                metrics=metricas[i_m:i_m + MAX_METRICAS_LOTE],
+                params=params[i_p:i_p + MAX_PARAMS_LOTE],
+                tags=tags[i_t:i_t + MAX_TAGS_LOTE],
+            )
+            i_p += MAX_PARAMS_LOTE
+            i_t += MAX_TAGS_LOTE
+            i_m += MAX_METRICAS_LOTE
+            with self._lock:
+                self._stats["lotes"] += 1
+
+    # ------------------------------------------------------------------
+    # Vaciado y estadísticas
+    # ------------------------------------------------------------------
+    def vacia(self, timeout: float | None = None) -> bool:
+        """Espera a que se procesen las operaciones encoladas."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._cola.all_tasks_done:
+            while self._cola.unfinished_tasks:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._cola.all_tasks_done.wait(restante)
+        return True
+
+    def cierra(self, timeout: float | None = None) -> None:
+        """Vacía la cola y detiene el hilo consumidor."""
+        self.vacia(timeout)
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is not None and hilo.is_alive():
+            self._cola.put(_FIN)
+            hilo.join(timeout)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pendientes"] = self._cola.unfinished_tasks
+        stats["errores"]    = len(self.errores)
+        stats["tiempo_fuera_ruta_critica_s"] = max(
+            stats["tiempo_io_s"] - stats["tiempo_encolado_s"], 0.0
+        )
+        return stats
+
+
+# =============================================================================
+# REGISTRO COMPARTIDO POR PROCESO
+# =============================================================================
+_REGISTRO = None
+
+
+def registro_mlflow(tracking_uri: str | None = None) -> RegistroMLflowAsincrono:
+    """Devuelve el registro asíncrono del proceso, creándolo la primera vez."""
+    global _REGISTRO
+    if _REGISTRO is None:
+        _REGISTRO = RegistroMLflowAsincrono(tracking_uri)
+        atexit.register(_REGISTRO.cierra)
+    return _REGISTRO
+
+
+def finaliza_registro_mlflow(timeout: float | None = None, verbose: bool = True) -> dict:
+    """Vacía la cola del registro del proceso e informa del tiempo ahorrado."""
+    if _REGISTRO is None:
+        return {}
+
+    completo = _REGISTRO.vacia(timeout)
+    stats    = _REGISTRO.estadisticas()
+    if verbose:
+        print("\n" + "================================================================================")
+        print("  REGISTRO MLFLOW ASÍNCRONO")
+        print("================================================================================")
+        print(f"  Operaciones encoladas            : {stats['operaciones']}")
+        print(f"  Llamadas log_batch               : {stats['lotes']}")
+        print(f"  Tiempo en ruta crítica (encolar) : {stats['tiempo_encolado_s']:.3f}s")
+        print(f"  Tiempo de E/S en segundo plano   : {stats['tiempo_io_s']:.3f}s")
+        print(f"  Retirado de la ruta crítica      : {stats['tiempo_fuera_ruta_critica_s']:.3f}s")
+        if not completo:
+            print(f"  Operaciones pendientes           : {stats['pendientes']}")
+        for error in _REGISTRO.errores:
+            print(f"  [ERROR] {error}")
+    return stats
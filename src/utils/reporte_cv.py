@@ -0,0 +1,120 @@
+"""
+Resultados de Cross-Validation en formato largo
+===============================================
+Este módulo contiene:
+- tabla_folds: resultados por fold de un cv_results en una tabla larga con
+  columnas (modelo, fase, fold, split, metrica, valor)
+- resume: media y std de todas las combinaciones (modelo, fase, metrica,
+  split) con un único group-by, en el formato ancho de cv_summary_*.csv
+- imprime_resumen_cv: tabla por fold y resumen train/val por consola
+- agrega_resumenes: une los cv_summary_<familia>.csv de cada etapa en la
+  tabla comparativa global (etapa DVC resumen_entrenamiento)
+
+Los pipelines guardan la tabla larga de cada fase en el log append-only de
+la familia (RegistroResultados) y materializan cv_summary_<familia>.csv una
+sola vez al final con resume(). Cada etapa escribe solo su propio resumen,
+de modo que las etapas de modelado no dependen entre sí. Las desviaciones
+típicas son poblacionales (ddof=0), igual que np.std sobre cv_results.
+
+Example:
+    >>> registro.anade(tabla_folds(results_opt["cv_results"], fase, "LightGBM_opt"))
+    >>> df_final = resume(registro.resultados())
+    >>> agrega_resumenes([ruta_rl, ruta_rf, ruta_xgb], models_dir / "cv_summary_entrenamiento.csv")
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+METRICAS = ["accuracy", "precision", "recall", "f1", "roc_auc"]
+# split de la tabla larga → prefijo de las claves de cv_results
+SPLITS   = {"val": "test", "train": "train"}
+CLAVES   = ["modelo", "fase"]
+COLUMNAS_FOLDS = CLAVES + ["fold", "split", "metrica", "valor"]
+
+
+# =============================================================================
+# TABLA LARGA Y RESUMEN
+# =============================================================================
+
+def tabla_folds(cv_results: dict, fase: str, modelo: str) -> pd.DataFrame:
+    """Una fila por (fold, split, metrica) a partir de los arrays de cv_results."""
+    pares   = [(split, m) for split in SPLITS for m in METRICAS]
+    valores = np.stack([
+        np.asarray(cv_results[f"{SPLITS[split]}_{m}"], dtype=float) for split, m in pares
+    ])
+    n_pares, n_folds = valores.shape
+
+    return pd.DataFrame({
+        "modelo":  modelo,
+        "fase":    fase,
+        "fold":    np.tile(np.arange(1, n_folds + 1), n_pares),
+        "split":   np.repeat([split for split, _ in pares], n_folds),
+        "metrica": np.repeat([m for _, m in pares], n_folds),
+        "valor":   valores.ravel(),
+    }, columns=COLUMNAS_FOLDS)
+
+
+def resume(tabla: pd.DataFrame) -> pd.DataFrame:
+    """
+    Media y std por (modelo, fase) en formato ancho:
+    modelo, fase, <metrica>_val_mean, <metrica>_val_std, <metrica>_train_mean, ...
+
+    Las filas conservan el orden de aparición de (modelo, fase) en la tabla.
+    """
+    grupos = tabla.groupby(CLAVES + ["metrica", "split"], sort=False)["valor"]
+    stats  = pd.DataFrame({"mean": grupos.mean(), "std": grupos.std(ddof=0)})
+
+    ancho = stats.unstack(["metrica", "split"])
+    ancho.columns = [f"{metrica}_{split}_{estadistico}" for estadistico, metrica, split in ancho.columns]
+    orden = pd.MultiIndex.from_frame(tabla[CLAVES].drop_duplicates())
+    columnas = [
+        f"{m}_{split}_{estadistico}"
+        for m in METRICAS for split in SPLITS for estadistico in ("mean", "std")
+    ]
+    return ancho.reindex(index=orden, columns=columnas).reset_index()
+
+
+def imprime_resumen_cv(cv_results: dict, cv_folds: int, fase: str) -> None:
+    """Imprime tabla de métricas train/val por fold y su resumen."""
+    train = np.array([cv_results[f"train_{m}"] for m in METRICAS])
+    val   = np.array([cv_results[f"test_{m}"]  for m in METRICAS])
+
+    print(f"\n Resultados por fold:")
+    for i in range(cv_folds):
+        print(f"\n  Fold {i + 1}:")
+        for j, m in enumerate(METRICAS):
+            print(f"    {m:<10} | Train: {train[j, i]:.4f} | Val: {val[j, i]:.4f}")
+
+    print(f"\n Resumen Cross-Validation ({fase}):")
+    print(f"   {'Métrica':<12} {'Train Mean':>12} {'Train Std':>12} {'Val Mean':>12} {'Val Std':>12}")
+    print(f"   {'-' * 60}")
+    for m, tr_mean, tr_std, va_mean, va_std in zip(
+        METRICAS, train.mean(axis=1), train.std(axis=1), val.mean(axis=1), val.std(axis=1)
+    ):
+        marker = " ****" if m == "f1" else ""
+        print(f"   {m:<12} {tr_mean:>12.4f} {tr_std:>12.4f} {va_mean:>12.4f} {va_std:>12.4f}{marker}")
+
+
+# =============================================================================
+# TABLA COMPARATIVA GLOBAL
+# =============================================================================
+
+def agrega_resumenes(rutas: list, destino: Path) -> pd.DataFrame:
+    """
+    Concatena los resúmenes por familia (en el orden de rutas) y escribe la
+    tabla global. Las rutas inexistentes se omiten.
+    """
+    partes = [pd.read_csv(ruta) for ruta in map(Path, rutas) if ruta.exists()]
+    if not partes:
+        return pd.DataFrame()
+
+    df_global = pd.concat(partes, ignore_index=True)
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    df_global.to_csv(destino, index=False)
+    return df_global
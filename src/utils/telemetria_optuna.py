@@ -0,0 +1,115 @@
+"""
+Telemetría por trial de Optuna
+==============================
+Este módulo contiene:
+- TelemetriaOptuna: callback de study.optimize que acumula, por trial,
+  parámetros, F1 y tiempo por fold, duración y estado (COMPLETE, PRUNED,
+  FAIL)
+- Tabla compacta de trials (CSV) y métricas de trayectoria (F1 por trial,
+  mejor F1 acumulado, trials por minuto) registradas en el run de MLflow de
+  la optimización a través del registro asíncrono
+
+Durante la optimización el callback solo añade una fila en memoria; toda la
+E/S se hace al final desde registra(), que únicamente encola operaciones.
+El F1 y el tiempo por fold se leen de los user_attrs "f1_folds" y
+"tiempos_folds_s" que fija cada función objetivo.
+
+Example:
+    >>> telemetria = TelemetriaOptuna("LightGBM", fase)
+    >>> study.optimize(objective, n_trials=n_trials, callbacks=[telemetria])
+    >>> with registro_mlflow().inicia_run(f"Optuna_LightGBM_CV5_{fase}") as run:
+    ...     telemetria.registra(run)
+"""
+
+from pathlib import Path
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+OPTUNA_DIR   = PROJECT_ROOT / "outputs" / "optuna"
+
+
+class TelemetriaOptuna:
+    """Callback de Optuna que registra una fila por trial terminado."""
+
+    def __init__(self, familia: str, fase: str, output_dir: Path = OPTUNA_DIR):
+        self.familia    = familia
+        self.fase       = fase
+        self.output_dir = Path(output_dir)
+        self.filas      = []
+
+        self._mejor  = None
+        self._inicio = None
+        self._fin    = None
+
+    def __call__(self, study, trial) -> None:
+        valor = trial.value if trial.state.name == "COMPLETE" else None
+        if valor is not None and (self._mejor is None or valor > self._mejor):
+            self._mejor = valor
+
+        if trial.datetime_start is not None:
+            self._inicio = min(self._inicio or trial.datetime_start, trial.datetime_start)
+        if trial.datetime_complete is not None:
+            self._fin = max(self._fin or trial.datetime_complete, trial.datetime_complete)
+
+        fila = {
+            "trial":       trial.number,
+            "estado":      trial.state.name,
+            "f1_cv":       valor,
+            "mejor_f1_cv": self._mejor,
+            "duracion_s":  trial.duration.total_seconds() if trial.duration else None,
+        }
+        for i, f1 in enumerate(trial.user_attrs.get("f1_folds", []), start=1):
+            fila[f"f1_fold_{i}"] = f1
+        for i, t in enumerate(trial.user_attrs.get("tiempos_folds_s", []), start=1):
+            fila[f"tiempo_fold_{i}_s"] = t
+        fila.update({f"param_{k}": v for k, v in trial.params.items()})
+        self.filas.append(fila)
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    def trials_por_minuto(self) -> float:
+        """Trials terminados por minuto de reloj entre el primer inicio y el último fin."""
+        if not self.filas or self._inicio is None or self._fin is None:
+            return 0.0
+        segundos = (self._fin - self._inicio).total_seconds()
+        return 60.0 * len(self.filas) / segundos if segundos > 0 else 0.0
+
+    def resumen(self) -> dict:
+        estados    = [f["estado"] for f in self.filas]
+        duraciones = [f["duracion_s"] for f in self.filas if f["duracion_s"] is not None]
+        return {
+            "optuna_n_trials":               len(self.filas),
+            "optuna_n_podados":              estados.count("PRUNED"),
+            "optuna_n_fallidos":             estados.count("FAIL"),
+            "optuna_trials_por_minuto":      round(self.trials_por_minuto(), 4),
+            "optuna_duracion_media_trial_s": round(sum(duraciones) / len(duraciones), 4) if duraciones else 0.0,
+        }
+
+    def guarda(self) -> Path:
+        """Escribe la tabla de trials en <output_dir>/<familia>/trials_<fase>.csv."""
+        import pandas as pd
+
+        ruta = self.output_dir / self.familia / f"trials_{self.fase}.csv"
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(self.filas).to_csv(ruta, index=False)
+        return ruta
+
+    def registra(self, run) -> Path:
+        """
+        Guarda la tabla y la encola en el run junto con el resumen y la
+        trayectoria (una métrica por trial, con step = número de trial).
+        """
+        ruta = self.guarda()
+        run.log_metrics(self.resumen())
+        for fila in self.filas:
+            trayectoria = {"trial_duracion_s": fila["duracion_s"] or 0.0}
+            if fila["f1_cv"] is not None:
+                trayectoria["trial_f1_cv"] = fila["f1_cv"]
+            if fila["mejor_f1_cv"] is not None:
+                trayectoria["trial_mejor_f1_cv"] = fila["mejor_f1_cv"]
+            run.log_metrics(trayectoria, step=fila["trial"])
+        run.log_artifact(ruta, "optuna")
+        return ruta
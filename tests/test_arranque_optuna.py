@@ -0,0 +1,80 @@
+# tests/test_arranque_optuna.py
+"""
+Arranque en caliente de crea_estudio
+====================================
+Comprueba que, sin best_params_cv.json, la primera ejecución con arranque en
+caliente encola la configuración de best_params.json de los modelos finales
+y que ese fichero no se modifica.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+optuna = pytest.importorskip("optuna")
+from optuna.trial import TrialState
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.arranque_optuna import (
+    ARCHIVO_BEST_PARAMS,
+    ARCHIVO_BEST_PARAMS_FINAL,
+    crea_estudio,
+    guarda_best_params,
+)
+
+RANDOM_STATE = 42
+PARAMS_FINALES = {
+    "T0": {"n_estimators": 20, "learning_rate": 0.2, "num_leaves": 106},
+    "T1": {"n_estimators": 28, "learning_rate": 0.18, "num_leaves": 121},
+}
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    (tmp_path / ARCHIVO_BEST_PARAMS_FINAL).write_text(json.dumps(PARAMS_FINALES), encoding="utf-8")
+    return tmp_path
+
+
+def _encolados(study) -> list:
+    # enqueue_trial guarda los parámetros en fixed_params hasta que el trial se ejecuta
+    return [
+        t.system_attrs["fixed_params"]
+        for t in study.get_trials(deepcopy=False, states=(TrialState.WAITING,))
+    ]
+
+
+def test_arranque_desde_best_params_final(models_dir):
+    contenido = (models_dir / ARCHIVO_BEST_PARAMS_FINAL).read_text(encoding="utf-8")
+    study = crea_estudio(
+        "F1-score_LightGBM_T1", optuna.samplers.TPESampler(seed=RANDOM_STATE),
+        models_dir, "T1", arranque_caliente=True, verbose=False,
+    )
+
+    assert _encolados(study) == [PARAMS_FINALES["T1"]]
+    assert not (models_dir / ARCHIVO_BEST_PARAMS).exists()
+    assert (models_dir / ARCHIVO_BEST_PARAMS_FINAL).read_text(encoding="utf-8") == contenido
+
+
+def test_best_params_cv_tiene_prioridad(models_dir):
+    params_cv = {"n_estimators": 35, "learning_rate": 0.1, "num_leaves": 64}
+    guarda_best_params(models_dir, "T0", params_cv)
+    study = crea_estudio(
+        "F1-score_LightGBM_T0", optuna.samplers.TPESampler(seed=RANDOM_STATE),
+        models_dir, "T0", arranque_caliente=True, verbose=False,
+    )
+
+    assert _encolados(study) == [params_cv]
+
+
+def test_sin_arranque_no_encola(models_dir):
+    study = crea_estudio(
+        "F1-score_LightGBM_T0", optuna.samplers.TPESampler(seed=RANDOM_STATE),
+        models_dir, "T0", verbose=False,
+    )
+
+    assert _encolados(study) == []
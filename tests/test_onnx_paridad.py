@@ -0,0 +1,94 @@
+# tests/test_onnx_paridad.py
+"""
+Paridad ONNX Runtime vs predict_proba nativo
+============================================
+Exporta modelos pequeños (RL con log1p + OHE + StandardScaler, RF con
+LabelEncoder) junto con su preprocesamiento, los puntúa con ScorerONNX sobre
+las columnas crudas y comprueba que las probabilidades coinciden con las del
+modelo nativo sobre la matriz preprocesada.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+for _modulo in ("sklearn", "onnx", "onnxruntime", "skl2onnx", "onnxmltools"):
+    pytest.importorskip(_modulo)
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.onnx_export import ScorerONNX, exporta_modelo_onnx, verifica_paridad
+
+RANDOM_STATE = 42
+N_FILAS      = 400
+
+
+@pytest.fixture
+def datos():
+    rng = np.random.default_rng(RANDOM_STATE)
+    X = pd.DataFrame({
+        "nota":     rng.integers(0, 20, N_FILAS).astype(float),
+        "creditos": rng.integers(0, 6, N_FILAS).astype(float),
+        "grupo":    rng.choice(["alto", "bajo", "medio"], N_FILAS),
+    })
+    y = ((X["nota"] + 3 * (X["grupo"] == "alto") + rng.normal(0, 2, N_FILAS)) > 11).astype(int)
+    return X, y
+
+
+def test_paridad_rl(datos, tmp_path):
+    X, y = datos
+    X_prep = X.copy()
+    X_prep["creditos"] = np.log1p(X_prep["creditos"])
+    X_prep = pd.get_dummies(X_prep, columns=["grupo"], drop_first=True, dtype=int)
+    scaler = StandardScaler()
+    X_prep[["nota", "creditos"]] = scaler.fit_transform(X_prep[["nota", "creditos"]])
+
+    modelo = LogisticRegression().fit(X_prep, y)
+    preprocessors = {
+        "scaler":          scaler,
+        "feature_names":   X_prep.columns.tolist(),
+        "categoricas_ohe": ["grupo"],
+        "log1p_cols":      ["creditos"],
+    }
+    scorer = ScorerONNX(exporta_modelo_onnx(modelo, preprocessors, "RL", tmp_path / "RL.onnx"))
+
+    paridad = verifica_paridad(modelo.predict_proba(X_prep)[:, 1],
+                               scorer.predict_proba(X[scorer.columnas])[:, 1])
+    assert paridad["ok"], paridad
+
+
+def test_paridad_rf(datos, tmp_path):
+    X, y = datos
+    X_prep = X.copy()
+    le = LabelEncoder()
+    X_prep["grupo"] = le.fit_transform(X_prep["grupo"])
+
+    # Features enteras: los umbrales (x.5) son exactos en float32
+    modelo = RandomForestClassifier(n_estimators=20, max_depth=5, random_state=RANDOM_STATE)
+    modelo.fit(X_prep, y)
+    preprocessors = {
+        "label_encoders": {"grupo": le},
+        "feature_names":  X_prep.columns.tolist(),
+    }
+    scorer = ScorerONNX(exporta_modelo_onnx(modelo, preprocessors, "RF", tmp_path / "RF.onnx"))
+
+    paridad = verifica_paridad(modelo.predict_proba(X_prep)[:, 1],
+                               scorer.predict_proba(X[scorer.columnas])[:, 1])
+    assert paridad["ok"], paridad
+
+
+def test_paridad_fallida_no_interrumpe():
+    paridad = verifica_paridad(np.array([0.1, 0.5, 0.9, 0.3]), np.array([0.1, 0.5, 0.9, 0.4]),
+                               verbose=False)
+    assert not paridad["ok"]
+    assert paridad["max_abs_diff"] == pytest.approx(0.1)
+    assert paridad["frac_filas_fuera"] == pytest.approx(0.25)